@@ -0,0 +1,76 @@
+"""MigrationDB 書き込みのベンチマーク - コミット単位とジャーナル設定ごとの所要時間
+
+1ロボットにつき run_single 相当の書き込み (ステータス更新3回 + ログ3件) を
+--records 件分行い、コミットごと・ロボットごと・N ロボットごとの
+トランザクションで比較する。fsync のコストを見るには --dir に
+実ディスク (ネットワークディスク) 上のディレクトリを指定する。
+
+    python -m benchmarks.db_write_bench --records 10000 --dir /mnt/share/tmp
+"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from migration_framework.common.models import MigrationRecord, MigrationStatus
+from migration_framework.db.migration_db import MigrationDB
+
+PHASES = (MigrationStatus.ANALYZING, MigrationStatus.CONVERTING, MigrationStatus.COMPLETED)
+
+# (ラベル, journal_mode, synchronous, 1トランザクションのロボット数 (0=書き込みごとにコミット))
+PROFILES: list[tuple[str, str, str, int]] = [
+    ("commit per write, DELETE/FULL", "DELETE", "FULL", 0),
+    ("commit per write, WAL/NORMAL", "WAL", "NORMAL", 0),
+    ("batch per robot, WAL/NORMAL", "WAL", "NORMAL", 1),
+    ("batch per 100 robots, WAL/NORMAL", "WAL", "NORMAL", 100),
+]
+
+
+def write_robot(db: MigrationDB, index: int) -> None:
+    """1ロボット分の書き込み (ステータス更新とログ)"""
+    record = MigrationRecord(robot_name=f"robot_{index:06d}", source_path=f"in/robot_{index:06d}.xml")
+    for status in PHASES:
+        record.status = status
+        db.upsert_record(record)
+        db.add_log(record.robot_name, status.value, f"{status.value} 完了")
+
+
+def run(db_path: Path, records: int, journal_mode: str, synchronous: str, per_batch: int) -> float:
+    """records 件分を書き込み、経過秒数を返す"""
+    db = MigrationDB(db_path, journal_mode=journal_mode, synchronous=synchronous)
+    db.connect()
+    start = time.perf_counter()
+    if per_batch == 0:
+        for i in range(records):
+            write_robot(db, i)
+    else:
+        for first in range(0, records, per_batch):
+            with db.batch():
+                for i in range(first, min(records, first + per_batch)):
+                    write_robot(db, i)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--dir", default=None, help="DB を作るディレクトリ (既定は一時ディレクトリ)")
+    args = parser.parse_args()
+    logging.getLogger("migration_framework").setLevel(logging.WARNING)
+
+    print(f"records={args.records} (書き込み {args.records * len(PHASES) * 2} 回)")
+    print(f"{'profile':<34} {'seconds':>8} {'robots/s':>9}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for i, (label, journal_mode, synchronous, per_batch) in enumerate(PROFILES):
+            elapsed = run(Path(tmp) / f"bench_{i}.db", args.records, journal_mode, synchronous, per_batch)
+            print(f"{label:<34} {elapsed:>8.2f} {args.records / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
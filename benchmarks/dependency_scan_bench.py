@@ -0,0 +1,115 @@
+"""依存関係スキャンのベンチマーク - 数万プロパティのロボットに対する DependencyMapper の所要時間
+
+DependencyMapper (複合パターンによる1パス走査) と、キーワードごとの部分文字列
+検索 + URL/パスの正規表現を別々に掛ける従来方式の参照実装を比較する。
+
+    python -m benchmarks.dependency_scan_bench --properties 20000,50000,100000
+"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from pathlib import Path
+
+from migration_framework.common.models import BizRoboAction, BizRoboRobot
+from migration_framework.phase1_analyzer.dependency import (
+    API_URL_PATTERN,
+    CONNECTION_KEYWORDS,
+    FILE_PATH_PATTERN,
+    DependencyMapper,
+)
+
+# プロパティ値のひな形 (%d に連番を入れる)
+VALUE_TEMPLATES = (
+    "https://erp.example.com/api/v1/orders?id=%d",
+    r"C:\data\in\file_%d.xlsx",
+    "Server=db%d;Database=sales;Trusted_Connection=True",
+    "plain text value %d",
+    "/var/log/app_%d.log",
+    "smtp.example.com:%d",
+    "クリック対象 %d",
+    "=A1+B%d",
+)
+
+PROPERTIES_PER_ACTION = 8
+
+
+def make_robot(properties: int, seed: int = 1) -> BizRoboRobot:
+    """合計 properties 個のプロパティを持つロボット (1アクション8個, 入れ子あり)"""
+    rng = random.Random(seed)
+    actions: list[BizRoboAction] = []
+    for i in range(0, properties, PROPERTIES_PER_ACTION):
+        action = BizRoboAction(
+            action_type="setVariable",
+            name=f"step{i}",
+            properties={
+                f"p{j}": rng.choice(VALUE_TEMPLATES) % (i + j)
+                for j in range(min(PROPERTIES_PER_ACTION, properties - i))
+            },
+        )
+        # 5件に1件は直前のアクションの子にする
+        if actions and i % (PROPERTIES_PER_ACTION * 5) == 0:
+            actions[-1].children.append(action)
+        else:
+            actions.append(action)
+    return BizRoboRobot(name="bench", file_path=Path("bench.xml"), actions=actions)
+
+
+def keyword_scan(robot: BizRoboRobot) -> tuple[int, int, int]:
+    """従来方式の参照実装: キーワードごとの部分文字列検索と正規表現2本の再走査"""
+    props: dict[str, str] = {}
+    stack = list(robot.actions)
+    while stack:
+        action = stack.pop()
+        for key, value in action.properties.items():
+            props[f"{action.name}.{key}"] = str(value)
+        stack.extend(action.children)
+
+    connections = set()
+    for key, value in props.items():
+        value_lower = value.lower()
+        for keyword in CONNECTION_KEYWORDS:
+            if keyword in value_lower:
+                connections.add(f"{key}: {value[:200]}")
+                break
+    paths = {m for value in props.values() for m in FILE_PATH_PATTERN.findall(value)}
+    apis = {m for value in props.values() for m in API_URL_PATTERN.findall(value)}
+    return len(connections), len(paths), len(apis)
+
+
+def _timed(call) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--properties", default="20000,50000,100000", help="プロパティ数 (カンマ区切り)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="各計測の繰り返し回数 (最小値を採用)")
+    args = parser.parse_args()
+    logging.getLogger("migration_framework").setLevel(logging.WARNING)
+
+    mapper = DependencyMapper()
+    print(f"{'properties':>10} {'reference ms':>13} {'mapper ms':>10} {'speedup':>8}  connections/paths/apis")
+    for count in (int(n) for n in args.properties.split(",") if n):
+        robot = make_robot(count)
+
+        reference = min(_timed(lambda: keyword_scan(robot)) for _ in range(args.repeat))
+        mapped = min(_timed(lambda: mapper.analyze(robot)) for _ in range(args.repeat))
+        found = (
+            len(robot.external_connections), len(robot.file_paths), len(robot.api_calls),
+        )
+        print(
+            f"{count:>10} {reference * 1000:>13.0f} {mapped * 1000:>10.0f} "
+            f"{reference / mapped:>7.1f}x  {'/'.join(map(str, found))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""HTTP接続プールのベンチマーク - start_job / get_machine_status の同時リクエストのスループット
+
+ローカルのスタブサーバに対し、requests の既定プール (pool_maxsize=10) と
+同時スレッド数に合わせたプールで毎秒リクエスト数・TCP接続数を比較する。
+各呼び出しの前に最大 --think 秒のランダムな待ちを入れ、ジョブ監視のように
+接続の返却と取得が揃わない負荷を再現する (待ちがないと既定プールでも
+同じ接続を使い回すため差が出ない)。
+
+    python -m benchmarks.http_pool_bench --threads 32 --requests 4000
+"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from migration_framework.common.http import HttpSettings
+from migration_framework.phase4_tester.akabot_client import AkaBotClient
+from migration_framework.phase5_deployer.orchestrator_client import OrchestratorClient
+
+from .stub_server import StubServer
+
+
+def storm(
+    call: Callable[[int], object], threads: int, total: int, think: float = 0.0,
+) -> float:
+    """total 回の呼び出しを threads 並列で行い、経過秒数を返す"""
+
+    def task(i: int) -> object:
+        if think:
+            time.sleep(random.random() * think)
+        return call(i)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(task, range(total)):
+            pass
+    return time.perf_counter() - start
+
+
+def run(threads: int, total: int, latency: float, think: float) -> None:
+    profiles = {
+        "default (pool=10)": HttpSettings(pool_maxsize=10, max_retries=0),
+        f"tuned (pool={threads})": HttpSettings(pool_maxsize=threads),
+    }
+    print(
+        f"threads={threads} requests={total} "
+        f"latency={latency * 1000:.0f}ms think<={think * 1000:.0f}ms"
+    )
+    print(f"{'scenario':<20} {'profile':<18} {'req/s':>9} {'connections':>12}")
+
+    for label, http in profiles.items():
+        with StubServer(latency=latency, process=True) as stub:
+            akabot = AkaBotClient(base_url=f"{stub.url}/api/v1", http=http)
+            orchestrator = OrchestratorClient(base_url=stub.url, http=http)
+            scenarios: dict[str, Callable[[int], object]] = {
+                "start_job": lambda i: akabot.start_job("BenchRobot", {"i": i}),
+                "get_machine_status": lambda i: orchestrator.get_machine_status(i % 100 + 1),
+            }
+            for name, call in scenarios.items():
+                before = stub.stats()["connections"]
+                elapsed = storm(call, threads, total, think)
+                opened = stub.stats()["connections"] - before - 1
+                print(f"{name:<20} {label:<18} {total / elapsed:>9.0f} {opened:>12}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="スタブサーバの応答遅延 (秒)",
+    )
+    parser.add_argument(
+        "--think", type=float, default=0.02, help="呼び出し前のランダム待ちの上限 (秒)",
+    )
+    args = parser.parse_args()
+
+    # 既定プールの "Connection pool is full" 警告は件数が多いため抑制する
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    logging.getLogger("migration_framework").setLevel(logging.WARNING)
+    run(args.threads, args.requests, args.latency, args.think)
+
+
+if __name__ == "__main__":
+    main()
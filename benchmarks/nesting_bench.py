@@ -0,0 +1,78 @@
+"""ネスト深度のベンチマーク - 解析・変換のステップ数と所要時間が深度に比例することを確認する
+
+深さ d の入れ子 If (各階層に Log を1つ) を持つロボットを生成し、
+Phase 1 解析 + Phase 2 変換のステップ数・XAML サイズ・所要時間を測る。
+入れ子のアクションを重複して数えていれば、深度あたりの値が深度とともに増える。
+
+    python -m benchmarks.nesting_bench --depths 100,200,400,800,1600
+"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from migration_framework.common.config import Config
+from migration_framework.phase1_analyzer import Analyzer
+from migration_framework.phase2_converter import Converter
+
+
+def nested_robot_xml(depth: int) -> str:
+    """深さ depth の入れ子 If を持つロボット XML"""
+    return (
+        "<robot><steps>"
+        + "<If name='check' condition='x'><Log name='log' message='m'/>" * depth
+        + "</If>" * depth
+        + "</steps></robot>"
+    )
+
+
+def measure(config: Config, robot_path: Path) -> tuple[int, int, float]:
+    """(ステップ数, XAML バイト数, 解析+変換の秒数) を返す"""
+    converter = Converter(config)
+    start = time.perf_counter()
+    report = Analyzer(config).analyze_file(robot_path)
+    result = converter.convert(report)
+    xaml = result.xaml_content or converter.xaml_generator.serialize(result.xaml_tree)
+    elapsed = time.perf_counter() - start
+    return report.complexity.step_count, len(xaml.encode("utf-8")), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", default="100,200,400,800,1600", help="ネスト深度 (カンマ区切り)")
+    parser.add_argument("--config-dir", default="config")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("migration_framework").setLevel(logging.WARNING)
+
+    config = Config(args.config_dir)
+    config.load()
+    depths = [int(d) for d in args.depths.split(",") if d]
+
+    per_depth: list[float] = []
+    print(f"{'depth':>6} {'steps':>7} {'steps/d':>8} {'xaml KB':>9} {'B/d':>7} {'ms':>8} {'us/d':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for depth in depths:
+            robot_path = Path(tmp) / f"nested_{depth}.xml"
+            robot_path.write_text(nested_robot_xml(depth), encoding="utf-8")
+            steps, xaml_bytes, elapsed = measure(config, robot_path)
+            per_depth.append(elapsed / depth)
+            print(
+                f"{depth:>6} {steps:>7} {steps / depth:>8.2f} {xaml_bytes / 1024:>9.1f} "
+                f"{xaml_bytes / depth:>7.0f} {elapsed * 1000:>8.1f} {elapsed * 1e6 / depth:>7.0f}"
+            )
+
+    # 線形なら深度あたりの時間はほぼ一定 (二乗で増えるなら深度の比に近づく)
+    if len(per_depth) > 1:
+        print(
+            f"us/d ratio (max depth / min depth): {per_depth[-1] / per_depth[0]:.2f} "
+            f"(depth ratio {depths[-1] / depths[0]:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""ロールアウトのベンチマーク - 逐次デプロイと RolloutEngine の所要時間をスタブ Orchestrator で比較する
+
+    python -m benchmarks.rollout_bench --projects 12 --machines 20
+    python -m benchmarks.rollout_bench --fail Proj00   # カナリア失敗で中止されることを確認
+"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from migration_framework.common.config import Config
+from migration_framework.common.models import MachineInfo
+from migration_framework.phase5_deployer import Deployer
+
+from .stub_server import StubServer
+
+PROFILES: dict[str, dict[str, Any]] = {
+    # 従来の deploy_batch 相当 (1件ずつ・端末も逐次・中止なし)
+    "sequential": {
+        "parallel_projects": 1, "orchestrator_concurrency": 1,
+        "canary_projects": 0, "max_failure_rate": 1.0,
+    },
+    # settings.yaml の既定値
+    "rollout": {},
+}
+
+
+def make_projects(root: Path, count: int) -> None:
+    for i in range(count):
+        project = root / f"Proj{i:02d}"
+        project.mkdir()
+        (project / "project.json").write_text(
+            json.dumps({"name": project.name, "version": "1.0.0"}), encoding="utf-8",
+        )
+        (project / "Main.xaml").write_text("<Activity />\n" * 2000, encoding="utf-8")
+
+
+def fail_processes(deployer: Deployer, names: set[str]) -> None:
+    """指定プロジェクトのプロセス作成を失敗させる"""
+    create_process = deployer.orchestrator.create_process
+
+    def failing(package_id: str, process_name: str, environment_name: str = "Production") -> str:
+        if process_name in names:
+            raise RuntimeError(f"stub failure: {process_name}")
+        return create_process(package_id, process_name, environment_name)
+
+    deployer.orchestrator.create_process = failing  # type: ignore[method-assign]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=12)
+    parser.add_argument("--machines", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.01, help="スタブの応答遅延 (秒)")
+    parser.add_argument("--fail", default="", help="失敗させるプロジェクト名 (カンマ区切り)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    machines = [MachineInfo(name=f"PC-{i:03d}", machine_id=i) for i in range(1, args.machines + 1)]
+    failing = {name for name in args.fail.split(",") if name}
+
+    with tempfile.TemporaryDirectory() as tmp, StubServer(latency=args.latency, process=True) as stub:
+        output_dir = Path(tmp)
+        make_projects(output_dir, args.projects)
+        print(f"projects={args.projects} machines={args.machines} latency={args.latency * 1000:.0f}ms")
+
+        for label, rollout in PROFILES.items():
+            config = Config()
+            config.settings.update({
+                "deployer": {"orchestrator": {"base_url": stub.url}, "rollout": rollout},
+            })
+            deployer = Deployer(config)
+            if failing:
+                fail_processes(deployer, failing)
+
+            start = time.perf_counter()
+            records = deployer.deploy_batch(output_dir, machines)
+            elapsed = time.perf_counter() - start
+            statuses = Counter(r.status.value for r in records)
+            print(f"{label:<12} {elapsed:>7.2f}s  {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    main()
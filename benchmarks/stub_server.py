@@ -0,0 +1,342 @@
+"""ローカル スタブサーバ - aKaBot Center / Orchestrator API の最小実装 (ベンチマーク・動作確認用)"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import gzip
+import itertools
+import json
+import multiprocessing as mp
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlparse
+from urllib.request import urlopen
+
+_PACKAGE_FILE = re.compile(r"^(.+?)\.(\d+(?:\.\d+)*)\.nupkg$")
+_MULTIPART_FILENAME = re.compile(rb'filename="([^"]+)"')
+_ODATA_KEY = re.compile(r"^/odata/(\w+)\((?:')?([^)']*)(?:')?\)(?:/(.*))?$")
+
+
+class StubState:
+    """スタブサーバの状態 (ジョブ・リリース・統計)"""
+
+    def __init__(self, job_seconds: float = 0.0, latency: float = 0.0):
+        self.job_seconds = job_seconds   # ジョブが完了するまでの秒数
+        self.latency = latency           # 1リクエストあたりの応答遅延 (秒)
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.jobs: dict[str, float] = {}           # job_id → 完了時刻
+        self.releases: dict[str, dict[str, Any]] = {}
+        self.packages: dict[str, set[str]] = {}      # package_id → 登録済みバージョン
+        self.uploads: dict[str, bytearray] = {}      # uploadId → 受信済みデータ
+        self.upload_names: dict[str, str] = {}       # uploadId → ファイル名
+        self.uploaded_bytes = 0
+        self.fail_every_put = 0                      # >0 ならN回に1回チャンク受信を失敗させる
+        self.puts = 0
+        self.job_queries = 0
+        self.connections = 0
+        self.requests = 0
+        self.gzip_requests = 0
+
+    def new_job(self) -> str:
+        with self.lock:
+            job_id = str(next(self.ids))
+            self.jobs[job_id] = time.time() + self.job_seconds
+        return job_id
+
+    def register_package(self, file_name: str) -> str:
+        """'<id>.<version>.nupkg' を登録済みパッケージとして記録する"""
+        m = _PACKAGE_FILE.match(file_name)
+        package_id, version = (m.group(1), m.group(2)) if m else (file_name, "")
+        with self.lock:
+            self.packages.setdefault(package_id, set()).add(version)
+        return package_id
+
+    def job_state(self, job_id: str) -> bool:
+        """完了していれば True"""
+        return time.time() >= self.jobs.get(job_id, 0.0)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # ヘッダと本文を別々に書くため、Nagle + 遅延ACK で 40ms 待たされるのを避ける
+    disable_nagle_algorithm = True
+    state: StubState
+
+    def setup(self) -> None:
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    # --- 入出力 ---
+
+    def _reject_ambiguous_framing(self) -> bool:
+        """Content-Length と Transfer-Encoding が両方あれば 400 を返す
+
+        RFC 7230 3.3.3 では Transfer-Encoding が優先されるため、実サーバでは
+        本文を読み違えるか拒否される。同じ挙動にして送信側の誤りを検出する。
+        """
+        if "Transfer-Encoding" in self.headers and "Content-Length" in self.headers:
+            self.close_connection = True
+            self._send(400, {"error": "both Content-Length and Transfer-Encoding"})
+            return True
+        return False
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            with self.state.lock:
+                self.state.gzip_requests += 1
+            raw = gzip.decompress(raw)
+        if self.headers.get("Content-Type", "").startswith("application/json") and raw:
+            return json.loads(raw)
+        return raw
+
+    def _send(self, status: int, payload: Any = None) -> None:
+        body = json.dumps(payload if payload is not None else {}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self) -> None:
+        with self.state.lock:
+            self.state.requests += 1
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+    # --- ルーティング ---
+
+    def do_GET(self) -> None:
+        self._count()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+
+        if path == "/stub/stats":
+            with self.state.lock:
+                return self._send(200, {
+                    "connections": self.state.connections,
+                    "requests": self.state.requests,
+                    "gzip_requests": self.state.gzip_requests,
+                    "uploaded_bytes": self.state.uploaded_bytes,
+                })
+        if path in ("/api/v1/health", "/api/status"):
+            return self._send(200, {"status": "ok"})
+        if path == "/api/v1/jobs":
+            ids = query.get("ids", [""])[0].split(",")
+            return self._send(200, {"jobs": [self._akabot_job(i) for i in ids if i]})
+        if path.startswith("/api/v1/jobs/"):
+            parts = path.split("/")
+            if parts[-1] == "output":
+                return self._send(200, {"outputArguments": {"result": "OK"}})
+            if parts[-1] == "logs":
+                return self._send(200, {"logs": []})
+            return self._send(200, self._akabot_job(parts[-1]))
+
+        if path.startswith("/api/uploads/"):
+            upload_id = path.rsplit("/", 1)[-1]
+            with self.state.lock:
+                received = len(self.state.uploads.get(upload_id, b""))
+            return self._send(200, {"uploadId": upload_id, "received": received})
+        if "GetProcessVersions" in path:
+            package_id = re.search(r"processId='([^']*)'", unquote(path)).group(1)
+            with self.state.lock:
+                versions = sorted(self.state.packages.get(package_id, ()))
+            if not versions:
+                return self._send(404, {"error": package_id})
+            return self._send(200, {"value": [{"Id": package_id, "Version": v} for v in versions]})
+
+        if path == "/odata/Machines":
+            return self._send(200, {"value": [self._machine(i) for i in range(1, 101)]})
+        if path == "/odata/Environments":
+            return self._send(200, {"value": [{"Id": 1, "Name": "Production"}]})
+        if path == "/odata/Releases":
+            name = _filter_name(query)
+            with self.state.lock:
+                values = [r for r in self.state.releases.values() if name in (None, r["Name"])]
+            if not values and name:
+                values = [{"Id": 1, "Key": f"key-{name}", "Name": name}]
+            return self._send(200, {"value": values})
+        if path == "/odata/Jobs":
+            # $filter=Id in (1,2,...) / Id eq 1 or Id eq 2 によるジョブ状態の一括取得
+            job_filter = query.get("$filter", [""])[0]
+            ids = re.findall(r"\d+", job_filter) if job_filter.startswith("Id ") else []
+            with self.state.lock:
+                self.state.job_queries += 1
+            return self._send(200, {"value": [self._odata_job(i) for i in ids if i in self.state.jobs]})
+
+        m = _ODATA_KEY.match(path)
+        if m and m.group(1) == "Machines":
+            return self._send(200, self._machine(int(m.group(2))))
+        if m and m.group(1) == "Jobs":
+            return self._send(200, self._odata_job(m.group(2)))
+        return self._send(404, {"error": path})
+
+    def do_POST(self) -> None:
+        self._count()
+        if self._reject_ambiguous_framing():
+            return
+        body = self._body()
+        path = urlparse(self.path).path
+
+        if path == "/api/v1/jobs":
+            return self._send(200, {"jobId": self.state.new_job()})
+        if path == "/api/account/authenticate":
+            return self._send(200, {"result": "stub-token"})
+        if path.endswith("StartJobs"):
+            return self._send(200, {"value": [{"Id": int(self.state.new_job())}]})
+        if path.endswith("UploadPackage"):
+            m = _MULTIPART_FILENAME.search(body[:1024])
+            package_id = self.state.register_package(m.group(1).decode() if m else "unknown")
+            with self.state.lock:
+                self.state.uploaded_bytes += len(body)
+            return self._send(200, {"Id": package_id})
+        if path == "/api/uploads":
+            upload_id = f"u{next(self.state.ids)}"
+            with self.state.lock:
+                self.state.uploads[upload_id] = bytearray()
+                self.state.upload_names[upload_id] = body["fileName"]
+            return self._send(201, {"uploadId": upload_id})
+        if path.startswith("/api/uploads/") and path.endswith("/complete"):
+            upload_id = path.split("/")[-2]
+            package_id = self.state.register_package(self.state.upload_names[upload_id])
+            return self._send(200, {"Id": package_id})
+        if path == "/odata/Releases":
+            with self.state.lock:
+                release_id = next(self.state.ids)
+                self.state.releases[body["Name"]] = {
+                    "Id": release_id, "Key": f"key-{release_id}", "Name": body["Name"],
+                }
+            return self._send(201, {"Id": release_id})
+        if path == "/odata/Machines":
+            return self._send(201, {"Id": next(self.state.ids)})
+        return self._send(200, {})
+
+    def do_PUT(self) -> None:
+        self._count()
+        if self._reject_ambiguous_framing():
+            return
+        body = self._body()
+        path = urlparse(self.path).path
+        if not path.startswith("/api/uploads/"):
+            return self._send(404, {"error": path})
+
+        upload_id = path.rsplit("/", 1)[-1]
+        start = int(re.match(r"bytes (\d+)-", self.headers["Content-Range"]).group(1))
+        with self.state.lock:
+            self.state.puts += 1
+            fail = self.state.fail_every_put and self.state.puts % self.state.fail_every_put == 0
+            received = self.state.uploads[upload_id]
+            in_order = start == len(received)
+            if not fail and in_order:
+                received.extend(body)
+                self.state.uploaded_bytes += len(body)
+            size = len(received)
+        if fail:
+            return self._send(500, {"error": "injected failure"})
+        if not in_order:
+            return self._send(409, {"received": size})
+        return self._send(200, {"received": size})
+
+    def do_DELETE(self) -> None:
+        self._count()
+        self._send(200, {})
+
+    # --- 応答データ ---
+
+    def _akabot_job(self, job_id: str) -> dict[str, Any]:
+        done = self.state.job_state(job_id)
+        return {"jobId": job_id, "status": "Completed" if done else "Running"}
+
+    def _odata_job(self, job_id: str) -> dict[str, Any]:
+        done = self.state.job_state(job_id)
+        return {"Id": int(job_id), "State": "Successful" if done else "Running"}
+
+    @staticmethod
+    def _machine(machine_id: int) -> dict[str, Any]:
+        return {"Id": machine_id, "Name": f"PC-{machine_id:03d}", "Status": "Available"}
+
+
+def _filter_name(query: dict[str, list[str]]) -> str | None:
+    m = re.search(r"Name eq '([^']*)'", query.get("$filter", [""])[0])
+    return m.group(1) if m else None
+
+
+def _make_server(job_seconds: float, latency: float) -> ThreadingHTTPServer:
+    state = StubState(job_seconds=job_seconds, latency=latency)
+    handler = type("Handler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _serve_in_process(job_seconds: float, latency: float, port_queue: mp.Queue) -> None:
+    server = _make_server(job_seconds, latency)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+class StubServer:
+    """スタブサーバを起動する
+
+    既定はバックグラウンドスレッドで動かす。ベンチマークでは process=True とし、
+    サーバ処理がクライアントと GIL を取り合わないよう別プロセスで動かす。
+
+    with StubServer() as stub:
+        client = OrchestratorClient(base_url=stub.url)
+    """
+
+    def __init__(self, job_seconds: float = 0.0, latency: float = 0.0, process: bool = False):
+        self.job_seconds = job_seconds
+        self.latency = latency
+        self.process = process
+        self.port = 0
+        self._server: ThreadingHTTPServer | None = None
+        self._proc: mp.Process | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def state(self) -> StubState:
+        """スレッド起動時のサーバ状態 (プロセス起動時は stats() を使う)"""
+        assert self._server is not None
+        return self._server.RequestHandlerClass.state
+
+    def stats(self) -> dict[str, int]:
+        """接続数・リクエスト数などの統計 (統計取得リクエスト自体も含む)"""
+        with urlopen(f"{self.url}/stub/stats") as resp:
+            return json.loads(resp.read())
+
+    def __enter__(self) -> StubServer:
+        if self.process:
+            port_queue: mp.Queue = mp.Queue()
+            self._proc = mp.Process(
+                target=_serve_in_process,
+                args=(self.job_seconds, self.latency, port_queue),
+                daemon=True,
+            )
+            self._proc.start()
+            self.port = port_queue.get(timeout=10)
+        else:
+            self._server = _make_server(self.job_seconds, self.latency)
+            self.port = self._server.server_port
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
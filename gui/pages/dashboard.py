@@ -29,7 +29,6 @@ def render(config: Config, db: MigrationDB) -> None:
     st.markdown('<div class="sub-header">RPA移行進捗をリアルタイムで管理 — Powered by InsightMigration</div>', unsafe_allow_html=True)
 
     summary = db.get_summary()
-    records = db.get_all_records()
 
     total = summary.get("total", 0)
     by_status = summary.get("by_status", {})
@@ -121,7 +120,7 @@ def render(config: Config, db: MigrationDB) -> None:
 
     # --- フェーズ別進捗 ---
     st.subheader("フェーズ別進捗")
-    phase_data = _compute_phase_progress(records)
+    phase_data = _compute_phase_progress(by_status)
     cols = st.columns(4)
     phase_info = [
         ("Phase 1: 解析", "analyzed", "#42a5f5", "80%"),
@@ -159,18 +158,27 @@ def render(config: Config, db: MigrationDB) -> None:
 
     # --- 最近の変換結果テーブル ---
     st.subheader("ロボット一覧 (上位20件)")
+    # 射影で取得し、DB の値をそのまま表示する (未知のステータスでも落ちない)
+    records = db.query_records(
+        limit=20,
+        columns=[
+            "robot_name", "status", "difficulty_rank", "complexity_score",
+            "conversion_rate", "validation_score", "updated_at",
+        ],
+    ).items
     if records:
         df = pd.DataFrame([
             {
-                "ロボット名": r.robot_name,
-                "ステータス": r.status.value,
-                "ランク": r.difficulty_rank.value,
-                "複雑度": f"{r.complexity_score:.1f}",
-                "変換率": f"{r.conversion_rate:.0%}",
-                "検証スコア": f"{r.validation_score:.1f}",
-                "更新日時": r.updated_at.strftime("%Y-%m-%d %H:%M"),
+                "ロボット名": r["robot_name"],
+                "ステータス": r["status"],
+                "ランク": r["difficulty_rank"],
+                "複雑度": f"{r['complexity_score']:.1f}",
+                "変換率": f"{r['conversion_rate']:.0%}",
+                "検証スコア": f"{r['validation_score']:.1f}",
+                # ISO 形式 (YYYY-MM-DDTHH:MM:SS...) の分までを表示
+                "更新日時": (r["updated_at"] or "")[:16].replace("T", " "),
             }
-            for r in records[:20]
+            for r in records
         ])
         st.dataframe(
             df,
@@ -184,23 +192,24 @@ def render(config: Config, db: MigrationDB) -> None:
         )
 
 
-def _compute_phase_progress(records) -> dict[str, int]:
-    """各フェーズの完了数を算出する"""
+def _compute_phase_progress(by_status: dict[str, int]) -> dict[str, int]:
+    """各フェーズの完了数をステータス別件数から算出する"""
     from migration_framework.common.models import MigrationStatus
 
     phase_map = {
-        MigrationStatus.ANALYZING: [],
-        MigrationStatus.CONVERTING: ["analyzed"],
-        MigrationStatus.VALIDATING: ["analyzed", "converted"],
-        MigrationStatus.TESTING: ["analyzed", "converted", "validated"],
-        MigrationStatus.COMPLETED: ["analyzed", "converted", "validated", "tested"],
-        MigrationStatus.MANUAL_REQUIRED: ["analyzed", "converted", "validated"],
+        MigrationStatus.ANALYZING.value: [],
+        MigrationStatus.CONVERTING.value: ["analyzed"],
+        MigrationStatus.VALIDATING.value: ["analyzed", "converted"],
+        MigrationStatus.TESTING.value: ["analyzed", "converted", "validated"],
+        MigrationStatus.COMPLETED.value: ["analyzed", "converted", "validated", "tested"],
+        MigrationStatus.MANUAL_REQUIRED.value: ["analyzed", "converted", "validated"],
     }
 
     counts = {"analyzed": 0, "converted": 0, "validated": 0, "tested": 0}
-    for r in records:
-        phases = phase_map.get(r.status, [])
+    for status, cnt in by_status.items():
+        # 未知のステータス (別バージョンが書いた値など) はどのフェーズにも数えない
+        phases = phase_map.get(status, [])
         for p in phases:
-            counts[p] += 1
+            counts[p] += cnt
 
     return counts
@@ -11,9 +11,12 @@ import plotly.graph_objects as go
 import streamlit as st
 
 from migration_framework.common.config import Config
-from migration_framework.common.models import MigrationRecord, MigrationStatus
+from migration_framework.common.models import AssessmentReport, MigrationRecord, MigrationStatus
 from migration_framework.db.migration_db import MigrationDB
 from migration_framework.phase1_analyzer import Analyzer
+from migration_framework.phase1_analyzer.assessment_frame import AssessmentFrame
+from migration_framework.phase1_analyzer.complexity import DEFAULT_THRESHOLDS
+from migration_framework.phase1_analyzer.robot_graph import RobotGraph
 
 RANK_COLORS = {"A": "#34a853", "B": "#1a73e8", "C": "#f9ab00", "D": "#ea4335"}
 RANK_LABELS = {"A": "簡単", "B": "中程度", "C": "複雑", "D": "非常に複雑"}
@@ -70,6 +73,7 @@ def render(config: Config, db: MigrationDB) -> None:
 
     # === 解析結果一覧 ===
     with tab_results:
+        _render_rescoring(config)
         _render_results(db)
 
 
@@ -79,7 +83,6 @@ def _run_analysis_uploaded(
     """アップロードファイルの解析を実行する"""
     analyzer = Analyzer(config)
     progress_bar = st.progress(0, text="解析準備中...")
-    results_container = st.container()
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         tmp_path = Path(tmp_dir)
@@ -88,31 +91,9 @@ def _run_analysis_uploaded(
 
         files = list(tmp_path.glob("**/*.robot")) + list(tmp_path.glob("**/*.xml"))
         total = len(files)
+        reports = _analyze_files(analyzer, files, progress_bar)
 
-        for i, file_path in enumerate(files):
-            progress_bar.progress(
-                (i + 1) / total,
-                text=f"解析中: {file_path.name} ({i+1}/{total})"
-            )
-
-            try:
-                report = analyzer.analyze_file(file_path)
-                record = MigrationRecord(
-                    robot_name=report.robot.name,
-                    source_path=str(file_path),
-                    status=MigrationStatus.ANALYZING,
-                    difficulty_rank=report.complexity.rank,
-                    complexity_score=report.complexity.total_score,
-                    conversion_rate=report.auto_convertible_rate,
-                    validation_score=0.0,
-                    test_pass_rate=0.0,
-                    manual_items="; ".join(report.manual_items),
-                )
-                db.upsert_record(record)
-                db.add_log(report.robot.name, "phase1", "解析完了", "info")
-            except Exception as e:
-                st.error(f"解析失敗: {file_path.name} - {e}")
-
+    _save_reports(analyzer, db, reports)
     progress_bar.progress(1.0, text="解析完了!")
     st.success(f"✅ {total} ファイルの解析が完了しました")
     st.rerun()
@@ -136,18 +117,45 @@ def _run_analysis_directory(
 
     progress_bar = st.progress(0, text="解析準備中...")
     total = len(files)
+    reports = _analyze_files(analyzer, files, progress_bar)
+
+    _save_reports(analyzer, db, reports)
+    progress_bar.progress(1.0, text="解析完了!")
+    st.success(f"✅ {total} ファイルの解析が完了しました")
+    st.rerun()
+
 
+def _analyze_files(analyzer: Analyzer, files: list[Path], progress_bar) -> list[AssessmentReport]:
+    """ファイルを1件ずつ解析する (進捗表示付き)"""
+    reports: list[AssessmentReport] = []
+    total = len(files)
     for i, file_path in enumerate(files):
         progress_bar.progress(
             (i + 1) / total,
             text=f"解析中: {file_path.name} ({i+1}/{total})"
         )
-
         try:
-            report = analyzer.analyze_file(file_path)
-            record = MigrationRecord(
+            reports.append(analyzer.analyze_file(file_path))
+        except Exception as e:
+            st.error(f"解析失敗: {file_path.name} - {e}")
+    return reports
+
+
+def _save_reports(analyzer: Analyzer, db: MigrationDB, reports: list[AssessmentReport]) -> None:
+    """全件をまとめて優先順位付けし、DB に保存する
+
+    閾値シミュレーション用に特徴量テーブルをセッションに保持する。
+    """
+    # シミュレーションでも wave 順を反映するよう、優先順位付けと同じグラフを使う
+    graph = RobotGraph.from_robots(r.robot for r in reports)
+    reports = analyzer.prioritize(reports, graph)
+    st.session_state.assessment_frame = AssessmentFrame.from_reports(reports, graph)
+
+    with db.batch():
+        for report in reports:
+            db.upsert_record(MigrationRecord(
                 robot_name=report.robot.name,
-                source_path=str(file_path),
+                source_path=str(report.robot.file_path),
                 status=MigrationStatus.ANALYZING,
                 difficulty_rank=report.complexity.rank,
                 complexity_score=report.complexity.total_score,
@@ -155,14 +163,32 @@ def _run_analysis_directory(
                 validation_score=0.0,
                 test_pass_rate=0.0,
                 manual_items="; ".join(report.manual_items),
-            )
-            db.upsert_record(record)
-        except Exception as e:
-            st.error(f"解析失敗: {file_path.name} - {e}")
+            ))
+            db.add_log(report.robot.name, "phase1", "解析完了", "info")
 
-    progress_bar.progress(1.0, text="解析完了!")
-    st.success(f"✅ {total} ファイルの解析が完了しました")
-    st.rerun()
+
+def _render_rescoring(config: Config) -> None:
+    """直近の解析結果を別の閾値で一括再スコアリングする (DB は更新しない)"""
+    frame: AssessmentFrame | None = st.session_state.get("assessment_frame")
+    if frame is None or not len(frame):
+        return
+
+    with st.expander("🎚️ 閾値シミュレーション (直近の解析結果を再スコアリング)"):
+        thresh = {**DEFAULT_THRESHOLDS, **config.get("analyzer.complexity_thresholds", {})}
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            a = st.number_input("Aランク上限", value=int(thresh["A"]), key="rescore_a")
+        with col_b:
+            b = st.number_input("Bランク上限", value=int(thresh["B"]), key="rescore_b")
+        with col_c:
+            c = st.number_input("Cランク上限", value=int(thresh["C"]), key="rescore_c")
+
+        scored = frame.score({**thresh, "A": a, "B": b, "C": c})
+        summary = frame.summary(scored)
+        cols = st.columns(5)
+        for col, rank in zip(cols, ["A", "B", "C", "D"]):
+            col.metric(f"ランク {rank}", summary["by_rank"][rank])
+        cols[4].metric("見積工数合計", f"{summary['estimated_hours']:.0f} h")
 
 
 def _render_results(db: MigrationDB) -> None:
@@ -174,15 +200,22 @@ def _render_results(db: MigrationDB) -> None:
 
     st.subheader(f"解析済みロボット: {len(records)} 件")
 
+    # レコードは一度だけ DataFrame 化し、集計・フィルタ・ソートは列演算で行う
+    df_all = pd.DataFrame({
+        "ロボット名": [r.robot_name for r in records],
+        "ランク": [r.difficulty_rank.value for r in records],
+        "複雑度": [r.complexity_score for r in records],
+        "自動変換見込み": [r.conversion_rate for r in records],
+        "手動対応項目": [r.manual_items or "なし" for r in records],
+        "ステータス": [r.status.value for r in records],
+    })
+
     # ランク別サマリー
-    rank_counts = {}
-    for r in records:
-        rank = r.difficulty_rank.value
-        rank_counts[rank] = rank_counts.get(rank, 0) + 1
+    rank_counts = df_all["ランク"].value_counts()
 
     cols = st.columns(4)
     for col, rank in zip(cols, ["A", "B", "C", "D"]):
-        count = rank_counts.get(rank, 0)
+        count = int(rank_counts.get(rank, 0))
         color = RANK_COLORS.get(rank, "#999")
         label = RANK_LABELS.get(rank, "")
         with col:
@@ -198,16 +231,10 @@ def _render_results(db: MigrationDB) -> None:
     st.markdown("")
 
     # 散布図: 複雑度 vs 変換見込み
-    if len(records) > 1:
-        df_chart = pd.DataFrame([
-            {
-                "ロボット名": r.robot_name,
-                "複雑度スコア": r.complexity_score,
-                "自動変換見込み": r.conversion_rate * 100,
-                "ランク": r.difficulty_rank.value,
-            }
-            for r in records
-        ])
+    if len(df_all) > 1:
+        df_chart = df_all.rename(columns={"複雑度": "複雑度スコア"}).assign(
+            自動変換見込み=df_all["自動変換見込み"] * 100
+        )
         fig = px.scatter(
             df_chart,
             x="複雑度スコア",
@@ -232,30 +259,18 @@ def _render_results(db: MigrationDB) -> None:
             "ソート", ["複雑度 (低→高)", "複雑度 (高→低)", "変換率 (高→低)", "名前"]
         )
 
-    filtered = [r for r in records if r.difficulty_rank.value in rank_filter]
+    df = df_all[df_all["ランク"].isin(rank_filter)]
 
     if sort_by == "複雑度 (低→高)":
-        filtered.sort(key=lambda r: r.complexity_score)
+        df = df.sort_values("複雑度", kind="stable")
     elif sort_by == "複雑度 (高→低)":
-        filtered.sort(key=lambda r: r.complexity_score, reverse=True)
+        df = df.sort_values("複雑度", ascending=False, kind="stable")
     elif sort_by == "変換率 (高→低)":
-        filtered.sort(key=lambda r: r.conversion_rate, reverse=True)
+        df = df.sort_values("自動変換見込み", ascending=False, kind="stable")
     else:
-        filtered.sort(key=lambda r: r.robot_name)
+        df = df.sort_values("ロボット名", kind="stable")
 
     # テーブル
-    df = pd.DataFrame([
-        {
-            "ロボット名": r.robot_name,
-            "ランク": r.difficulty_rank.value,
-            "複雑度": r.complexity_score,
-            "自動変換見込み": r.conversion_rate,
-            "手動対応項目": r.manual_items or "なし",
-            "ステータス": r.status.value,
-        }
-        for r in filtered
-    ])
-
     st.dataframe(
         df,
         use_container_width=True,
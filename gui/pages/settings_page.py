@@ -10,6 +10,7 @@ import yaml
 
 from migration_framework.common.config import Config
 from migration_framework.db.migration_db import MigrationDB
+from migration_framework.phase1_analyzer.complexity import DEFAULT_THRESHOLDS
 
 
 def render(config: Config, db: MigrationDB) -> None:
@@ -68,10 +69,10 @@ def _render_general(config: Config) -> None:
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("**複雑度閾値**")
-        thresh = config.get("analyzer.complexity_thresholds", {})
-        a_thresh = st.number_input("Aランク上限", value=thresh.get("A", 10))
-        b_thresh = st.number_input("Bランク上限", value=thresh.get("B", 30))
-        c_thresh = st.number_input("Cランク上限", value=thresh.get("C", 60))
+        thresh = {**DEFAULT_THRESHOLDS, **config.get("analyzer.complexity_thresholds", {})}
+        a_thresh = st.number_input("Aランク上限", value=thresh["A"])
+        b_thresh = st.number_input("Bランク上限", value=thresh["B"])
+        c_thresh = st.number_input("Cランク上限", value=thresh["C"])
 
     with col2:
         st.markdown("**テスト設定**")
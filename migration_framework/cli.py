@@ -12,6 +12,7 @@ from rich.table import Table
 
 from migration_framework.common.config import Config
 from migration_framework.db.migration_db import MigrationDB
+from migration_framework.db.result_cache import ResultCache
 from migration_framework.pipeline import MigrationPipeline
 
 console = Console()
@@ -64,15 +65,34 @@ def analyze(ctx: click.Context, source: str, output: str) -> None:
 @click.argument("source", type=click.Path(exists=True))
 @click.option("--output", "-o", default="output", help="出力ディレクトリ")
 @click.option("--no-template", is_flag=True, help="テンプレート適用をスキップ")
+@click.option(
+    "--jobs", "-j", type=int, default=None,
+    help="並列ワーカー数 (省略時は settings.yaml の migration.workers)",
+)
+@click.option("--no-cache", is_flag=True, help="再移行キャッシュを使わず全ロボットを再処理")
 @click.pass_context
-def migrate(ctx: click.Context, source: str, output: str, no_template: bool) -> None:
+def migrate(
+    ctx: click.Context,
+    source: str,
+    output: str,
+    no_template: bool,
+    jobs: int | None,
+    no_cache: bool,
+) -> None:
     """全フェーズ実行: 解析 → 変換 → 検証"""
     config = ctx.obj["config"]
+    if jobs is None:
+        jobs = config.get("migration.workers", 1)
     db_path = config.get("migration.db_path", "migration.db")
     db = MigrationDB(db_path)
     db.connect()
 
-    pipeline = MigrationPipeline(config, db)
+    cache = None
+    if not no_cache:
+        cache = ResultCache(config.get("migration.cache_path", ".migration_cache.db"))
+        cache.connect()
+
+    pipeline = MigrationPipeline(config, db, cache=cache)
     source_path = Path(source)
     output_path = Path(output)
 
@@ -84,23 +104,42 @@ def migrate(ctx: click.Context, source: str, output: str, no_template: bool) ->
             _print_record(record)
         else:
             records = pipeline.run_batch(
-                source_path, output_path, apply_template=not no_template
+                source_path, output_path,
+                apply_template=not no_template,
+                workers=jobs,
             )
             _print_records_table(records)
+        if cache is not None:
+            console.print(f"キャッシュ: hit={cache.hits}, miss={cache.misses}")
     finally:
         db.close()
+        if cache is not None:
+            cache.close()
 
 
 @main.command()
 @click.option("--db-path", default="migration.db", help="DBファイルパス")
-def status(db_path: str) -> None:
+@click.option("--filter-status", "status_filter", multiple=True, help="ステータスで絞り込み (複数指定可)")
+@click.option("--rank", multiple=True, help="難易度ランクで絞り込み (複数指定可)")
+@click.option("--limit", default=50, show_default=True, help="一覧の最大表示件数")
+def status(
+    db_path: str,
+    status_filter: tuple[str, ...],
+    rank: tuple[str, ...],
+    limit: int,
+) -> None:
     """移行状況のサマリーを表示する"""
     db = MigrationDB(db_path)
     db.connect()
 
     try:
         summary = db.get_summary()
-        records = db.get_all_records()
+        page = db.query_records(
+            status=status_filter or None,
+            difficulty_rank=rank or None,
+            limit=limit,
+        )
+        records = page.items
 
         console.print(f"\n[bold]移行状況サマリー[/bold]")
         console.print(f"総数: {summary['total']}")
@@ -110,6 +149,8 @@ def status(db_path: str) -> None:
 
         if records:
             _print_records_table(records)
+            if page.next_cursor is not None:
+                console.print(f"[dim]先頭 {limit} 件のみ表示 (--limit で変更)[/dim]")
     finally:
         db.close()
 
@@ -0,0 +1,99 @@
+"""HTTP接続設定 - 接続プール・リトライ・タイムアウト・リクエストボディ圧縮"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# リトライ対象とするHTTPステータス (一時的な過負荷・ゲートウェイ障害)
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+@dataclass
+class HttpSettings:
+    """APIクライアント共通のHTTP接続設定 (settings.yaml の http セクション)"""
+
+    pool_connections: int = 4      # 接続先ホストごとのプール数
+    pool_maxsize: int = 16         # 1ホストあたりの保持接続数 (同時リクエスト数以上にする)
+    max_retries: int = 3           # 冪等メソッド (GET/PUT/DELETE 等) のみリトライする
+    backoff_factor: float = 0.5    # リトライ間隔 = backoff_factor * 2^(n-1) 秒
+    connect_timeout: float = 5.0   # 接続確立のタイムアウト (読み取りは各クライアントの timeout)
+    gzip_requests: bool = False    # JSON/テキストのリクエストボディを gzip 圧縮する
+    gzip_min_bytes: int = 1024     # これより小さいボディは圧縮しない
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> HttpSettings:
+        """設定辞書から生成する (未知のキーは無視する)"""
+        names = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
+
+    def timeouts(self, read: float) -> tuple[float, float]:
+        """requests に渡す (接続, 読み取り) タイムアウト"""
+        return (self.connect_timeout, read)
+
+
+class GzipHTTPAdapter(HTTPAdapter):
+    """JSON/テキストのリクエストボディを gzip 圧縮して送る HTTPAdapter
+
+    パッケージ (.nupkg) などのバイナリは既に圧縮済みのため対象外。
+    """
+
+    def __init__(self, gzip_min_bytes: int | None = None, **kwargs: Any):
+        self.gzip_min_bytes = gzip_min_bytes
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self.gzip_min_bytes is not None:
+            self._compress_body(request)
+        return super().send(request, **kwargs)
+
+    def _compress_body(self, request: requests.PreparedRequest) -> None:
+        body = request.body
+        if not body or "Content-Encoding" in request.headers:
+            return
+        content_type = request.headers.get("Content-Type", "")
+        if not (content_type.startswith("application/json") or content_type.startswith("text/")):
+            return
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if not isinstance(body, bytes) or len(body) < self.gzip_min_bytes:
+            return
+        request.body = gzip.compress(body, compresslevel=5)
+        request.headers["Content-Encoding"] = "gzip"
+        request.headers["Content-Length"] = str(len(request.body))
+
+
+def build_session(settings: HttpSettings | None = None) -> requests.Session:
+    """接続プール・リトライ・圧縮を設定した requests.Session を作る
+
+    POST はサーバ側で処理済みの可能性があるためリトライしない
+    (ジョブやプロセスの二重作成を防ぐ)。
+    """
+    settings = settings or HttpSettings()
+    retry = Retry(
+        total=settings.max_retries,
+        backoff_factor=settings.backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = GzipHTTPAdapter(
+        gzip_min_bytes=settings.gzip_min_bytes if settings.gzip_requests else None,
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -84,6 +84,7 @@ class ComplexityScore:
     total_score: float = 0.0
     rank: DifficultyRank = DifficultyRank.A
     risk_flags: list[str] = field(default_factory=list)
+    action_counts: dict[str, int] = field(default_factory=dict)  # アクションタイプ別件数 (見積用)
 
 
 @dataclass
@@ -98,17 +99,31 @@ class AssessmentReport:
     analyzed_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ASTNode:
-    """中間AST表現"""
+    """中間AST表現
+
+    ノード数が多くなるため __slots__ で保持する。properties は元の
+    BizRoboAction と共有する読み取り専用のdict (コピーしない)。
+    """
     node_type: str
     name: str
     properties: dict[str, Any] = field(default_factory=dict)
     children: list[ASTNode] = field(default_factory=list)
-    metadata: dict[str, Any] = field(default_factory=dict)
+    original_name: str = ""
+    line_number: int = 0
 
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """変換元情報 (互換用に都度dictを組み立てる)"""
+        return {
+            "original_type": self.name,
+            "original_name": self.original_name or self.name,
+            "line_number": self.line_number,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class AkaBotActivity:
     """aKaBotアクティビティ"""
     activity_type: str
@@ -129,6 +144,10 @@ class ConversionResult:
     todo_items: list[str] = field(default_factory=list)
     conversion_rate: float = 0.0
     converted_at: datetime = field(default_factory=datetime.now)
+    # ストリーミングモード時のXAML要素ツリー (xaml_content は空、pickle不可)
+    xaml_tree: Any = field(default=None, repr=False, compare=False)
+    # ストリーミングモードで書き出した Main.xaml のパス (save_output が設定)
+    xaml_path: str = ""
 
 
 @dataclass
@@ -237,3 +256,18 @@ class DeploymentRecord:
     health_results: dict[str, bool] = field(default_factory=dict)
     error_message: str = ""
     deployed_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class HealthCheckResult:
+    """端末1台分のヘルスチェック結果"""
+    machine_name: str
+    machine_connected: bool = False
+    agent_running: bool = False
+    smoke_test: bool | None = None      # None = 未実施
+    # 段階ごとの所要秒数 (status / smoke_test / total)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def healthy(self) -> bool:
+        return self.machine_connected and self.agent_running and self.smoke_test is not False
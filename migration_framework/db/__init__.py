@@ -1,5 +1,6 @@
 """Migration DB - 進捗・結果・ログ管理"""
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from .migration_db import MigrationDB
+from .result_cache import ResultCache
 
-__all__ = ["MigrationDB"]
+__all__ = ["MigrationDB", "ResultCache"]
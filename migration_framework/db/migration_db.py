@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from migration_framework.common.models import (
     DifficultyRank,
@@ -16,22 +19,102 @@ from migration_framework.common.models import (
 
 logger = logging.getLogger(__name__)
 
+_UPSERT_RECORD_SQL = """
+    INSERT INTO migration_records
+        (robot_name, source_path, status, difficulty_rank,
+         complexity_score, conversion_rate, validation_score,
+         test_pass_rate, manual_items, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(robot_name) DO UPDATE SET
+        status=excluded.status,
+        difficulty_rank=excluded.difficulty_rank,
+        complexity_score=excluded.complexity_score,
+        conversion_rate=excluded.conversion_rate,
+        validation_score=excluded.validation_score,
+        test_pass_rate=excluded.test_pass_rate,
+        manual_items=excluded.manual_items,
+        updated_at=excluded.updated_at
+"""
+
+_INSERT_LOG_SQL = (
+    "INSERT INTO migration_logs (robot_name, phase, level, message, created_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
+# query_records で並び替え・射影に使えるカラム
+RECORD_COLUMNS = (
+    "robot_name", "source_path", "status", "difficulty_rank",
+    "complexity_score", "conversion_rate", "validation_score",
+    "test_pass_rate", "manual_items", "created_at", "updated_at",
+)
+
+
+E = TypeVar("E", MigrationStatus, DifficultyRank)
+
+
+def _enum_value(enum_cls: type[E], value: Any, default: E, robot_name: str) -> E:
+    """DB の値を Enum に変換する
+
+    未知の値 (別バージョンが書いた値など) は警告を出して default にする。
+    """
+    try:
+        return enum_cls(value)
+    except ValueError:
+        logger.warning(
+            "未知の%s: %s (%r) → %s として扱います",
+            enum_cls.__name__, robot_name, value, default.value,
+        )
+        return default
+
+
+@dataclass
+class RecordPage:
+    """query_records の1ページ分の結果
+
+    next_cursor を次回の after に渡すと続きのページを取得できる
+    (最終ページでは None)。
+    """
+    items: list[Any]
+    next_cursor: tuple[Any, str] | None = None
+
 
 class MigrationDB:
-    """SQLiteベースの移行管理データベース"""
+    """SQLiteベースの移行管理データベース
 
-    def __init__(self, db_path: str | Path = "migration.db"):
+    通常は書き込みごとにコミットする。batch() ブロック内では
+    upsert_record / add_log をメモリに溜め、ブロック終了時に
+    executemany + 1回のコミットでまとめて書き込む。
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = "migration.db",
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+    ):
         self.db_path = str(db_path)
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
         self._conn: sqlite3.Connection | None = None
+        self._batch_depth = 0
+        self._pending_records: dict[str, tuple[Any, ...]] = {}
+        self._pending_logs: list[tuple[str, str, str, str, str]] = []
 
     def connect(self) -> None:
         self._conn = sqlite3.connect(self.db_path)
         self._conn.row_factory = sqlite3.Row
+        # WAL + synchronous=NORMAL: コミットごとの fsync を減らし、読み手 (GUI) を妨げない
+        self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
         self._create_tables()
         logger.info("DB接続: %s", self.db_path)
 
     def close(self) -> None:
         if self._conn:
+            if self._pending_records or self._pending_logs:
+                self._flush()
+                self._conn.commit()
             self._conn.close()
             self._conn = None
 
@@ -72,6 +155,37 @@ class MigrationDB:
                 details TEXT,
                 executed_at TEXT
             );
+
+            -- ロボット間依存の隣接表 (kind: sub_robot / file / api)
+            CREATE TABLE IF NOT EXISTS robot_dependencies (
+                robot_name TEXT NOT NULL,
+                depends_on TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                PRIMARY KEY (robot_name, depends_on, kind)
+            );
+
+            -- query_records のキーセットページング (col, robot_name) 用の複合インデックス
+            -- (旧版の単一カラムインデックスは置き換える)
+            DROP INDEX IF EXISTS idx_records_status;
+            DROP INDEX IF EXISTS idx_records_rank;
+            DROP INDEX IF EXISTS idx_records_created;
+            DROP INDEX IF EXISTS idx_records_updated;
+            CREATE INDEX IF NOT EXISTS idx_records_status_name
+                ON migration_records (status, robot_name);
+            CREATE INDEX IF NOT EXISTS idx_records_rank_name
+                ON migration_records (difficulty_rank, robot_name);
+            CREATE INDEX IF NOT EXISTS idx_records_created_name
+                ON migration_records (created_at, robot_name);
+            CREATE INDEX IF NOT EXISTS idx_records_updated_name
+                ON migration_records (updated_at, robot_name);
+            -- get_logs は id の降順でページングする
+            DROP INDEX IF EXISTS idx_logs_robot_created;
+            CREATE INDEX IF NOT EXISTS idx_logs_robot_id
+                ON migration_logs (robot_name, id);
+            CREATE INDEX IF NOT EXISTS idx_test_results_robot
+                ON test_results (robot_name);
+            CREATE INDEX IF NOT EXISTS idx_dependencies_target
+                ON robot_dependencies (depends_on, kind);
         """)
 
     @property
@@ -81,92 +195,218 @@ class MigrationDB:
         assert self._conn is not None
         return self._conn
 
+    # --- バッチ書き込み ---
+
+    @contextmanager
+    def batch(self) -> Iterator[MigrationDB]:
+        """ブロック内の書き込みを1トランザクションにまとめる
+
+        ネスト可能で、最も外側のブロック終了時にまとめて書き込む。
+        例外で抜けた場合は未反映の書き込みを破棄してロールバックする。
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._pending_records.clear()
+                self._pending_logs.clear()
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._flush()
+            self.conn.commit()
+
+    def _flush(self) -> None:
+        """溜めている書き込みを executemany で反映する (コミットはしない)"""
+        if self._pending_records:
+            self.conn.executemany(_UPSERT_RECORD_SQL, self._pending_records.values())
+            self._pending_records.clear()
+        if self._pending_logs:
+            self.conn.executemany(_INSERT_LOG_SQL, self._pending_logs)
+            self._pending_logs.clear()
+
+    def _commit(self) -> None:
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    # --- 書き込み ---
+
     def upsert_record(self, record: MigrationRecord) -> None:
         """移行レコードを挿入/更新する"""
         now = datetime.now().isoformat()
-        self.conn.execute("""
-            INSERT INTO migration_records
-                (robot_name, source_path, status, difficulty_rank,
-                 complexity_score, conversion_rate, validation_score,
-                 test_pass_rate, manual_items, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(robot_name) DO UPDATE SET
-                status=excluded.status,
-                difficulty_rank=excluded.difficulty_rank,
-                complexity_score=excluded.complexity_score,
-                conversion_rate=excluded.conversion_rate,
-                validation_score=excluded.validation_score,
-                test_pass_rate=excluded.test_pass_rate,
-                manual_items=excluded.manual_items,
-                updated_at=excluded.updated_at
-        """, (
+        params = (
             record.robot_name, record.source_path, record.status.value,
             record.difficulty_rank.value, record.complexity_score,
             record.conversion_rate, record.validation_score,
             record.test_pass_rate, record.manual_items,
             now, now,
-        ))
+        )
+        if self._batch_depth > 0:
+            # 同一ロボットの途中経過は最終状態だけ書けばよい
+            self._pending_records.pop(record.robot_name, None)
+            self._pending_records[record.robot_name] = params
+            return
+        self.conn.execute(_UPSERT_RECORD_SQL, params)
         self.conn.commit()
 
     def update_status(self, robot_name: str, status: MigrationStatus) -> None:
         now = datetime.now().isoformat()
+        self._flush()
         self.conn.execute(
             "UPDATE migration_records SET status=?, updated_at=? WHERE robot_name=?",
             (status.value, now, robot_name),
         )
-        self.conn.commit()
+        self._commit()
 
     def add_log(
         self, robot_name: str, phase: str, message: str, level: str = "info"
     ) -> None:
         now = datetime.now().isoformat()
-        self.conn.execute(
-            "INSERT INTO migration_logs (robot_name, phase, level, message, created_at) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (robot_name, phase, level, message, now),
-        )
+        params = (robot_name, phase, level, message, now)
+        if self._batch_depth > 0:
+            self._pending_logs.append(params)
+            return
+        self.conn.execute(_INSERT_LOG_SQL, params)
         self.conn.commit()
 
+    # --- 読み出し ---
+
     def get_record(self, robot_name: str) -> MigrationRecord | None:
+        self._flush()
         row = self.conn.execute(
             "SELECT * FROM migration_records WHERE robot_name=?",
             (robot_name,),
         ).fetchone()
         if row is None:
             return None
-        return MigrationRecord(
+        return self._row_to_record(row)
+
+    def get_all_records(self) -> list[MigrationRecord]:
+        self._flush()
+        rows = self.conn.execute(
+            "SELECT * FROM migration_records ORDER BY robot_name"
+        ).fetchall()
+        return [self._row_to_record(r) for r in rows]
+
+    def query_records(
+        self,
+        status: str | Sequence[str] | None = None,
+        difficulty_rank: str | Sequence[str] | None = None,
+        name_contains: str | None = None,
+        order_by: str = "robot_name",
+        descending: bool = False,
+        limit: int = 100,
+        after: tuple[Any, str] | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> RecordPage:
+        """移行レコードをフィルタ・ソート・キーセットページングで取得する
+
+        - status / difficulty_rank: 値または値のリスト (Enum も可)
+        - order_by: RECORD_COLUMNS のいずれか。同値は robot_name で並べる
+        - after: 前ページの next_cursor (OFFSET を使わないので深いページも高速)
+        - columns: 指定時は該当カラムのみの dict を返す (省略時は MigrationRecord)
+        """
+        if order_by not in RECORD_COLUMNS:
+            raise ValueError(f"未対応のソートキー: {order_by}")
+        if columns is not None:
+            unknown = set(columns) - set(RECORD_COLUMNS)
+            if unknown:
+                raise ValueError(f"未対応のカラム: {', '.join(sorted(unknown))}")
+
+        self._flush()
+        where, params = self._record_filters(status, difficulty_rank)
+        if name_contains:
+            where.append("robot_name LIKE ?")
+            params.append(f"%{name_contains}%")
+        if after is not None:
+            op = "<" if descending else ">"
+            where.append(f"({order_by}, robot_name) {op} (?, ?)")
+            params.extend(after)
+
+        direction = "DESC" if descending else "ASC"
+        # カーソル生成のため order_by と robot_name は常に取得する
+        select = ["*"] if columns is None else sorted(
+            set(columns) | {order_by, "robot_name"}, key=RECORD_COLUMNS.index
+        )
+        sql = f"SELECT {', '.join(select)} FROM migration_records"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_by} {direction}, robot_name {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self.conn.execute(sql, params).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = (rows[-1][order_by], rows[-1]["robot_name"])
+
+        if columns is None:
+            items: list[Any] = [self._row_to_record(r) for r in rows]
+        else:
+            items = [{c: r[c] for c in columns} for r in rows]
+        return RecordPage(items=items, next_cursor=next_cursor)
+
+    def count_records(
+        self,
+        status: str | Sequence[str] | None = None,
+        difficulty_rank: str | Sequence[str] | None = None,
+    ) -> int:
+        """条件に一致するレコード数を返す"""
+        self._flush()
+        where, params = self._record_filters(status, difficulty_rank)
+        sql = "SELECT COUNT(*) AS cnt FROM migration_records"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self.conn.execute(sql, params).fetchone()["cnt"]
+
+    @staticmethod
+    def _record_filters(
+        status: str | Sequence[str] | None,
+        difficulty_rank: str | Sequence[str] | None,
+    ) -> tuple[list[str], list[Any]]:
+        """status / difficulty_rank 条件の WHERE 句とパラメータを組み立てる"""
+        where: list[str] = []
+        params: list[Any] = []
+        for column, value in (("status", status), ("difficulty_rank", difficulty_rank)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            values = [getattr(v, "value", v) for v in values]
+            where.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        return where, params
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> MigrationRecord:
+        record = MigrationRecord(
             robot_name=row["robot_name"],
             source_path=row["source_path"] or "",
-            status=MigrationStatus(row["status"]),
-            difficulty_rank=DifficultyRank(row["difficulty_rank"]),
+            status=_enum_value(
+                MigrationStatus, row["status"], MigrationStatus.PENDING, row["robot_name"],
+            ),
+            difficulty_rank=_enum_value(
+                DifficultyRank, row["difficulty_rank"], DifficultyRank.A, row["robot_name"],
+            ),
             complexity_score=row["complexity_score"],
             conversion_rate=row["conversion_rate"],
             validation_score=row["validation_score"],
             test_pass_rate=row["test_pass_rate"],
             manual_items=row["manual_items"] or "",
         )
-
-    def get_all_records(self) -> list[MigrationRecord]:
-        rows = self.conn.execute(
-            "SELECT * FROM migration_records ORDER BY robot_name"
-        ).fetchall()
-        return [
-            MigrationRecord(
-                robot_name=r["robot_name"],
-                source_path=r["source_path"] or "",
-                status=MigrationStatus(r["status"]),
-                difficulty_rank=DifficultyRank(r["difficulty_rank"]),
-                complexity_score=r["complexity_score"],
-                conversion_rate=r["conversion_rate"],
-                validation_score=r["validation_score"],
-                test_pass_rate=r["test_pass_rate"],
-                manual_items=r["manual_items"] or "",
-            )
-            for r in rows
-        ]
+        if row["created_at"]:
+            record.created_at = datetime.fromisoformat(row["created_at"])
+        if row["updated_at"]:
+            record.updated_at = datetime.fromisoformat(row["updated_at"])
+        return record
 
     def delete_record(self, robot_name: str) -> None:
         """レコードを削除する"""
+        self._flush()
         self.conn.execute(
             "DELETE FROM migration_records WHERE robot_name=?", (robot_name,)
         )
@@ -176,16 +416,34 @@ class MigrationDB:
         self.conn.execute(
             "DELETE FROM test_results WHERE robot_name=?", (robot_name,)
         )
-        self.conn.commit()
+        self._commit()
 
-    def get_logs(self, robot_name: str) -> list[dict[str, Any]]:
-        """ロボットのログを取得する"""
-        rows = self.conn.execute(
-            "SELECT * FROM migration_logs WHERE robot_name=? ORDER BY created_at DESC",
-            (robot_name,),
-        ).fetchall()
+    def get_logs(
+        self,
+        robot_name: str,
+        limit: int | None = None,
+        before_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """ロボットのログを新しい順に取得する
+
+        limit 指定時は before_id (前ページ末尾の "id") を使ってページングできる。
+        並び順はページングのキーと同じ id の降順 (= 追加した順の逆)。
+        """
+        self._flush()
+        sql = "SELECT * FROM migration_logs WHERE robot_name=?"
+        params: list[Any] = [robot_name]
+        if before_id is not None:
+            sql += " AND id < ?"
+            params.append(before_id)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.conn.execute(sql, params).fetchall()
         return [
             {
+                "id": r["id"],
                 "timestamp": r["created_at"],
                 "phase": r["phase"],
                 "level": r["level"],
@@ -194,8 +452,41 @@ class MigrationDB:
             for r in rows
         ]
 
+    def save_dependencies(self, edges: Sequence[tuple[str, str, str]]) -> None:
+        """ロボット依存の隣接表を (ロボット名, 依存先, 種別) の行で置き換える"""
+        self._flush()
+        self.conn.execute("DELETE FROM robot_dependencies")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO robot_dependencies (robot_name, depends_on, kind) "
+            "VALUES (?, ?, ?)",
+            edges,
+        )
+        self._commit()
+
+    def get_dependencies(
+        self, robot_name: str | None = None, kind: str | None = None
+    ) -> list[tuple[str, str, str]]:
+        """依存関係の行を取得する (robot_name / kind で絞り込み可)"""
+        self._flush()
+        clauses: list[str] = []
+        params: list[str] = []
+        if robot_name is not None:
+            clauses.append("robot_name = ?")
+            params.append(robot_name)
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            "SELECT robot_name, depends_on, kind FROM robot_dependencies"
+            f"{where} ORDER BY robot_name, kind, depends_on",
+            params,
+        ).fetchall()
+        return [(r["robot_name"], r["depends_on"], r["kind"]) for r in rows]
+
     def get_summary(self) -> dict[str, Any]:
         """全体サマリーを取得する"""
+        self._flush()
         total = self.conn.execute(
             "SELECT COUNT(*) as cnt FROM migration_records"
         ).fetchone()["cnt"]
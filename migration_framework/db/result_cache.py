@@ -0,0 +1,219 @@
+"""Result Cache - コンテンツアドレス方式の再移行キャッシュ"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pickle
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from migration_framework.common.models import (
+    AssessmentReport,
+    ConversionResult,
+    ValidationReport,
+)
+
+logger = logging.getLogger(__name__)
+
+# 保存する結果オブジェクトの形式・算出ロジックを変えたら上げる
+CACHE_FORMAT_VERSION = 3
+
+# テーブル定義を変えたら上げる (不一致なら作り直す。キャッシュなので移行はしない)
+_SCHEMA_VERSION = 2
+
+
+@dataclass
+class CacheEntry:
+    """キャッシュ済みの Phase 1-3 結果"""
+    source_path: str
+    robot_name: str
+    source_hash: str
+    config_hash: str
+    action_types: list[str]
+    mapping_hash: str
+    assessment: AssessmentReport
+    conversion: ConversionResult
+    validation: ValidationReport
+
+
+class ResultCache:
+    """Phase 1-3 の結果をソース/設定のハッシュで管理するSQLiteキャッシュ
+
+    エントリはソースファイルの絶対パスで管理する (別ディレクトリの同名ロボットを区別する)。
+
+    キャッシュの有効判定:
+    - source_hash: ロボットファイル本体のハッシュ
+    - config_hash: 結果に影響する設定・変数型マッピング・テンプレート適用有無のハッシュ
+    - mapping_hash: ロボットが使うアクションタイプのマッピング定義のみのハッシュ
+      (他のアクションのマッピング変更ではキャッシュは無効化されない)
+
+    照会結果は get() で hits / misses に数える。MigrationDB と同様に
+    WAL + synchronous=NORMAL で開き、batch() ブロック内の put は
+    ブロック終了時に1回のコミットでまとめる。
+    """
+
+    def __init__(
+        self,
+        cache_path: str | Path = ".migration_cache.db",
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+    ):
+        self.cache_path = str(cache_path)
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self._conn: sqlite3.Connection | None = None
+        self._batch_depth = 0
+        self.hits = 0
+        self.misses = 0
+
+    def connect(self) -> None:
+        self._conn = sqlite3.connect(self.cache_path)
+        self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS result_cache")
+            self._conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                source_path TEXT PRIMARY KEY,
+                robot_name TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                config_hash TEXT NOT NULL,
+                action_types TEXT NOT NULL,
+                mapping_hash TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                created_at TEXT
+            )
+        """)
+        self._conn.commit()
+        logger.info("キャッシュ接続: %s", self.cache_path)
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.connect()
+        assert self._conn is not None
+        return self._conn
+
+    @contextmanager
+    def batch(self) -> Iterator[ResultCache]:
+        """ブロック内の put を1トランザクションにまとめる
+
+        ネスト可能で、最も外側のブロック終了時にコミットする。
+        例外で抜けた場合はロールバックする。
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    @staticmethod
+    def hash_file(file_path: Path, chunk_size: int = 1 << 20) -> str:
+        """ファイル内容のSHA-256を返す (大きなファイルも分割読込)"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint(value: Any) -> str:
+        """JSON化できる値の安定したハッシュを返す"""
+        data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        source_path: str,
+        source_hash: str,
+        config_hash: str,
+        mapping_hash: Callable[[list[str]], str] | None = None,
+    ) -> CacheEntry | None:
+        """ソース・設定が一致する有効なキャッシュエントリを返す (なければ None)
+
+        mapping_hash には action_types から現在のマッピング定義のハッシュを
+        求める関数を渡す。保存時のハッシュと異なるエントリは無効とする。
+        結果は hits / misses に数える。
+        """
+        entry = self._lookup(source_path, source_hash, config_hash)
+        if entry is not None and mapping_hash is not None:
+            if entry.mapping_hash != mapping_hash(entry.action_types):
+                logger.info("マッピング変更のため再移行: %s", entry.robot_name)
+                entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _lookup(
+        self, source_path: str, source_hash: str, config_hash: str
+    ) -> CacheEntry | None:
+        row = self.conn.execute(
+            "SELECT * FROM result_cache WHERE source_path=? AND source_hash=? AND config_hash=?",
+            (source_path, source_hash, config_hash),
+        ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            assessment, conversion, validation = pickle.loads(row[6])
+        except Exception as e:
+            logger.warning("キャッシュ破損のため無視: %s - %s", source_path, e)
+            return None
+
+        return CacheEntry(
+            source_path=row[0],
+            robot_name=row[1],
+            source_hash=row[2],
+            config_hash=row[3],
+            action_types=json.loads(row[4]),
+            mapping_hash=row[5],
+            assessment=assessment,
+            conversion=conversion,
+            validation=validation,
+        )
+
+    def put(self, entry: CacheEntry) -> None:
+        """キャッシュエントリを保存する (同じソースパスの古いエントリは置換)"""
+        payload = pickle.dumps(
+            (entry.assessment, entry.conversion, entry.validation),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self.conn.execute("""
+            INSERT OR REPLACE INTO result_cache
+                (source_path, robot_name, source_hash, config_hash,
+                 action_types, mapping_hash, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            entry.source_path, entry.robot_name, entry.source_hash, entry.config_hash,
+            json.dumps(entry.action_types, ensure_ascii=False),
+            entry.mapping_hash, payload, datetime.now().isoformat(),
+        ))
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    def clear(self) -> None:
+        """全キャッシュを削除する"""
+        self.conn.execute("DELETE FROM result_cache")
+        self.conn.commit()
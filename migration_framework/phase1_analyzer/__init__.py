@@ -4,6 +4,7 @@ from .parser import BizRoboParser
 from .complexity import ComplexityAnalyzer
 from .dependency import DependencyMapper
 from .classifier import DifficultyClassifier
+from .robot_graph import RobotGraph
 from .analyzer import Analyzer
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     "ComplexityAnalyzer",
     "DependencyMapper",
     "DifficultyClassifier",
+    "RobotGraph",
     "Analyzer",
 ]
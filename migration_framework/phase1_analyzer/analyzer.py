@@ -12,6 +12,7 @@ from .classifier import DifficultyClassifier
 from .complexity import ComplexityAnalyzer
 from .dependency import DependencyMapper
 from .parser import BizRoboParser
+from .robot_graph import RobotGraph
 
 logger = logging.getLogger(__name__)
 
@@ -72,10 +73,23 @@ class Analyzer:
             except Exception as e:
                 logger.error("解析失敗: %s - %s", file_path, e)
 
-        # 優先順位付与
-        reports = self.classifier.prioritize(reports)
+        reports = self.prioritize(reports)
 
         logger.info(
             "全体解析完了: %d/%d 成功", len(reports), len(robot_files)
         )
         return reports
+
+    def prioritize(
+        self, reports: list[AssessmentReport], graph: RobotGraph | None = None,
+    ) -> list[AssessmentReport]:
+        """全レポートを設定の閾値で一括スコアリングし、優先順位順に並べる
+
+        サブロボットの呼び出し先が呼び出し元より先になるよう依存グラフの
+        wave 順を最優先にする (graph 省略時は reports から作る)。
+        """
+        if graph is None:
+            graph = RobotGraph.from_robots(r.robot for r in reports)
+        return self.classifier.prioritize(
+            reports, graph, self.complexity_analyzer.thresholds,
+        )
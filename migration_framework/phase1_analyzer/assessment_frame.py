@@ -0,0 +1,158 @@
+"""資産全体の解析フレーム - 複雑度特徴量の列指向テーブルと一括再スコアリング
+
+pandas を使うため phase1_analyzer/__init__ では再エクスポートしない
+(パイプラインのワーカープロセスに pandas の import を強いないため)。
+"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from migration_framework.common.models import AssessmentReport, DifficultyRank
+
+from .classifier import AUTO_RATE_BY_RANK, ESTIMATED_HOURS_BY_RANK
+from .complexity import DEFAULT_THRESHOLDS, SCORE_WEIGHTS
+from .robot_graph import RobotGraph
+
+logger = logging.getLogger(__name__)
+
+RANKS = [DifficultyRank.A, DifficultyRank.B, DifficultyRank.C, DifficultyRank.D]
+RANK_VALUES = [r.value for r in RANKS]
+
+# ランク番号 (0=A .. 3=D) で引く係数表
+_AUTO_RATES = np.array([AUTO_RATE_BY_RANK[r] for r in RANKS])
+_BASE_HOURS = np.array([ESTIMATED_HOURS_BY_RANK[r] for r in RANKS])
+
+# 特徴量カラム (1行 = 1ロボット)
+FEATURE_COLUMNS = (
+    "step_count", "branch_depth", "loop_depth", "external_deps", "risk_count", "wave",
+)
+
+
+class AssessmentFrame:
+    """全ロボットの複雑度特徴量を1つの DataFrame で保持する
+
+    DifficultyClassifier / ComplexityAnalyzer と同じ式を列演算で適用するため、
+    閾値を変えた再スコアリングや優先順位付けを全件まとめて行える。
+    """
+
+    def __init__(self, features: pd.DataFrame):
+        missing = [c for c in ("robot_name", *FEATURE_COLUMNS) if c not in features]
+        if missing:
+            raise ValueError(f"特徴量カラムが不足しています: {missing}")
+        self.features = features.reset_index(drop=True)
+
+    @classmethod
+    def from_reports(
+        cls,
+        reports: Iterable[AssessmentReport],
+        graph: RobotGraph | None = None,
+    ) -> AssessmentFrame:
+        """AssessmentReport 群から特徴量テーブルを作る"""
+        wave_of = graph.wave_index() if graph is not None else {}
+
+        rows = []
+        for report in reports:
+            c = report.complexity
+            key = Path(report.robot.file_path).stem
+            rows.append((
+                report.robot.name, key, c.step_count, c.branch_depth, c.loop_depth,
+                c.external_deps, len(c.risk_flags), wave_of.get(key, 0),
+            ))
+        features = pd.DataFrame.from_records(
+            rows, columns=["robot_name", "robot_key", *FEATURE_COLUMNS]
+        )
+        return cls(features.astype({c: np.int64 for c in FEATURE_COLUMNS}))
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def score(self, thresholds: dict[str, int] | None = None) -> pd.DataFrame:
+        """閾値を適用してスコア・ランク・自動化率・工数・優先順位を算出する
+
+        thresholds は analyzer.complexity_thresholds と同じ形式 (省略したランクは既定値)。
+        戻り値は features に total_score / rank / auto_convertible_rate /
+        estimated_hours / migration_priority を加えた DataFrame (元の行順)。
+        """
+        thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        f = self.features
+        steps = f["step_count"].to_numpy(dtype=np.float64)
+        risks = f["risk_count"].to_numpy(dtype=np.float64)
+        external = f["external_deps"].to_numpy()
+
+        total = (
+            steps * SCORE_WEIGHTS["step"]
+            + f["branch_depth"].to_numpy() * SCORE_WEIGHTS["branch"]
+            + f["loop_depth"].to_numpy() * SCORE_WEIGHTS["loop"]
+            + external * SCORE_WEIGHTS["external"]
+            + risks * SCORE_WEIGHTS["risk"]
+        )
+
+        # score <= A → 0, <= B → 1, <= C → 2, それ以外 → 3
+        bounds = np.array([thresholds["A"], thresholds["B"], thresholds["C"]], dtype=np.float64)
+        rank_index = np.searchsorted(bounds, total, side="left")
+
+        auto_rate = _AUTO_RATES[rank_index]
+        hours = _BASE_HOURS[rank_index]
+
+        # リスクフラグによる補正
+        has_risk = risks > 0
+        auto_rate = np.where(has_risk, np.maximum(0.1, auto_rate - 0.1 * risks), auto_rate)
+        hours = np.where(has_risk, hours + 2.0 * risks, hours)
+
+        # 外部依存による補正
+        many_deps = external > 3
+        auto_rate = np.where(many_deps, np.maximum(0.1, auto_rate - 0.05), auto_rate)
+        hours = np.where(many_deps, hours + 1.0, hours)
+
+        # (wave →) ランク → 高自動化率 → 低工数 の順 (同順位は元の順序を保つ)
+        order = np.lexsort((hours, -auto_rate, rank_index, f["wave"].to_numpy()))
+        priority = np.empty(len(f), dtype=np.int64)
+        priority[order] = np.arange(1, len(f) + 1)
+
+        result = f.copy()
+        result["total_score"] = total
+        result["rank"] = pd.Categorical.from_codes(rank_index, categories=RANK_VALUES)
+        result["auto_convertible_rate"] = auto_rate
+        result["estimated_hours"] = hours
+        result["migration_priority"] = priority
+        return result
+
+    @staticmethod
+    def apply(
+        reports: list[AssessmentReport], scored: pd.DataFrame,
+    ) -> list[AssessmentReport]:
+        """score() の結果を from_reports() に渡したレポートへ書き戻し、優先順位順で返す"""
+        if len(reports) != len(scored):
+            raise ValueError(f"レポート数と行数が一致しません: {len(reports)} != {len(scored)}")
+        ranks = [DifficultyRank(v) for v in scored["rank"].astype(str)]
+        columns = zip(
+            scored["total_score"].tolist(),
+            scored["auto_convertible_rate"].tolist(),
+            scored["estimated_hours"].tolist(),
+            scored["migration_priority"].tolist(),
+        )
+        for report, rank, (total, auto_rate, hours, priority) in zip(reports, ranks, columns):
+            report.complexity.total_score = total
+            report.complexity.rank = rank
+            report.auto_convertible_rate = auto_rate
+            report.estimated_hours = hours
+            report.migration_priority = priority
+        return sorted(reports, key=lambda r: r.migration_priority)
+
+    def summary(self, scored: pd.DataFrame) -> dict[str, object]:
+        """score() の結果からランク別件数・工数合計などを集計する"""
+        by_rank = scored["rank"].value_counts().reindex(RANK_VALUES, fill_value=0)
+        return {
+            "total": len(scored),
+            "by_rank": {k: int(v) for k, v in by_rank.items()},
+            "estimated_hours": float(scored["estimated_hours"].sum()),
+            "avg_auto_convertible_rate": (
+                float(scored["auto_convertible_rate"].mean()) if len(scored) else 0.0
+            ),
+        }
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 
 from migration_framework.common.models import (
     AssessmentReport,
@@ -11,6 +12,8 @@ from migration_framework.common.models import (
     DifficultyRank,
 )
 
+from .robot_graph import RobotGraph
+
 logger = logging.getLogger(__name__)
 
 # ランク別の自動変換見込み率
@@ -93,14 +96,35 @@ class DifficultyClassifier:
         return items
 
     def prioritize(
-        self, reports: list[AssessmentReport]
+        self,
+        reports: list[AssessmentReport],
+        graph: RobotGraph | None = None,
+        thresholds: dict[str, int] | None = None,
     ) -> list[AssessmentReport]:
-        """移行優先順位をソートして付番する"""
-        # ランクA → 高自動化率 → 低工数 の順で優先
-        rank_order = {DifficultyRank.A: 0, DifficultyRank.B: 1, DifficultyRank.C: 2, DifficultyRank.D: 3}
+        """移行優先順位をソートして付番する
+
+        thresholds を渡すと全レポートを AssessmentFrame の列演算でまとめて
+        再スコアリングし、ランク・自動化率・工数・優先順位を書き戻す。
+        省略時は classify() 済みのランク・自動化率・工数のまま並べて付番だけを行う。
+        graph を渡すと、呼び出し先ロボットが呼び出し元より先になるよう
+        依存グラフの wave 順を最優先にする。
+        """
+        if not reports:
+            return []
+        if thresholds is not None:
+            # pandas は一括処理でのみ必要なため、ワーカープロセスでは読み込まない
+            from .assessment_frame import AssessmentFrame
+
+            frame = AssessmentFrame.from_reports(reports, graph)
+            return frame.apply(reports, frame.score(thresholds))
+
+        # (wave →) ランクA → 高自動化率 → 低工数 の順で優先
+        wave_of = graph.wave_index() if graph is not None else {}
+        rank_order = {rank: i for i, rank in enumerate(DifficultyRank)}
         sorted_reports = sorted(
             reports,
             key=lambda r: (
+                wave_of.get(Path(r.robot.file_path).stem, 0),
                 rank_order[r.complexity.rank],
                 -r.auto_convertible_rate,
                 r.estimated_hours,
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
+from dataclasses import dataclass, field
 
 from migration_framework.common.models import (
     BizRoboAction,
@@ -31,28 +33,51 @@ RISK_ACTIONS = {
     "desktopRecorder", "DesktopRecorder",
 }
 
+# 総合スコアの重み
+SCORE_WEIGHTS = {
+    "step": 1.0,
+    "branch": 5.0,
+    "loop": 5.0,
+    "external": 3.0,
+    "risk": 10.0,
+}
+
+# ランク判定の閾値 (総合スコアの上限)。settings.yaml の analyzer.complexity_thresholds で上書き
+DEFAULT_THRESHOLDS = {"A": 10, "B": 30, "C": 60, "D": 9999}
+
+
+@dataclass
+class TreeMetrics:
+    """アクションツリー1回の走査で得られる集計値"""
+    step_count: int = 0
+    branch_depth: int = 0
+    loop_depth: int = 0
+    risk_flags: list[str] = field(default_factory=list)
+    action_counts: Counter[str] = field(default_factory=Counter)
+
 
 class ComplexityAnalyzer:
     """ロボットの複雑度を数値化する"""
 
     def __init__(self, thresholds: dict[str, int] | None = None):
-        self.thresholds = thresholds or {"A": 10, "B": 30, "C": 60, "D": 9999}
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
 
     def analyze(self, robot: BizRoboRobot) -> ComplexityScore:
         """複雑度スコアを算出する"""
-        step_count = self._count_steps(robot.actions)
-        branch_depth = self._max_nesting_depth(robot.actions, BRANCH_ACTIONS)
-        loop_depth = self._max_nesting_depth(robot.actions, LOOP_ACTIONS)
+        metrics = self.collect_metrics(robot.actions)
+        step_count = metrics.step_count
+        branch_depth = metrics.branch_depth
+        loop_depth = metrics.loop_depth
         external_deps = len(robot.external_connections) + len(robot.api_calls)
-        risk_flags = self._detect_risks(robot.actions)
+        risk_flags = metrics.risk_flags
 
         # 総合スコア算出 (重み付き)
         total_score = (
-            step_count * 1.0
-            + branch_depth * 5.0
-            + loop_depth * 5.0
-            + external_deps * 3.0
-            + len(risk_flags) * 10.0
+            step_count * SCORE_WEIGHTS["step"]
+            + branch_depth * SCORE_WEIGHTS["branch"]
+            + loop_depth * SCORE_WEIGHTS["loop"]
+            + external_deps * SCORE_WEIGHTS["external"]
+            + len(risk_flags) * SCORE_WEIGHTS["risk"]
         )
 
         rank = self._classify_rank(total_score)
@@ -65,6 +90,7 @@ class ComplexityAnalyzer:
             total_score=total_score,
             rank=rank,
             risk_flags=risk_flags,
+            action_counts=dict(metrics.action_counts),
         )
 
         logger.info(
@@ -73,44 +99,39 @@ class ComplexityAnalyzer:
         )
         return score
 
-    def _count_steps(self, actions: list[BizRoboAction]) -> int:
-        """アクション総数を再帰的にカウントする"""
-        count = len(actions)
-        for action in actions:
-            count += self._count_steps(action.children)
-        return count
-
-    def _max_nesting_depth(
-        self, actions: list[BizRoboAction], target_types: set[str]
-    ) -> int:
-        """特定タイプのアクションの最大ネスト深度を算出する"""
-        return self._calc_depth(actions, target_types, 0)
-
-    def _calc_depth(
-        self, actions: list[BizRoboAction], target_types: set[str], current: int
-    ) -> int:
-        max_depth = current
-        for action in actions:
-            if action.action_type in target_types:
-                child_depth = self._calc_depth(
-                    action.children, target_types, current + 1
-                )
-                max_depth = max(max_depth, child_depth)
-            else:
-                child_depth = self._calc_depth(
-                    action.children, target_types, current
-                )
-                max_depth = max(max_depth, child_depth)
-        return max_depth
-
-    def _detect_risks(self, actions: list[BizRoboAction]) -> list[str]:
-        """リスクのあるアクションを検出する"""
-        risks: list[str] = []
-        for action in actions:
-            if action.action_type in RISK_ACTIONS:
-                risks.append(f"{action.action_type}: {action.name}")
-            risks.extend(self._detect_risks(action.children))
-        return risks
+    @staticmethod
+    def collect_metrics(actions: list[BizRoboAction]) -> TreeMetrics:
+        """ステップ数・分岐/ループ深度・リスク・タイプ別件数を1回の走査で集計する
+
+        明示的なスタックで深さ優先 (親→子の順) に辿る。
+        深度はルートからの経路上にある分岐/ループアクションの数。
+        """
+        metrics = TreeMetrics()
+        counts = metrics.action_counts
+        risks = metrics.risk_flags
+        # (アクション, 親までの分岐深度, 親までのループ深度)
+        stack = [(action, 0, 0) for action in reversed(actions)]
+
+        while stack:
+            action, branch, loop = stack.pop()
+            action_type = action.action_type
+            metrics.step_count += 1
+            counts[action_type] += 1
+
+            if action_type in BRANCH_ACTIONS:
+                branch += 1
+                if branch > metrics.branch_depth:
+                    metrics.branch_depth = branch
+            elif action_type in LOOP_ACTIONS:
+                loop += 1
+                if loop > metrics.loop_depth:
+                    metrics.loop_depth = loop
+            elif action_type in RISK_ACTIONS:
+                risks.append(f"{action_type}: {action.name}")
+
+            stack.extend((child, branch, loop) for child in reversed(action.children))
+
+        return metrics
 
     def _classify_rank(self, score: float) -> DifficultyRank:
         """スコアからランクを判定する"""
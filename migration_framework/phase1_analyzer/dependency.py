@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Iterable, Iterator
 
 from migration_framework.common.models import BizRoboAction, BizRoboRobot
 
@@ -27,17 +28,31 @@ API_URL_PATTERN = re.compile(
     r'https?://[^\s"<>]+|wsdl://[^\s"<>]+'
 )
 
+# 接続キーワードの複合パターン (小文字化した値に適用する)
+CONNECTION_PATTERN = re.compile(
+    "|".join(
+        re.escape(k)
+        for k in sorted({k.lower() for k in CONNECTION_KEYWORDS}, key=len, reverse=True)
+    )
+)
+
+# URL・ファイルパスを1回の走査で分類する複合パターン
+# (同じ位置では URL を優先し、URL内のホスト名をパスとして拾わない)
+LOCATION_PATTERN = re.compile(
+    f"(?P<url>{API_URL_PATTERN.pattern})|(?P<path>{FILE_PATH_PATTERN.pattern})"
+)
+
 
 class DependencyMapper:
     """外部依存関係を検出・マッピングする"""
 
     def analyze(self, robot: BizRoboRobot) -> BizRoboRobot:
         """ロボットの依存関係を解析してrobotオブジェクトを更新する"""
-        all_props = self._collect_all_properties(robot.actions)
-
-        robot.external_connections = self._detect_connections(all_props)
-        robot.file_paths = self._extract_file_paths(all_props)
-        robot.api_calls = self._extract_api_calls(all_props)
+        (
+            robot.external_connections,
+            robot.file_paths,
+            robot.api_calls,
+        ) = self._scan(self._collect_all_properties(robot.actions))
 
         # サブロボット依存も含める
         robot.dependencies = (
@@ -57,41 +72,45 @@ class DependencyMapper:
         )
         return robot
 
+    @staticmethod
     def _collect_all_properties(
-        self, actions: list[BizRoboAction]
-    ) -> dict[str, str]:
-        """全アクションのプロパティを平坦化して収集する"""
-        all_props: dict[str, str] = {}
-        for action in actions:
+        actions: list[BizRoboAction],
+    ) -> Iterator[tuple[str, str, str]]:
+        """全アクションのプロパティを (アクション名, キー, 値) として順に返す
+
+        明示的なスタックで深さ優先 (親→子の順) に辿るため、
+        ネストが深くても再帰上限や中間dictの生成が発生しない。
+        """
+        stack = list(reversed(actions))
+        while stack:
+            action = stack.pop()
             for key, value in action.properties.items():
-                all_props[f"{action.name}.{key}"] = str(value)
-            child_props = self._collect_all_properties(action.children)
-            all_props.update(child_props)
-        return all_props
-
-    def _detect_connections(self, props: dict[str, str]) -> list[str]:
-        """外部接続文字列を検出する"""
-        connections: list[str] = []
-        for key, value in props.items():
-            value_lower = value.lower()
-            for keyword in CONNECTION_KEYWORDS:
-                if keyword in value_lower:
-                    connections.append(f"{key}: {value[:200]}")
-                    break
-        return list(set(connections))
-
-    def _extract_file_paths(self, props: dict[str, str]) -> list[str]:
-        """ファイルパスを抽出する"""
-        paths: list[str] = []
-        for value in props.values():
-            matches = FILE_PATH_PATTERN.findall(value)
-            paths.extend(matches)
-        return list(set(paths))
-
-    def _extract_api_calls(self, props: dict[str, str]) -> list[str]:
-        """API/URL呼び出しを抽出する"""
-        apis: list[str] = []
-        for value in props.values():
-            matches = API_URL_PATTERN.findall(value)
-            apis.extend(matches)
-        return list(set(apis))
+                yield action.name, key, str(value)
+            stack.extend(reversed(action.children))
+
+    def _scan(
+        self, props: Iterable[tuple[str, str, str]]
+    ) -> tuple[list[str], list[str], list[str]]:
+        """外部接続・ファイルパス・API呼び出しを1パスで抽出する
+
+        URL/パスは '/' か '\\' を含む値だけを LOCATION_PATTERN で走査する。
+        結果は重複を除いた初出順。
+        """
+        connections: dict[str, None] = {}
+        paths: dict[str, None] = {}
+        apis: dict[str, None] = {}
+        has_keyword = CONNECTION_PATTERN.search
+        finditer = LOCATION_PATTERN.finditer
+
+        for path, key, value in props:
+            if has_keyword(value.lower()):
+                connections[f"{path}.{key}: {value[:200]}"] = None
+            if "/" not in value and "\\" not in value:
+                continue
+            for match in finditer(value):
+                if match.lastgroup == "url":
+                    apis[match.group()] = None
+                else:
+                    paths[match.group()] = None
+
+        return list(connections), list(paths), list(apis)
@@ -12,6 +12,51 @@ from migration_framework.common.models import BizRoboAction, BizRoboRobot, BizRo
 
 logger = logging.getLogger(__name__)
 
+# BizRoboの既知アクションタグ一覧
+KNOWN_ACTION_TAGS = frozenset({
+    # 基本
+    "step", "Step", "action", "Action",
+    # ブラウザ
+    "openBrowser", "OpenBrowser", "navigate", "Navigate",
+    "closeBrowser", "CloseBrowser",
+    "click", "Click", "typeInto", "TypeInto",
+    "getText", "GetText", "extractData", "ExtractData",
+    "waitElement", "WaitElement",
+    # 条件分岐
+    "if", "If", "elseIf", "ElseIf", "else", "Else",
+    "switch", "Switch", "case", "Case",
+    "branch", "Branch",
+    # ループ
+    "forEach", "ForEach", "while", "While",
+    "loop", "Loop", "repeat", "Repeat",
+    # Excel
+    "excelOpen", "ExcelOpen", "excelReadRange", "ExcelReadRange",
+    "excelWriteRange", "ExcelWriteRange", "excelWriteCell", "ExcelWriteCell",
+    # ファイル
+    "copyFile", "CopyFile", "moveFile", "MoveFile",
+    "deleteFile", "DeleteFile", "createDirectory", "CreateDirectory",
+    # データ
+    "assign", "Assign", "log", "Log",
+    # エラーハンドリング
+    "tryCatch", "TryCatch", "throw", "Throw",
+    # メール
+    "sendMail", "SendMail",
+    # 待機
+    "delay", "Delay", "wait", "Wait",
+    # サブロボット
+    "executeRobot", "ExecuteRobot", "callRobot", "CallRobot",
+    # OCR/画像
+    "ocrRead", "OCRRead", "imageRecognition", "ImageRecognition",
+    # デスクトップ
+    "desktopRecorder", "DesktopRecorder",
+})
+
+# 変数定義タグ
+VARIABLE_TAGS = frozenset({"variable", "Variable", "parameter", "Parameter"})
+
+# サブロボット呼び出しタグ
+SUB_ROBOT_TAGS = frozenset({"executeRobot", "ExecuteRobot", "callRobot", "CallRobot"})
+
 
 class BizRoboParser:
     """BizRoboの.robot/.xmlファイルをパースしてロボット構造を抽出する"""
@@ -35,23 +80,81 @@ class BizRoboParser:
             raise ValueError(f"未対応のファイル形式: {suffix}")
 
     def _parse_xml(self, file_path: Path) -> BizRoboRobot:
-        """XMLファイルをパースする"""
-        tree = etree.parse(str(file_path))
-        root = tree.getroot()
+        """XMLファイルを iterparse で1パス走査してパースする
+
+        アクション・変数・サブロボット参照を1回の走査でまとめて収集し、
+        処理済みの要素はその場で解放する。ピークメモリはファイルサイズ
+        ではなくツリーの深さに比例する。
 
+        robot.actions には最上位のアクションのみを格納し、入れ子の
+        アクションは最も近い祖先アクションの children にだけ登録する
+        (アクション以外のラッパー要素は透過的に扱う)。
+        """
         robot = BizRoboRobot(
             file_path=file_path,
             name=file_path.stem,
         )
 
-        # アクション抽出
-        robot.actions = self._extract_actions(root)
-
-        # 変数抽出
-        robot.variables = self._extract_variables(root)
-
-        # サブロボット参照抽出
-        robot.sub_robots = self._extract_sub_robots(root)
+        # 開いている要素ごとの (アクション, 変数, 最も近い祖先アクション) スタック
+        stack: list[
+            tuple[BizRoboAction | None, BizRoboVariable | None, BizRoboAction | None]
+        ] = []
+        tag_cache: dict[str, str] = {}
+
+        for event, elem in etree.iterparse(
+            str(file_path), events=("start", "end"), huge_tree=True
+        ):
+            raw_tag = elem.tag
+            tag = tag_cache.get(raw_tag)
+            if tag is None:
+                tag = tag_cache[raw_tag] = self._strip_namespace(raw_tag)
+
+            if event == "start":
+                action: BizRoboAction | None = None
+                variable: BizRoboVariable | None = None
+                enclosing = stack[-1][2] if stack else None
+
+                if tag in KNOWN_ACTION_TAGS:
+                    # start 時点で登録してドキュメント順を保つ
+                    action = BizRoboAction(
+                        action_type=tag,
+                        name=elem.get("name", tag),
+                        line_number=elem.sourceline or 0,
+                    )
+                    if enclosing is None:
+                        robot.actions.append(action)
+                    else:
+                        enclosing.children.append(action)
+
+                    # サブロボット参照
+                    if tag in SUB_ROBOT_TAGS:
+                        robot_ref = elem.get("robotUrl", elem.get("robot", ""))
+                        if robot_ref:
+                            robot.sub_robots.append(robot_ref)
+
+                elif tag in VARIABLE_TAGS:
+                    variable = BizRoboVariable(
+                        name=elem.get("name", "unknown"),
+                        var_type=elem.get("type", "String"),
+                        default_value=elem.get("defaultValue"),
+                        scope=elem.get("scope", "workflow"),
+                    )
+                    robot.variables.append(variable)
+
+                stack.append((action, variable, action or enclosing))
+                continue
+
+            # end: テキストが確定するのはここ
+            action, variable, _ = stack.pop()
+            if action is not None:
+                action.properties = self._extract_properties(elem)
+            if variable is not None and elem.get("defaultValue") is None:
+                variable.default_value = elem.text
+
+            # 処理済み要素を解放
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
 
         logger.info(
             "パース完了: %s (アクション=%d, 変数=%d)",
@@ -65,69 +168,6 @@ class BizRoboParser:
         """BizRobo .robotファイルをパースする (.robotもXML形式)"""
         return self._parse_xml(file_path)
 
-    def _extract_actions(self, root: etree._Element) -> list[BizRoboAction]:
-        """XMLツリーからアクションを再帰的に抽出する"""
-        actions: list[BizRoboAction] = []
-
-        for elem in root.iter():
-            tag = self._strip_namespace(elem.tag)
-
-            if tag in self._known_action_tags():
-                action = BizRoboAction(
-                    action_type=tag,
-                    name=elem.get("name", tag),
-                    properties=self._extract_properties(elem),
-                    children=self._extract_child_actions(elem),
-                    line_number=elem.sourceline or 0,
-                )
-                actions.append(action)
-
-        return actions
-
-    def _extract_child_actions(self, parent: etree._Element) -> list[BizRoboAction]:
-        """子アクションを抽出する"""
-        children: list[BizRoboAction] = []
-        for child in parent:
-            tag = self._strip_namespace(child.tag)
-            if tag in self._known_action_tags():
-                action = BizRoboAction(
-                    action_type=tag,
-                    name=child.get("name", tag),
-                    properties=self._extract_properties(child),
-                    children=self._extract_child_actions(child),
-                    line_number=child.sourceline or 0,
-                )
-                children.append(action)
-        return children
-
-    def _extract_variables(self, root: etree._Element) -> list[BizRoboVariable]:
-        """変数定義を抽出する"""
-        variables: list[BizRoboVariable] = []
-
-        for elem in root.iter():
-            tag = self._strip_namespace(elem.tag)
-            if tag in ("variable", "Variable", "parameter", "Parameter"):
-                var = BizRoboVariable(
-                    name=elem.get("name", "unknown"),
-                    var_type=elem.get("type", "String"),
-                    default_value=elem.get("defaultValue", elem.text),
-                    scope=elem.get("scope", "workflow"),
-                )
-                variables.append(var)
-
-        return variables
-
-    def _extract_sub_robots(self, root: etree._Element) -> list[str]:
-        """参照しているサブロボットを抽出する"""
-        sub_robots: list[str] = []
-        for elem in root.iter():
-            tag = self._strip_namespace(elem.tag)
-            if tag in ("executeRobot", "ExecuteRobot", "callRobot", "CallRobot"):
-                robot_ref = elem.get("robotUrl", elem.get("robot", ""))
-                if robot_ref:
-                    sub_robots.append(robot_ref)
-        return sub_robots
-
     def _extract_properties(self, elem: etree._Element) -> dict[str, Any]:
         """要素の属性をプロパティとして抽出する"""
         props: dict[str, Any] = {}
@@ -148,43 +188,3 @@ class BizRoboParser:
             return tag.split("}", 1)[1]
         return tag
 
-    @staticmethod
-    def _known_action_tags() -> set[str]:
-        """BizRoboの既知アクションタグ一覧"""
-        return {
-            # 基本
-            "step", "Step", "action", "Action",
-            # ブラウザ
-            "openBrowser", "OpenBrowser", "navigate", "Navigate",
-            "closeBrowser", "CloseBrowser",
-            "click", "Click", "typeInto", "TypeInto",
-            "getText", "GetText", "extractData", "ExtractData",
-            "waitElement", "WaitElement",
-            # 条件分岐
-            "if", "If", "elseIf", "ElseIf", "else", "Else",
-            "switch", "Switch", "case", "Case",
-            "branch", "Branch",
-            # ループ
-            "forEach", "ForEach", "while", "While",
-            "loop", "Loop", "repeat", "Repeat",
-            # Excel
-            "excelOpen", "ExcelOpen", "excelReadRange", "ExcelReadRange",
-            "excelWriteRange", "ExcelWriteRange", "excelWriteCell", "ExcelWriteCell",
-            # ファイル
-            "copyFile", "CopyFile", "moveFile", "MoveFile",
-            "deleteFile", "DeleteFile", "createDirectory", "CreateDirectory",
-            # データ
-            "assign", "Assign", "log", "Log",
-            # エラーハンドリング
-            "tryCatch", "TryCatch", "throw", "Throw",
-            # メール
-            "sendMail", "SendMail",
-            # 待機
-            "delay", "Delay", "wait", "Wait",
-            # サブロボット
-            "executeRobot", "ExecuteRobot", "callRobot", "CallRobot",
-            # OCR/画像
-            "ocrRead", "OCRRead", "imageRecognition", "ImageRecognition",
-            # デスクトップ
-            "desktopRecorder", "DesktopRecorder",
-        }
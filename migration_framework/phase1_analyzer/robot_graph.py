@@ -0,0 +1,213 @@
+"""ロボット間依存グラフ - サブロボット呼び出し・共有リソースの関係とスケジューリング"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from pathlib import PurePosixPath
+
+from migration_framework.common.models import BizRoboRobot
+
+logger = logging.getLogger(__name__)
+
+
+def robot_key(reference: str) -> str:
+    """ファイルパス・robotUrl などの参照からロボット名 (拡張子なしのファイル名) を得る"""
+    return PurePosixPath(reference.replace("\\", "/")).stem
+
+
+class RobotGraph:
+    """資産全体のロボット依存グラフ
+
+    隣接表:
+    - calls: 呼び出し元 → 呼び出し先 (サブロボット参照)
+    - callers: 呼び出し先 → 呼び出し元
+    - resources: 共有リソース ("file:<path>" / "api:<url>") → 使用ロボット
+
+    移行順序の制約になるのは calls のみ。共有リソースは影響範囲の
+    把握用で、ロボット数の2乗の辺を作らないようリソース単位で持つ。
+    """
+
+    def __init__(self) -> None:
+        self.nodes: list[str] = []
+        self.calls: dict[str, set[str]] = {}
+        self.callers: dict[str, set[str]] = {}
+        self.resources: dict[str, set[str]] = {}
+        # 解決できなかったサブロボット参照 (呼び出し元 → 参照文字列)
+        self.unresolved: dict[str, list[str]] = {}
+
+    def add_robot(
+        self,
+        name: str,
+        sub_robots: Iterable[str] = (),
+        file_paths: Iterable[str] = (),
+        api_calls: Iterable[str] = (),
+    ) -> None:
+        """ロボット1件分の参照を登録する (参照先の解決は resolve() で行う)"""
+        if name not in self.calls:
+            self.nodes.append(name)
+            self.calls[name] = set()
+            self.callers.setdefault(name, set())
+        self.unresolved.setdefault(name, []).extend(sub_robots)
+        for path in file_paths:
+            self.resources.setdefault(f"file:{path}", set()).add(name)
+        for url in api_calls:
+            self.resources.setdefault(f"api:{url}", set()).add(name)
+
+    def resolve(self) -> None:
+        """サブロボット参照をロボット名に解決して calls/callers を構築する
+
+        完全一致を優先し、見つからなければ大文字小文字を無視して照合する。
+        """
+        exact = set(self.nodes)
+        folded = {}
+        for name in self.nodes:
+            folded.setdefault(name.lower(), name)
+
+        for caller, refs in self.unresolved.items():
+            remaining: list[str] = []
+            for ref in refs:
+                key = robot_key(ref)
+                callee = key if key in exact else folded.get(key.lower())
+                if callee is None:
+                    remaining.append(ref)
+                    continue
+                self.calls[caller].add(callee)
+                self.callers[callee].add(caller)
+            refs[:] = remaining
+
+        self.unresolved = {k: v for k, v in self.unresolved.items() if v}
+
+    @classmethod
+    def from_robots(cls, robots: Iterable[BizRoboRobot]) -> RobotGraph:
+        """解析済みロボットからグラフを構築する"""
+        graph = cls()
+        for robot in robots:
+            graph.add_robot(
+                robot_key(str(robot.file_path)) or robot.name,
+                robot.sub_robots,
+                robot.file_paths,
+                robot.api_calls,
+            )
+        graph.resolve()
+        return graph
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """強連結成分を返す (Tarjan法・非再帰)
+
+        成分は呼び出し先が先に現れる順 (逆トポロジカル順) で返る。
+        """
+        index_of: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components: list[list[str]] = []
+        counter = 0
+
+        for root in self.nodes:
+            if root in index_of:
+                continue
+            # (ノード, 未訪問の隣接ノードのイテレータ)
+            work = [(root, iter(sorted(self.calls[root])))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for nxt in neighbors:
+                    if nxt not in index_of:
+                        index_of[nxt] = lowlink[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(sorted(self.calls[nxt]))))
+                        advanced = True
+                        break
+                    if nxt in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[nxt])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component: list[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+        return components
+
+    def cycles(self) -> list[list[str]]:
+        """循環参照している成分 (2件以上、または自己呼び出し) を返す"""
+        return [
+            c for c in self.strongly_connected_components()
+            if len(c) > 1 or c[0] in self.calls[c[0]]
+        ]
+
+    def waves(self) -> list[list[str]]:
+        """呼び出し先を先に移行する順でロボットを波 (wave) に分ける
+
+        同じ wave のロボットは互いに依存しないため並列に処理できる。
+        循環参照しているロボット群は同じ wave にまとめる。
+        """
+        components = self.strongly_connected_components()
+        component_of = {
+            name: i for i, members in enumerate(components) for name in members
+        }
+
+        # 成分ごとの未処理の呼び出し先成分数 (Kahn法)
+        pending: list[int] = [0] * len(components)
+        dependents: list[set[int]] = [set() for _ in components]
+        for i, members in enumerate(components):
+            callees = {
+                component_of[callee]
+                for name in members
+                for callee in self.calls[name]
+            } - {i}
+            pending[i] = len(callees)
+            for callee in callees:
+                dependents[callee].add(i)
+
+        waves: list[list[str]] = []
+        ready = [i for i, n in enumerate(pending) if n == 0]
+        while ready:
+            waves.append(sorted(name for i in ready for name in components[i]))
+            next_ready: list[int] = []
+            for i in ready:
+                for dependent in dependents[i]:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        next_ready.append(dependent)
+            ready = next_ready
+
+        return waves
+
+    def wave_index(self) -> dict[str, int]:
+        """ロボット名 → 所属する wave の番号 (0 始まり)"""
+        return {name: i for i, wave in enumerate(self.waves()) for name in wave}
+
+    def topological_order(self) -> list[str]:
+        """呼び出し先が呼び出し元より前に来る順序を返す"""
+        return [name for wave in self.waves() for name in wave]
+
+    def edges(self) -> list[tuple[str, str, str]]:
+        """隣接表を (ロボット名, 依存先, 種別) の行に展開する"""
+        rows = [
+            (caller, callee, "sub_robot")
+            for caller in self.nodes
+            for callee in sorted(self.calls[caller])
+        ]
+        for resource, robots in self.resources.items():
+            kind, _, target = resource.partition(":")
+            rows.extend((name, target, kind) for name in sorted(robots))
+        return rows
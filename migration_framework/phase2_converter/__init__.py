@@ -1,8 +1,8 @@
 """Phase 2: コード変換エンジン - AST変換・マッピング・XAML生成"""
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from .ast_builder import ASTBuilder
-from .mapping_engine import MappingEngine
+from .mapping_engine import ConversionContext, MappingEngine
 from .xaml_generator import XamlGenerator
 from .converter import Converter
 
-__all__ = ["ASTBuilder", "MappingEngine", "XamlGenerator", "Converter"]
+__all__ = ["ASTBuilder", "ConversionContext", "MappingEngine", "XamlGenerator", "Converter"]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from sys import intern
 
 from migration_framework.common.models import ASTNode, BizRoboAction, BizRoboRobot
 
@@ -42,18 +43,24 @@ class ASTBuilder:
         return nodes
 
     def _action_to_node(self, action: BizRoboAction) -> ASTNode:
-        """BizRoboActionをASTNodeに変換する"""
-        node_type = CONTROL_FLOW_MAP.get(action.action_type, "activity")
-
-        node = ASTNode(
-            node_type=node_type,
-            name=action.action_type,
-            properties=dict(action.properties),
-            children=[self._action_to_node(child) for child in action.children],
-            metadata={
-                "original_type": action.action_type,
-                "original_name": action.name,
-                "line_number": action.line_number,
-            },
-        )
-        return node
+        """BizRoboActionをASTNodeに変換する (子孫を含む)
+
+        プロパティdictはコピーせず共有し、タイプ名は intern して
+        ノード間で同じ文字列オブジェクトを使う。明示的なスタックで
+        親→子の順に辿るため、ネストが深くても再帰上限に達しない。
+        """
+        root: list[ASTNode] = []
+        stack: list[tuple[BizRoboAction, list[ASTNode]]] = [(action, root)]
+        while stack:
+            action, siblings = stack.pop()
+            action_type = intern(action.action_type)
+            node = ASTNode(
+                node_type=CONTROL_FLOW_MAP.get(action_type, "activity"),
+                name=action_type,
+                properties=action.properties,
+                original_name=action.name,
+                line_number=action.line_number,
+            )
+            siblings.append(node)
+            stack.extend((child, node.children) for child in reversed(action.children))
+        return root[0]
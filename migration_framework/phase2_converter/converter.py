@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import logging
+import time
+from dataclasses import replace
 from pathlib import Path
 
 from migration_framework.common.config import Config
 from migration_framework.common.models import (
     AssessmentReport,
+    ASTNode,
+    BizRoboRobot,
     ConversionResult,
 )
 
 from .ast_builder import ASTBuilder
-from .mapping_engine import MappingEngine
+from .mapping_engine import ConversionContext, MappingEngine
 from .xaml_generator import XamlGenerator
 
 logger = logging.getLogger(__name__)
@@ -25,6 +29,9 @@ class Converter:
     1. ASTBuilder: BizRoboアクション → 中間AST表現
     2. MappingEngine: AST → aKaBotアクティビティ (アクション対応表適用)
     3. XamlGenerator: aKaBotアクティビティ → XAML/project.json 生成
+
+    converter.fused_mapping が有効な場合は 1 を省略し、アクションから
+    直接アクティビティを生成する (AST はデバッグ用に build_ast() で取得可能)。
     """
 
     def __init__(self, config: Config):
@@ -32,21 +39,50 @@ class Converter:
         self.ast_builder = ASTBuilder()
         self.mapping_engine = MappingEngine(config.action_mapping)
         self.xaml_generator = XamlGenerator()
-
-    def convert(self, report: AssessmentReport) -> ConversionResult:
-        """解析レポートをもとに変換を実行する"""
+        # True: XAMLを要素ツリーのまま保持し、保存時に逐次書き出す
+        self.xaml_streaming: bool = config.get("converter.xaml_streaming", True)
+        # True: AST構築を省略してアクションを直接マッピングする
+        self.fused_mapping: bool = config.get("converter.fused_mapping", True)
+
+    def build_ast(self, robot: BizRoboRobot) -> list[ASTNode]:
+        """中間AST表現を構築する (fused モードでのデバッグ用)"""
+        return self.ast_builder.build(robot)
+
+    def convert(
+        self,
+        report: AssessmentReport,
+        ctx: ConversionContext | None = None,
+    ) -> ConversionResult:
+        """解析レポートをもとに変換を実行する
+
+        ctx を渡すと、変換後にタイプ別件数や所要時間を参照できる。
+        """
         robot = report.robot
+        if ctx is None:
+            ctx = ConversionContext()
+        ctx.robot_name = robot.name
         logger.info("=== Phase 2 変換開始: %s ===", robot.name)
 
-        # 1. AST構築
-        ast_nodes = self.ast_builder.build(robot)
-
-        # 2. マッピング (AST → aKaBotアクティビティ)
         activities = []
-        for node in ast_nodes:
-            activity = self.mapping_engine.map_node(node)
-            if activity:
-                activities.append(activity)
+        if self.fused_mapping:
+            # 1+2. アクション → aKaBotアクティビティ (1回の走査)
+            started = time.perf_counter()
+            for action in robot.actions:
+                activity = self.mapping_engine.map_action(action, ctx)
+                if activity:
+                    activities.append(activity)
+        else:
+            # 1. AST構築
+            started = time.perf_counter()
+            ast_nodes = self.build_ast(robot)
+            ctx.timings["ast"] = time.perf_counter() - started
+
+            # 2. マッピング (AST → aKaBotアクティビティ)
+            started = time.perf_counter()
+            for node in ast_nodes:
+                activity = self.mapping_engine.map_node(node, ctx)
+                if activity:
+                    activities.append(activity)
 
         # 変数マッピング
         variables = [
@@ -54,34 +90,37 @@ class Converter:
             for var in robot.variables
         ]
 
+        ctx.timings["mapping"] = time.perf_counter() - started
+
         # 3. XAML生成
-        xaml_content = self.xaml_generator.generate_xaml(
+        started = time.perf_counter()
+        xaml_tree = self.xaml_generator.build_tree(
             activities, variables, workflow_name="Main"
         )
+        xaml_content = ""
+        if not self.xaml_streaming:
+            xaml_content = self.xaml_generator.serialize(xaml_tree)
+            xaml_tree = None
         project_json = self.xaml_generator.generate_project_json(
             project_name=f"PRJ_{robot.name}",
             description=f"BizRoboから移行: {robot.name}",
         )
+        ctx.timings["xaml"] = time.perf_counter() - started
 
         # TODO項目の集約
         todo_items = list(report.manual_items)
-        for action_type in self.mapping_engine.unmapped_actions:
+        for action_type in ctx.unmapped_actions:
             todo_items.append(f"未対応アクション '{action_type}' の手動変換")
 
-        # 変換率計算
-        total_actions = len(ast_nodes)
-        unmapped_count = len(self.mapping_engine.unmapped_actions)
-        conversion_rate = (
-            (total_actions - unmapped_count) / total_actions
-            if total_actions > 0
-            else 0.0
-        )
+        # 変換率計算 (このロボットで変換したアクションのみが対象)
+        conversion_rate = ctx.conversion_rate
 
         result = ConversionResult(
             source_robot=robot.name,
             activities=activities,
             variables=variables,
             xaml_content=xaml_content,
+            xaml_tree=xaml_tree,
             project_json=project_json,
             todo_items=todo_items,
             conversion_rate=conversion_rate,
@@ -91,6 +130,11 @@ class Converter:
             "=== Phase 2 変換完了: %s (変換率=%.0f%%) ===",
             robot.name, conversion_rate * 100,
         )
+        logger.debug(
+            "変換統計: %s actions=%d unmapped=%d timings=%s",
+            robot.name, ctx.total_actions, ctx.unmapped_count,
+            {k: round(v, 4) for k, v in ctx.timings.items()},
+        )
         return result
 
     def save_output(self, result: ConversionResult, output_dir: Path) -> None:
@@ -99,9 +143,13 @@ class Converter:
         project_dir.mkdir(parents=True, exist_ok=True)
 
         # Main.xaml
-        (project_dir / "Main.xaml").write_text(
-            result.xaml_content, encoding="utf-8"
-        )
+        if result.xaml_tree is not None:
+            self.xaml_generator.write_xaml(result.xaml_tree, project_dir / "Main.xaml")
+            result.xaml_path = str(project_dir / "Main.xaml")
+        else:
+            (project_dir / "Main.xaml").write_text(
+                result.xaml_content, encoding="utf-8"
+            )
 
         # project.json
         (project_dir / "project.json").write_text(
@@ -114,3 +162,28 @@ class Converter:
             (project_dir / "TODO.md").write_text(todo_md, encoding="utf-8")
 
         logger.info("出力保存完了: %s", project_dir)
+
+    def detach_xaml(self, result: ConversionResult) -> ConversionResult:
+        """要素ツリーを外した (pickle可能な) 変換結果のコピーを返す
+
+        save_output で書き出し済みなら xaml_path だけを残し、ツリーを文字列化しない
+        (内容が必要な場合は load_xaml で読み込む)。未保存のものは文字列化する。
+        """
+        if result.xaml_tree is None:
+            return result
+        if result.xaml_path:
+            return replace(result, xaml_tree=None)
+        return replace(
+            result,
+            xaml_content=self.xaml_generator.serialize(result.xaml_tree),
+            xaml_tree=None,
+        )
+
+    @staticmethod
+    def load_xaml(result: ConversionResult) -> ConversionResult:
+        """書き出し済みの Main.xaml を xaml_content に読み込んだコピーを返す"""
+        if result.xaml_content or not result.xaml_path:
+            return result
+        return replace(
+            result, xaml_content=Path(result.xaml_path).read_text(encoding="utf-8"),
+        )
@@ -3,74 +3,192 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any
 
-from migration_framework.common.models import AkaBotActivity, ASTNode, BizRoboVariable
+from migration_framework.common.models import (
+    AkaBotActivity,
+    ASTNode,
+    BizRoboAction,
+    BizRoboVariable,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ConversionContext:
+    """1ロボット分の変換状態 (未対応アクション・タイプ別件数・所要時間)
+
+    MappingEngine 自体は状態を持たないため、変換ごとに新しい
+    コンテキストを渡せばスレッド/プロセス間でエンジンを共有できる。
+    """
+    robot_name: str = ""
+    action_counts: Counter[str] = field(default_factory=Counter)
+    unmapped: Counter[str] = field(default_factory=Counter)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_actions(self) -> int:
+        return sum(self.action_counts.values())
+
+    @property
+    def unmapped_count(self) -> int:
+        return sum(self.unmapped.values())
+
+    @property
+    def unmapped_actions(self) -> list[str]:
+        """未対応アクションタイプ (初出順・重複なし)"""
+        return list(self.unmapped)
+
+    @property
+    def conversion_rate(self) -> float:
+        total = self.total_actions
+        return (total - self.unmapped_count) / total if total > 0 else 0.0
+
+
+class MappingRule:
+    """コンパイル済みのマッピング定義 (1アクションタイプ分)"""
+
+    __slots__ = ("definition", "akabot_type", "note", "properties")
+
+    def __init__(self, definition: dict[str, Any]):
+        self.definition = definition
+        self.akabot_type: str | None = definition.get("akabot")
+        self.note: str = definition.get("note", "手動変換が必要")
+        # (BizRoboプロパティ名, aKaBotプロパティ名) のタプル
+        self.properties: tuple[tuple[str, str], ...] = tuple(
+            (definition.get("properties") or {}).items()
+        )
+
+
 class MappingEngine:
-    """アクション対応表を適用してASTをaKaBotアクティビティに変換する"""
+    """アクション対応表を適用してASTをaKaBotアクティビティに変換する
+
+    対応表は初期化時に一度だけ索引化する:
+    - 完全一致キー (定義名 + aliases)
+    - 小文字化キー (大文字小文字違いのフォールバック)
+    """
 
     def __init__(self, action_mapping: dict[str, Any]):
         self.mappings: dict[str, Any] = action_mapping.get("mappings", {})
         self.type_mapping: dict[str, str] = action_mapping.get(
             "variable_type_mapping", {}
         )
-        self._unmapped: list[str] = []
-
-    def map_node(self, node: ASTNode) -> AkaBotActivity | None:
-        """ASTNodeをaKaBotアクティビティに変換する"""
-        original_type = node.metadata.get("original_type", node.name)
-        mapping = self.mappings.get(original_type)
-
-        if mapping is None:
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """マッピング定義から完全一致・小文字化の索引を構築する"""
+        self._exact: dict[str, MappingRule] = {}
+        self._folded: dict[str, MappingRule] = {}
+
+        rules = [(key, MappingRule(val or {})) for key, val in self.mappings.items()]
+        # 定義名を優先し、aliases は未使用の名前にのみ割り当てる
+        for key, rule in rules:
+            self._exact[key] = rule
+        for _, rule in rules:
+            for alias in rule.definition.get("aliases", []) or []:
+                self._exact.setdefault(alias, rule)
+        for key, rule in self._exact.items():
+            self._folded.setdefault(key.lower(), rule)
+
+    def _lookup(self, action_type: str) -> MappingRule | None:
+        rule = self._exact.get(action_type)
+        if rule is None:
             # 大文字小文字違いでリトライ
-            for key, val in self.mappings.items():
-                if key.lower() == original_type.lower():
-                    mapping = val
-                    break
-
-        if mapping is None:
+            rule = self._folded.get(action_type.lower())
+        return rule
+
+    def find_mapping(self, action_type: str) -> dict[str, Any] | None:
+        """アクションタイプに対応するマッピング定義を返す (未定義なら None)"""
+        rule = self._lookup(action_type)
+        return rule.definition if rule is not None else None
+
+    def map_node(
+        self, node: ASTNode, ctx: ConversionContext | None = None
+    ) -> AkaBotActivity | None:
+        """ASTNodeをaKaBotアクティビティに変換する
+
+        変換中の集計は ctx に記録する (省略時は使い捨てのコンテキスト)。
+        """
+        if ctx is None:
+            ctx = ConversionContext()
+        return self._map_tree(node, ctx, _node_fields)
+
+    def map_action(
+        self, action: BizRoboAction, ctx: ConversionContext | None = None
+    ) -> AkaBotActivity | None:
+        """BizRoboActionをAST化せずに直接aKaBotアクティビティに変換する
+
+        map_node(ASTBuilder で構築したノード) と同じ結果になる。
+        """
+        if ctx is None:
+            ctx = ConversionContext()
+        return self._map_tree(action, ctx, _action_fields)
+
+    def _map_tree(
+        self,
+        root: Any,
+        ctx: ConversionContext,
+        fields: Callable[[Any], tuple[str, str, dict[str, Any], list[Any]]],
+    ) -> AkaBotActivity:
+        """map_node / map_action 共通の変換処理
+
+        明示的なスタックで深さ優先 (親→子の順) に辿るため、
+        ネストが深くても再帰上限に達しない。
+        """
+        mapped_root: list[AkaBotActivity] = []
+        # (変換元ノード, 変換結果を追加する親の children)
+        stack: list[tuple[Any, list[AkaBotActivity]]] = [(root, mapped_root)]
+
+        while stack:
+            item, siblings = stack.pop()
+            original_type, original_name, properties, children = fields(item)
+            activity, mapped = self._map_one(original_type, original_name, properties, ctx)
+            siblings.append(activity)
+            # 未対応アクションの子は変換しない (コメント1つに置き換える)
+            if mapped:
+                stack.extend((child, activity.children) for child in reversed(children))
+
+        return mapped_root[0]
+
+    def _map_one(
+        self,
+        original_type: str,
+        original_name: str,
+        properties: dict[str, Any],
+        ctx: ConversionContext,
+    ) -> tuple[AkaBotActivity, bool]:
+        """1ノード分を変換し、(アクティビティ, 子を変換するか) を返す"""
+        ctx.action_counts[original_type] += 1
+        rule = self._lookup(original_type)
+
+        if rule is None:
             logger.warning("マッピング未定義: %s", original_type)
-            self._unmapped.append(original_type)
+            ctx.unmapped[original_type] += 1
             return AkaBotActivity(
                 activity_type="AkaBot.Core.Activities.Comment",
                 display_name=f"TODO: {original_type} (未対応)",
                 properties={"Text": f"要手動変換: {original_type}"},
-            )
+            ), False
 
-        akabot_type = mapping.get("akabot")
+        akabot_type = rule.akabot_type
         if akabot_type is None:
             logger.warning("aKaBot対応なし (手動対応必要): %s", original_type)
-            self._unmapped.append(original_type)
-            note = mapping.get("note", "手動変換が必要")
+            ctx.unmapped[original_type] += 1
             return AkaBotActivity(
                 activity_type="AkaBot.Core.Activities.Comment",
                 display_name=f"TODO: {original_type}",
-                properties={"Text": note},
-            )
+                properties={"Text": rule.note},
+            ), False
 
-        # プロパティマッピング
-        mapped_props = self._map_properties(
-            node.properties, mapping.get("properties", {})
-        )
-
-        # 子ノードの変換
-        children = [
-            mapped
-            for child in node.children
-            if (mapped := self.map_node(child)) is not None
-        ]
-
-        activity = AkaBotActivity(
+        return AkaBotActivity(
             activity_type=akabot_type,
-            display_name=node.metadata.get("original_name", original_type),
-            properties=mapped_props,
-            children=children,
-        )
-        return activity
+            display_name=original_name or original_type,
+            properties=self._map_properties(properties, rule.properties),
+        ), True
 
     def map_variable(self, var: BizRoboVariable) -> dict[str, str]:
         """BizRobo変数をaKaBot変数定義に変換する"""
@@ -82,18 +200,22 @@ class MappingEngine:
             "Scope": var.scope,
         }
 
+    @staticmethod
     def _map_properties(
-        self,
         source_props: dict[str, Any],
-        prop_mapping: dict[str, str],
+        prop_mapping: tuple[tuple[str, str], ...],
     ) -> dict[str, str]:
         """ソースのプロパティをaKaBotプロパティにマッピングする"""
-        result: dict[str, str] = {}
-        for source_key, target_key in prop_mapping.items():
-            if source_key in source_props:
-                result[target_key] = str(source_props[source_key])
-        return result
+        return {
+            target_key: str(source_props[source_key])
+            for source_key, target_key in prop_mapping
+            if source_key in source_props
+        }
 
-    @property
-    def unmapped_actions(self) -> list[str]:
-        return list(set(self._unmapped))
+
+def _node_fields(node: ASTNode) -> tuple[str, str, dict[str, Any], list[ASTNode]]:
+    return node.name, node.original_name, node.properties, node.children
+
+
+def _action_fields(action: BizRoboAction) -> tuple[str, str, dict[str, Any], list[BizRoboAction]]:
+    return action.action_type, action.name, action.properties, action.children
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from pathlib import Path
+from typing import IO, Any
 
 from lxml import etree
 
@@ -21,6 +22,8 @@ NAMESPACES = {
     "sap2010": "http://schemas.microsoft.com/netfx/2010/xaml/activities/presentation",
 }
 
+XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+
 
 class XamlGenerator:
     """aKaBotのXAMLプロジェクトファイルを生成する"""
@@ -31,7 +34,16 @@ class XamlGenerator:
         variables: list[dict[str, str]],
         workflow_name: str = "Main",
     ) -> str:
-        """XAMLワークフローファイルを生成する"""
+        """XAMLワークフローファイルを文字列として生成する"""
+        return self.serialize(self.build_tree(activities, variables, workflow_name))
+
+    def build_tree(
+        self,
+        activities: list[AkaBotActivity],
+        variables: list[dict[str, str]],
+        workflow_name: str = "Main",
+    ) -> etree._Element:
+        """XAMLワークフローの要素ツリーを構築する (文字列化はしない)"""
         root = etree.Element(
             "Activity",
             nsmap={
@@ -67,21 +79,54 @@ class XamlGenerator:
         for activity in activities:
             self._add_activity(sequence, activity)
 
-        # XML文字列化
-        xaml_str = etree.tostring(
+        logger.info("XAML生成完了: %d アクティビティ", len(activities))
+        return root
+
+    @staticmethod
+    def serialize(root: etree._Element) -> str:
+        """要素ツリーをXAML文字列に変換する"""
+        return etree.tostring(
             root,
             pretty_print=True,
             xml_declaration=True,
             encoding="utf-8",
         ).decode("utf-8")
 
-        logger.info("XAML生成完了: %d アクティビティ", len(activities))
-        return xaml_str
+    @staticmethod
+    def write_xaml(root: etree._Element, target: Path | str | IO[bytes]) -> None:
+        """要素ツリーをファイル/バッファへ逐次書き出す
+
+        lxml の出力バッファ経由でチャンク単位に書き込むため、
+        ドキュメント全体のバイト列・文字列を Python 側に作らない。
+        出力内容は serialize() と同一。
+        """
+        if isinstance(target, (str, Path)):
+            with open(target, "wb") as f:
+                XamlGenerator.write_xaml(root, f)
+            return
+        # 宣言は serialize() と同じ表記 (小文字の utf-8) で出力する
+        target.write(XML_DECLARATION)
+        etree.ElementTree(root).write(target, pretty_print=True, encoding="utf-8")
 
     def _add_activity(
         self, parent: etree._Element, activity: AkaBotActivity
     ) -> None:
-        """アクティビティ要素をXMLに追加する"""
+        """アクティビティ要素 (子孫を含む) をXMLに追加する
+
+        明示的なスタックで親→子の順に追加するため、ネストが深くても
+        再帰上限に達しない。
+        """
+        stack = [(parent, activity)]
+        while stack:
+            parent, activity = stack.pop()
+            elem = self._activity_element(parent, activity)
+            stack.extend((elem, child) for child in reversed(activity.children))
+
+    @staticmethod
+    def _activity_element(
+        parent: etree._Element, activity: AkaBotActivity
+    ) -> etree._Element:
+        """アクティビティ1つ分の要素 (プロパティ付き) を parent の末尾に追加する"""
         # アクティビティタイプからタグ名を生成
         tag_name = activity.activity_type.split(".")[-1]
         elem = etree.SubElement(parent, tag_name)
@@ -101,11 +146,7 @@ class XamlGenerator:
                 sub.set(parts[-1], value)
             else:
                 elem.set(key, value)
-
-        # 子アクティビティ
-        if activity.children:
-            for child in activity.children:
-                self._add_activity(elem, child)
+        return elem
 
     def generate_project_json(
         self,
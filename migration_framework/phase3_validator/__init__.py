@@ -1,6 +1,6 @@
 """Phase 3: 検証エンジン - 構文チェック・ベストプラクティス・差分検出"""
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
-from .syntax_checker import SyntaxChecker
+from .syntax_checker import SyntaxChecker, XamlRule
 from .naming_checker import NamingChecker
 from .best_practice_checker import BestPracticeChecker
 from .diff_detector import DiffDetector
@@ -8,6 +8,7 @@ from .validator import Validator
 
 __all__ = [
     "SyntaxChecker",
+    "XamlRule",
     "NamingChecker",
     "BestPracticeChecker",
     "DiffDetector",
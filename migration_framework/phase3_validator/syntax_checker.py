@@ -10,95 +10,170 @@ from migration_framework.common.models import ValidationIssue
 
 logger = logging.getLogger(__name__)
 
+# 名前空間付きタグ → ローカル名 のキャッシュ (XAMLのタグ種類は少ない)
+_LOCAL_NAMES: dict[str, str] = {}
 
-class SyntaxChecker:
-    """生成されたXAMLの構文をチェックする"""
 
-    def check(self, xaml_content: str) -> list[ValidationIssue]:
-        """XAML構文チェックを実行する"""
-        issues: list[ValidationIssue] = []
+def local_name(tag: str) -> str:
+    """'{ns}Tag' 形式のタグからローカル名を返す"""
+    name = _LOCAL_NAMES.get(tag)
+    if name is None:
+        name = tag.rsplit("}", 1)[-1]
+        _LOCAL_NAMES[tag] = name
+    return name
+
+
+class XamlRule:
+    """XAML構文ルールの基底クラス
+
+    SyntaxChecker が1回の走査で各要素を visit() に渡し、走査後に
+    finish() を呼ぶ。ルールは check ごとに生成されるため、
+    インスタンス属性に走査中の状態を持ってよい。
+    """
+
+    # 対象とする要素のローカル名 (None は全要素)
+    tags: frozenset[str] | None = None
+
+    def __init__(self) -> None:
+        self.issues: list[ValidationIssue] = []
+
+    def visit(self, elem: etree._Element, tag: str) -> None:
+        raise NotImplementedError
+
+    def finish(self) -> list[ValidationIssue]:
+        return self.issues
+
 
-        # XML整形式チェック
-        try:
-            root = etree.fromstring(xaml_content.encode("utf-8"))
-        except etree.XMLSyntaxError as e:
-            issues.append(ValidationIssue(
-                severity="error",
+class DisplayNameRule(XamlRule):
+    """DisplayName必須チェック"""
+
+    def visit(self, elem: etree._Element, tag: str) -> None:
+        display_name = elem.get("DisplayName")
+        if display_name is not None and not display_name.strip():
+            self.issues.append(ValidationIssue(
+                severity="warning",
                 category="syntax",
-                message=f"XAML構文エラー: {e}",
+                message=f"DisplayNameが空です: {tag}",
+                location=tag,
+                suggestion="わかりやすい表示名を設定してください",
             ))
-            return issues
 
-        # DisplayName必須チェック
-        issues.extend(self._check_display_names(root))
 
-        # 空Sequenceチェック
-        issues.extend(self._check_empty_sequences(root))
+class EmptySequenceRule(XamlRule):
+    """空Sequenceチェック"""
 
-        # TODO コメントチェック (未変換項目)
-        issues.extend(self._check_todo_comments(root))
+    tags = frozenset({"Sequence"})
 
-        # 変数参照チェック
-        issues.extend(self._check_variable_references(root))
+    def visit(self, elem: etree._Element, tag: str) -> None:
+        if len(elem) == 0:
+            self.issues.append(ValidationIssue(
+                severity="warning",
+                category="syntax",
+                message="空のSequenceがあります",
+                location=elem.get("DisplayName", "unknown"),
+                suggestion="不要なSequenceは削除してください",
+            ))
 
-        logger.info("構文チェック完了: %d 件の問題", len(issues))
-        return issues
 
-    def _check_display_names(self, root: etree._Element) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-        for elem in root.iter():
-            display_name = elem.get("DisplayName")
-            if display_name is not None and not display_name.strip():
-                issues.append(ValidationIssue(
-                    severity="warning",
-                    category="syntax",
-                    message=f"DisplayNameが空です: {elem.tag}",
-                    location=elem.tag,
-                    suggestion="わかりやすい表示名を設定してください",
-                ))
-        return issues
+class TodoCommentRule(XamlRule):
+    """TODO コメントチェック (未変換項目)"""
 
-    def _check_empty_sequences(self, root: etree._Element) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-        for elem in root.iter():
-            tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-            if tag == "Sequence" and len(elem) == 0:
-                issues.append(ValidationIssue(
-                    severity="warning",
-                    category="syntax",
-                    message="空のSequenceがあります",
-                    location=elem.get("DisplayName", "unknown"),
-                    suggestion="不要なSequenceは削除してください",
-                ))
-        return issues
+    tags = frozenset({"Comment"})
 
-    def _check_todo_comments(self, root: etree._Element) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-        for elem in root.iter():
-            tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-            if tag == "Comment":
-                text = elem.get("Text", "")
-                if "TODO" in text or "未対応" in text or "手動" in text:
-                    issues.append(ValidationIssue(
-                        severity="warning",
-                        category="missing",
-                        message=f"未変換項目: {text}",
-                        location=elem.get("DisplayName", ""),
-                        suggestion="手動での変換作業が必要です",
-                    ))
-        return issues
+    def visit(self, elem: etree._Element, tag: str) -> None:
+        text = elem.get("Text", "")
+        if "TODO" in text or "未対応" in text or "手動" in text:
+            self.issues.append(ValidationIssue(
+                severity="warning",
+                category="missing",
+                message=f"未変換項目: {text}",
+                location=elem.get("DisplayName", ""),
+                suggestion="手動での変換作業が必要です",
+            ))
 
-    def _check_variable_references(self, root: etree._Element) -> list[ValidationIssue]:
-        """変数の定義と参照の整合性をチェックする"""
-        issues: list[ValidationIssue] = []
-        declared_vars: set[str] = set()
 
-        for elem in root.iter():
-            tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-            if tag == "Variable":
-                name = elem.get("Name", "")
-                if name:
-                    declared_vars.add(name)
+class VariableReferenceRule(XamlRule):
+    """変数の定義と参照の整合性をチェックする"""
 
+    tags = frozenset({"Variable"})
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.declared_vars: set[str] = set()
+
+    def visit(self, elem: etree._Element, tag: str) -> None:
+        name = elem.get("Name", "")
+        if name:
+            self.declared_vars.add(name)
+
+    def finish(self) -> list[ValidationIssue]:
         # TODO: プロパティ内の変数参照を解析してundeclaredを検出
+        return self.issues
+
+
+DEFAULT_RULES: tuple[type[XamlRule], ...] = (
+    DisplayNameRule,
+    EmptySequenceRule,
+    TodoCommentRule,
+    VariableReferenceRule,
+)
+
+
+class SyntaxChecker:
+    """生成されたXAMLの構文をチェックする
+
+    登録されたルールを1回のツリー走査でまとめて適用する。
+    ルールを追加しても走査回数は増えない。
+    """
+
+    def __init__(self, rules: list[type[XamlRule]] | None = None):
+        self.rules: list[type[XamlRule]] = list(rules or DEFAULT_RULES)
+
+    def register(self, rule: type[XamlRule]) -> None:
+        """ルールを追加する"""
+        self.rules.append(rule)
+
+    def check(self, xaml: str | etree._Element) -> list[ValidationIssue]:
+        """XAML構文チェックを実行する
+
+        xaml には XAML文字列、または生成済みの要素ツリーを渡せる。
+        要素ツリーの場合は再パースせずにそのまま検査する。
+        """
+        if isinstance(xaml, str):
+            # XML整形式チェック
+            try:
+                root = etree.fromstring(xaml.encode("utf-8"))
+            except etree.XMLSyntaxError as e:
+                return [ValidationIssue(
+                    severity="error",
+                    category="syntax",
+                    message=f"XAML構文エラー: {e}",
+                )]
+        else:
+            root = xaml
+
+        rules = [rule() for rule in self.rules]
+        self._walk(root, rules)
+
+        issues: list[ValidationIssue] = []
+        for rule in rules:
+            issues.extend(rule.finish())
+
+        logger.info("構文チェック完了: %d 件の問題", len(issues))
         return issues
+
+    @staticmethod
+    def _walk(root: etree._Element, rules: list[XamlRule]) -> None:
+        """ツリーを1回走査し、各要素を対象ルールへ振り分ける"""
+        any_tag = [r for r in rules if r.tags is None]
+        by_tag: dict[str, list[XamlRule]] = {}
+        for rule in rules:
+            for tag in rule.tags or ():
+                by_tag.setdefault(tag, []).append(rule)
+
+        for elem in root.iter(etree.Element):
+            tag = local_name(elem.tag)
+            for rule in any_tag:
+                rule.visit(elem, tag)
+            for rule in by_tag.get(tag, ()):
+                rule.visit(elem, tag)
@@ -49,7 +49,9 @@ class Validator:
         all_issues = []
 
         # 1. 構文チェック
-        if conversion.xaml_content:
+        if conversion.xaml_tree is not None:
+            all_issues.extend(self.syntax_checker.check(conversion.xaml_tree))
+        elif conversion.xaml_content:
             all_issues.extend(self.syntax_checker.check(conversion.xaml_content))
 
         # 2. 命名規則チェック
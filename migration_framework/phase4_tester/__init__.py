@@ -1,9 +1,9 @@
 """Phase 4: 自動テストフレームワーク - テスト実行・結果比較・レポート生成"""
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from .test_runner import TestRunner
-from .akabot_client import AkaBotClient
+from .akabot_client import AkaBotClient, AsyncAkaBotClient
 from .comparator import Comparator
 from .reporter import Reporter
 from .tester import Tester
 
-__all__ = ["TestRunner", "AkaBotClient", "Comparator", "Reporter", "Tester"]
+__all__ = ["TestRunner", "AkaBotClient", "AsyncAkaBotClient", "Comparator", "Reporter", "Tester"]
@@ -2,12 +2,20 @@
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import functools
 import logging
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any
 
 import requests
 
+from migration_framework.common.http import HttpSettings, build_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,10 +27,12 @@ class AkaBotClient:
         base_url: str = "http://localhost:8080/api/v1",
         api_key: str = "",
         timeout: int = 300,
+        http: HttpSettings | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.session = requests.Session()
+        self.http = http or HttpSettings()
+        self.session = build_session(self.http)
         if api_key:
             self.session.headers["Authorization"] = f"Bearer {api_key}"
         self.session.headers["Content-Type"] = "application/json"
@@ -41,7 +51,7 @@ class AkaBotClient:
             resp = self.session.post(
                 f"{self.base_url}/jobs",
                 json=payload,
-                timeout=30,
+                timeout=self.http.timeouts(30),
             )
             resp.raise_for_status()
             job_id = resp.json().get("jobId", "")
@@ -62,7 +72,7 @@ class AkaBotClient:
             try:
                 resp = self.session.get(
                     f"{self.base_url}/jobs/{job_id}",
-                    timeout=10,
+                    timeout=self.http.timeouts(10),
                 )
                 resp.raise_for_status()
                 data = resp.json()
@@ -86,7 +96,7 @@ class AkaBotClient:
         try:
             resp = self.session.get(
                 f"{self.base_url}/jobs/{job_id}/logs",
-                timeout=10,
+                timeout=self.http.timeouts(10),
             )
             resp.raise_for_status()
             return resp.json().get("logs", [])
@@ -99,7 +109,7 @@ class AkaBotClient:
         try:
             resp = self.session.get(
                 f"{self.base_url}/jobs/{job_id}/output",
-                timeout=10,
+                timeout=self.http.timeouts(10),
             )
             resp.raise_for_status()
             return resp.json().get("outputArguments", {})
@@ -110,7 +120,303 @@ class AkaBotClient:
     def health_check(self) -> bool:
         """API接続確認"""
         try:
-            resp = self.session.get(f"{self.base_url}/health", timeout=5)
+            resp = self.session.get(f"{self.base_url}/health", timeout=self.http.timeouts(5))
+            return resp.status_code == 200
+        except requests.RequestException:
+            return False
+
+
+# ジョブの終了ステータス
+TERMINAL_STATUSES = frozenset({"Completed", "Faulted", "Stopped"})
+
+# 一括ステータス取得が非対応と判断するHTTPステータス
+_BULK_UNSUPPORTED = frozenset({400, 404, 405, 501})
+
+
+@dataclass(slots=True)
+class _Watch:
+    """完了待ち中のジョブ1件分のポーリング状態"""
+
+    future: asyncio.Future[dict[str, Any]]
+    delay: float
+    due: float
+
+
+class AsyncAkaBotClient:
+    """aKaBot Center REST APIの非同期クライアント
+
+    完了待ちはスレッドを占有せず、1つのポーリングタスクが待機中の
+    全ジョブをまとめて問い合わせる。ポーリング間隔はジョブごとに
+    指数バックオフ (ジッター付き) で伸ばす。
+
+    HTTP通信は接続プール付きの requests.Session を有限個のスレッドで
+    実行する (非同期HTTPライブラリには依存しない)。同時に監視できる
+    ジョブ数はスレッド数ではなく max_connections 本の接続で頭打ちになる
+    だけなので、数百件の並行ジョブを1プロセスで監視できる。
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080/api/v1",
+        api_key: str = "",
+        timeout: int = 300,
+        max_connections: int = 16,
+        poll_initial: float = 1.0,
+        poll_max: float = 30.0,
+        poll_factor: float = 2.0,
+        bulk_status: bool = True,
+        bulk_batch_size: int = 50,
+        http: HttpSettings | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        # None: 未確認, True/False: 一括ステータス取得の対応可否
+        self.bulk_supported: bool | None = None if bulk_status else False
+        self.bulk_batch_size = bulk_batch_size
+
+        # 接続プールはHTTPスレッド数と同じ本数を保持する
+        self.http = dataclasses.replace(http or HttpSettings(), pool_maxsize=max_connections)
+        self.session = build_session(self.http)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+        self.session.headers["Content-Type"] = "application/json"
+        self.max_connections = max_connections
+        # HTTPスレッドは最初のリクエストで作る (aclose() 後も再利用できるように)
+        self._executor: ThreadPoolExecutor | None = None
+
+        # 完了待ちの状態 (イベントループごとに poller が作り直す)
+        self._watches: dict[str, _Watch] = {}
+        self._poller: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    async def __aenter__(self) -> AsyncAkaBotClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """ポーリングタスクを止め、HTTPスレッドと接続プールを解放する
+
+        閉じた後に呼び出すと、スレッドと接続は必要に応じて作り直される。
+        """
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+        self._reset_poller()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.session.close()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        timeout: float,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """接続プール上でHTTPリクエストを実行する"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            self.session.request, method, f"{self.base_url}{path}",
+            timeout=self.http.timeouts(timeout), **kwargs,
+        )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_connections, thread_name_prefix="akabot-http",
+            )
+        return await loop.run_in_executor(self._executor, call)
+
+    async def start_job(
+        self,
+        robot_name: str,
+        input_args: dict[str, Any] | None = None,
+    ) -> str:
+        """ロボットジョブを起動してジョブIDを返す"""
+        payload = {
+            "robotName": robot_name,
+            "inputArguments": input_args or {},
+        }
+        try:
+            resp = await self._request("POST", "/jobs", timeout=30, json=payload)
+            resp.raise_for_status()
+            job_id = resp.json().get("jobId", "")
+            logger.info("ジョブ起動成功: %s (job_id=%s)", robot_name, job_id)
+            return job_id
+        except requests.RequestException as e:
+            logger.error("ジョブ起動失敗: %s - %s", robot_name, e)
+            raise
+
+    async def get_job_status(self, job_id: str) -> dict[str, Any]:
+        """ジョブ1件のステータスを取得する"""
+        resp = await self._request("GET", f"/jobs/{job_id}", timeout=10)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def get_job_statuses(self, job_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """複数ジョブのステータスを取得する (job_id → ステータス)
+
+        APIが一括取得 (GET /jobs?ids=...) に対応していれば1リクエストで、
+        非対応なら1件ずつ並行に問い合わせる。取得できなかったジョブは
+        戻り値に含まれない。
+        """
+        if self.bulk_supported is not False:
+            statuses = await self._get_job_statuses_bulk(job_ids)
+            if statuses is not None:
+                return statuses
+
+        results = await asyncio.gather(
+            *(self.get_job_status(job_id) for job_id in job_ids),
+            return_exceptions=True,
+        )
+        statuses: dict[str, dict[str, Any]] = {}
+        for job_id, result in zip(job_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning("ステータス取得失敗: %s - %s", job_id, result)
+            else:
+                statuses[job_id] = result
+        return statuses
+
+    async def _get_job_statuses_bulk(
+        self, job_ids: list[str]
+    ) -> dict[str, dict[str, Any]] | None:
+        """一括ステータス取得 (非対応と判明したら None を返す)"""
+        statuses: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(job_ids), self.bulk_batch_size):
+            chunk = job_ids[start:start + self.bulk_batch_size]
+            resp = await self._request(
+                "GET", "/jobs", timeout=10, params={"ids": ",".join(chunk)},
+            )
+            if resp.status_code in _BULK_UNSUPPORTED and self.bulk_supported is None:
+                logger.info("一括ステータス取得は非対応のため個別取得に切り替えます")
+                self.bulk_supported = False
+                return None
+            resp.raise_for_status()
+            requested = set(chunk)
+            for job in resp.json().get("jobs", []):
+                job_id = str(job.get("jobId", ""))
+                if job_id in requested:
+                    statuses[job_id] = job
+            if self.bulk_supported is None:
+                # ids を無視して 200 を返すサーバもあるため、要求したジョブが
+                # 応答に含まれていることを確かめてから対応と判定する
+                if not requested & statuses.keys():
+                    logger.info("一括ステータス取得の応答に要求したジョブがないため個別取得に切り替えます")
+                    self.bulk_supported = False
+                    return None
+                self.bulk_supported = True
+        return statuses
+
+    def _next_delay(self, delay: float) -> tuple[float, float]:
+        """次のバックオフ間隔と、ジッターを加えた実際の待ち時間を返す"""
+        delay = min(delay * self.poll_factor, self.poll_max)
+        return delay, delay * (0.5 + random.random() / 2)
+
+    async def wait_for_completion(self, job_id: str) -> dict[str, Any]:
+        """ジョブ完了を待機して結果を返す (タイムアウト時は status=Timeout)"""
+        loop = asyncio.get_running_loop()
+        watch = self._watches.get(job_id)
+        if watch is None:
+            delay = self.poll_initial
+            watch = _Watch(
+                future=loop.create_future(),
+                delay=delay,
+                due=loop.time() + delay * (0.5 + random.random() / 2),
+            )
+            self._watches[job_id] = watch
+            self._ensure_poller()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(watch.future), self.timeout)
+        except asyncio.TimeoutError:
+            self._watches.pop(job_id, None)
+            logger.error("ジョブタイムアウト: %s", job_id)
+            return {"status": "Timeout", "jobId": job_id}
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._wakeup = asyncio.Event()
+            self._poller = asyncio.create_task(self._poll_loop())
+        else:
+            self._wakeup.set()
+
+    def _reset_poller(self) -> None:
+        for watch in self._watches.values():
+            watch.future.cancel()
+        self._watches.clear()
+        self._poller = None
+        self._wakeup = None
+
+    async def _poll_loop(self) -> None:
+        """待機中の全ジョブのうち、次回ポーリング時刻に達したものをまとめて問い合わせる"""
+        loop = asyncio.get_running_loop()
+        while self._watches:
+            now = loop.time()
+            due = [job_id for job_id, w in self._watches.items() if w.due <= now]
+            if not due:
+                wait = min(w.due for w in self._watches.values()) - now
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # 想定外の応答でもポーリングタスクは止めない (止まると全ジョブが
+            # タイムアウトまで待たされる)。取得できなかった分は次回再確認する
+            try:
+                statuses = await self.get_job_statuses(due)
+            except Exception as e:
+                logger.warning("ステータス取得失敗: %s", e)
+                statuses = {}
+
+            now = loop.time()
+            for job_id in due:
+                watch = self._watches.get(job_id)
+                if watch is None:
+                    continue
+                data = statuses.get(job_id)
+                status = data.get("status", "") if isinstance(data, dict) else ""
+                if status in TERMINAL_STATUSES:
+                    logger.info("ジョブ完了: %s (status=%s)", job_id, status)
+                    del self._watches[job_id]
+                    if not watch.future.done():
+                        watch.future.set_result(data)
+                else:
+                    watch.delay, wait = self._next_delay(watch.delay)
+                    watch.due = now + wait
+
+    async def get_job_logs(self, job_id: str) -> list[dict[str, Any]]:
+        """ジョブのログを取得する"""
+        try:
+            resp = await self._request("GET", f"/jobs/{job_id}/logs", timeout=10)
+            resp.raise_for_status()
+            return resp.json().get("logs", [])
+        except requests.RequestException as e:
+            logger.error("ログ取得失敗: %s - %s", job_id, e)
+            return []
+
+    async def get_job_output(self, job_id: str) -> dict[str, Any]:
+        """ジョブの出力引数を取得する"""
+        try:
+            resp = await self._request("GET", f"/jobs/{job_id}/output", timeout=10)
+            resp.raise_for_status()
+            return resp.json().get("outputArguments", {})
+        except requests.RequestException as e:
+            logger.error("出力取得失敗: %s - %s", job_id, e)
+            return {}
+
+    async def health_check(self) -> bool:
+        """API接続確認"""
+        try:
+            resp = await self._request("GET", "/health", timeout=5)
             return resp.status_code == 200
         except requests.RequestException:
             return False
@@ -2,108 +2,193 @@
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Coroutine
 from datetime import datetime
-from typing import Any
+from typing import Any, TypeVar
 
 from migration_framework.common.models import TestCase, TestExecution, TestResult
 
-from .akabot_client import AkaBotClient
+from .akabot_client import AkaBotClient, AsyncAkaBotClient
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class TestRunner:
-    """テストケースを実行するランナー"""
+    """テストケースを実行するランナー
+
+    client が AsyncAkaBotClient の場合、run_batch は asyncio 上で
+    最大 max_concurrent_jobs 件のジョブを同時に監視する
+    (parallel_workers はスレッド版クライアントでのみ使う)。
+    同期メソッド (run_single / run_batch) は呼び出しごとにイベントループを作り
+    (イベントループ内から呼ばれた場合は別スレッドで)、終了時にクライアントの
+    ポーリングタスク・HTTPスレッドを解放する。
+    """
 
     def __init__(
         self,
-        client: AkaBotClient,
+        client: AkaBotClient | AsyncAkaBotClient,
         parallel_workers: int = 6,
         retry_count: int = 3,
+        max_concurrent_jobs: int = 200,
     ):
         self.client = client
         self.parallel_workers = parallel_workers
         self.retry_count = retry_count
+        self.max_concurrent_jobs = max_concurrent_jobs
 
     def run_single(self, test_case: TestCase) -> TestExecution:
         """1つのテストケースを実行する"""
+        if isinstance(self.client, AsyncAkaBotClient):
+            return self._run_async(self.run_single_async(test_case))
+
+        client = self.client
         logger.info("テスト実行: %s", test_case.name)
         start_time = time.time()
 
         for attempt in range(1, self.retry_count + 1):
             try:
-                # ジョブ起動
-                job_id = self.client.start_job(
-                    test_case.robot_name,
-                    test_case.input_data,
-                )
+                job_id = client.start_job(test_case.robot_name, test_case.input_data)
+                job_result = client.wait_for_completion(job_id)
+                if job_result.get("status", "") == "Completed":
+                    actual_output = client.get_job_output(job_id)
+                    return self._execution(
+                        test_case, TestResult.PASSED, start_time,
+                        actual_output=actual_output,
+                    )
+                execution = self._judge(test_case, attempt, start_time, job_result=job_result)
+            except Exception as e:
+                execution = self._judge(test_case, attempt, start_time, error=e)
+            if execution is not None:
+                return execution
+            time.sleep(2 ** attempt)
 
-                # 完了待ち
-                job_result = self.client.wait_for_completion(job_id)
-                status = job_result.get("status", "")
+        return self._execution(
+            test_case, TestResult.ERROR, start_time, error_message="リトライ上限超過",
+        )
 
-                if status == "Completed":
-                    actual_output = self.client.get_job_output(job_id)
-                    duration = time.time() - start_time
+    async def run_single_async(self, test_case: TestCase) -> TestExecution:
+        """1つのテストケースを実行する (AsyncAkaBotClient 用)"""
+        client = self.client
+        assert isinstance(client, AsyncAkaBotClient)
+        logger.info("テスト実行: %s", test_case.name)
+        start_time = time.time()
 
-                    return TestExecution(
-                        test_case=test_case,
-                        result=TestResult.PASSED,
+        for attempt in range(1, self.retry_count + 1):
+            try:
+                job_id = await client.start_job(test_case.robot_name, test_case.input_data)
+                job_result = await client.wait_for_completion(job_id)
+                if job_result.get("status", "") == "Completed":
+                    actual_output = await client.get_job_output(job_id)
+                    return self._execution(
+                        test_case, TestResult.PASSED, start_time,
                         actual_output=actual_output,
-                        duration_seconds=duration,
                     )
-                elif status == "Faulted":
-                    error_msg = job_result.get("error", "不明なエラー")
-                    if attempt < self.retry_count:
-                        logger.warning(
-                            "テスト失敗(リトライ %d/%d): %s - %s",
-                            attempt, self.retry_count, test_case.name, error_msg,
-                        )
-                        time.sleep(2 ** attempt)
-                        continue
-
-                    return TestExecution(
-                        test_case=test_case,
-                        result=TestResult.FAILED,
-                        error_message=error_msg,
-                        duration_seconds=time.time() - start_time,
-                    )
-                else:
-                    return TestExecution(
-                        test_case=test_case,
-                        result=TestResult.ERROR,
-                        error_message=f"予期しないステータス: {status}",
-                        duration_seconds=time.time() - start_time,
-                    )
-
+                execution = self._judge(test_case, attempt, start_time, job_result=job_result)
             except Exception as e:
-                if attempt < self.retry_count:
-                    logger.warning(
-                        "テスト例外(リトライ %d/%d): %s - %s",
-                        attempt, self.retry_count, test_case.name, e,
-                    )
-                    time.sleep(2 ** attempt)
-                    continue
-
-                return TestExecution(
-                    test_case=test_case,
-                    result=TestResult.ERROR,
-                    error_message=str(e),
-                    duration_seconds=time.time() - start_time,
+                execution = self._judge(test_case, attempt, start_time, error=e)
+            if execution is not None:
+                return execution
+            await asyncio.sleep(2 ** attempt)
+
+        return self._execution(
+            test_case, TestResult.ERROR, start_time, error_message="リトライ上限超過",
+        )
+
+    def _judge(
+        self,
+        test_case: TestCase,
+        attempt: int,
+        start_time: float,
+        job_result: dict[str, Any] | None = None,
+        error: Exception | None = None,
+    ) -> TestExecution | None:
+        """Completed 以外で終わった試行を判定する (リトライする場合は None)
+
+        job_result は終了したジョブの情報、error は試行中に発生した例外。
+        Faulted と例外は retry_count 回まで再試行し、それ以外のステータスは即 ERROR。
+        """
+        if error is not None:
+            if attempt < self.retry_count:
+                logger.warning(
+                    "テスト例外(リトライ %d/%d): %s - %s",
+                    attempt, self.retry_count, test_case.name, error,
                 )
+                return None
+            return self._execution(
+                test_case, TestResult.ERROR, start_time, error_message=str(error),
+            )
+
+        assert job_result is not None
+        status = job_result.get("status", "")
+        if status == "Faulted":
+            error_msg = job_result.get("error", "不明なエラー")
+            if attempt < self.retry_count:
+                logger.warning(
+                    "テスト失敗(リトライ %d/%d): %s - %s",
+                    attempt, self.retry_count, test_case.name, error_msg,
+                )
+                return None
+            return self._execution(
+                test_case, TestResult.FAILED, start_time, error_message=error_msg,
+            )
+        return self._execution(
+            test_case, TestResult.ERROR, start_time,
+            error_message=f"予期しないステータス: {status}",
+        )
 
+    @staticmethod
+    def _execution(
+        test_case: TestCase, result: TestResult, start_time: float, **fields: Any,
+    ) -> TestExecution:
+        """開始時刻からの経過秒数を付けて TestExecution を作る"""
         return TestExecution(
             test_case=test_case,
-            result=TestResult.ERROR,
-            error_message="リトライ上限超過",
+            result=result,
             duration_seconds=time.time() - start_time,
+            **fields,
         )
 
+    async def run_batch_async(self, test_cases: list[TestCase]) -> list[TestExecution]:
+        """複数テストケースを asyncio 上で同時実行する (結果は入力順)"""
+        logger.info(
+            "バッチテスト実行: %d ケース (同時ジョブ上限=%d)",
+            len(test_cases), self.max_concurrent_jobs,
+        )
+        limit = asyncio.Semaphore(self.max_concurrent_jobs)
+
+        async def run_one(tc: TestCase) -> TestExecution:
+            async with limit:
+                try:
+                    execution = await self.run_single_async(tc)
+                except Exception as e:
+                    execution = TestExecution(
+                        test_case=tc,
+                        result=TestResult.ERROR,
+                        error_message=str(e),
+                    )
+            logger.info("テスト完了: %s → %s", tc.name, execution.result.value)
+            return execution
+
+        results = list(await asyncio.gather(*(run_one(tc) for tc in test_cases)))
+
+        passed = sum(1 for r in results if r.result == TestResult.PASSED)
+        logger.info(
+            "バッチテスト完了: %d/%d passed",
+            passed, len(results),
+        )
+        return results
+
     def run_batch(self, test_cases: list[TestCase]) -> list[TestExecution]:
         """複数テストケースを並列実行する"""
+        if isinstance(self.client, AsyncAkaBotClient):
+            return self._run_async(self.run_batch_async(test_cases))
+
         logger.info(
             "バッチテスト実行: %d ケース (並列=%d)",
             len(test_cases), self.parallel_workers,
@@ -137,3 +222,27 @@ class TestRunner:
             passed, len(results),
         )
         return results
+
+    def _run_async(self, coro: Coroutine[Any, Any, T]) -> T:
+        """coro を新しいイベントループで実行し、終了後に非同期クライアントを閉じる
+
+        呼び出し元のスレッドでイベントループが動いている場合 (Streamlit・
+        ノートブックなど) は asyncio.run を使えないため、別スレッドの
+        イベントループで実行して完了まで待つ。その間、呼び出し元のループは
+        止まるので、非同期コードからは run_single_async / run_batch_async を使う。
+        """
+        client = self.client
+        assert isinstance(client, AsyncAkaBotClient)
+
+        async def run() -> T:
+            try:
+                return await coro
+            finally:
+                await client.aclose()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
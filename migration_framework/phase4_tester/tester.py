@@ -9,6 +9,7 @@ from typing import Any
 import yaml
 
 from migration_framework.common.config import Config
+from migration_framework.common.http import HttpSettings
 from migration_framework.common.models import (
     TestCase,
     TestExecution,
@@ -16,7 +17,7 @@ from migration_framework.common.models import (
     TestType,
 )
 
-from .akabot_client import AkaBotClient
+from .akabot_client import AkaBotClient, AsyncAkaBotClient
 from .comparator import Comparator
 from .reporter import Reporter
 from .test_runner import TestRunner
@@ -29,7 +30,7 @@ class Tester:
 
     コンポーネント:
     1. TestRunner: pytest + 並列実行 + リトライ
-    2. AkaBotClient: REST API経由のジョブ起動・監視
+    2. AkaBotClient / AsyncAkaBotClient: REST API経由のジョブ起動・監視
     3. Comparator: CSV/Excel/JSON 結果比較
     4. Reporter: HTML/JSONダッシュボード生成
     """
@@ -37,15 +38,35 @@ class Tester:
     def __init__(self, config: Config):
         self.config = config
         api_config = config.get("tester.akabot_api", {})
-
-        self.client = AkaBotClient(
-            base_url=api_config.get("base_url", "http://localhost:8080/api/v1"),
-            timeout=api_config.get("timeout", 300),
-        )
+        http = HttpSettings.from_dict(config.get("http", {}))
+        parallel_workers = config.get("tester.parallel_workers", 6)
+
+        self.client: AkaBotClient | AsyncAkaBotClient
+        if config.get("tester.async_jobs", True):
+            polling = api_config.get("polling", {})
+            self.client = AsyncAkaBotClient(
+                base_url=api_config.get("base_url", "http://localhost:8080/api/v1"),
+                timeout=api_config.get("timeout", 300),
+                max_connections=api_config.get("max_connections", 16),
+                poll_initial=polling.get("initial", 1.0),
+                poll_max=polling.get("max", 30.0),
+                poll_factor=polling.get("factor", 2.0),
+                bulk_status=api_config.get("bulk_status", True),
+                http=http,
+            )
+        else:
+            # ワーカースレッド数より接続プールが小さいと接続の破棄・再接続が起きる
+            http.pool_maxsize = max(http.pool_maxsize, parallel_workers)
+            self.client = AkaBotClient(
+                base_url=api_config.get("base_url", "http://localhost:8080/api/v1"),
+                timeout=api_config.get("timeout", 300),
+                http=http,
+            )
         self.runner = TestRunner(
             client=self.client,
-            parallel_workers=config.get("tester.parallel_workers", 6),
+            parallel_workers=parallel_workers,
             retry_count=config.get("tester.retry_count", 3),
+            max_concurrent_jobs=config.get("tester.max_concurrent_jobs", 200),
         )
         self.comparator = Comparator()
         self.reporter = Reporter()
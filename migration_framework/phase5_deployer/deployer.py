@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
 from migration_framework.common.config import Config
+from migration_framework.common.http import HttpSettings
 from migration_framework.common.models import (
     DeploymentRecord,
     DeploymentStatus,
@@ -17,6 +19,7 @@ from .environment_manager import EnvironmentManager
 from .health_checker import HealthChecker
 from .orchestrator_client import OrchestratorClient
 from .package_builder import PackageBuilder
+from .rollout import RolloutEngine, RolloutSettings
 
 logger = logging.getLogger(__name__)
 
@@ -29,27 +32,55 @@ class Deployer:
     2. OrchestratorClient: パッケージアップロード → プロセス作成 → マシン割当
     3. EnvironmentManager: 端末別の環境設定 (認証・パス・接続先)
     4. HealthChecker: デプロイ後のヘルスチェック・起動確認
+    5. RolloutEngine: 複数プロジェクト・複数端末への並行ロールアウト
     """
 
     def __init__(self, config: Config):
         self.config = config
         orch_config = config.get("deployer.orchestrator", {})
+        rollout_settings = RolloutSettings.from_dict(config.get("deployer.rollout", {}))
 
-        self.package_builder = PackageBuilder()
+        # 並行デプロイ時に接続プールが不足しないようにする
+        http = HttpSettings.from_dict(config.get("http", {}))
+        http.pool_maxsize = max(
+            http.pool_maxsize,
+            rollout_settings.orchestrator_concurrency + rollout_settings.parallel_projects,
+        )
+
+        package_config = config.get("deployer.package", {})
+        self.package_builder = PackageBuilder(
+            compression_level=package_config.get("compression_level", 6),
+            use_cache=package_config.get("use_cache", True),
+        )
         self.orchestrator = OrchestratorClient(
             base_url=orch_config.get("base_url", "http://localhost:8080"),
             tenant=orch_config.get("tenant", "default"),
+            http=http,
+            lookup_cache_ttl=orch_config.get("lookup_cache_ttl", 300),
+            skip_existing_packages=config.get("deployer.upload.skip_existing", True),
+            job_watch=config.get("deployer.job_watch", {}),
+            upload_chunk_size=config.get("deployer.upload.chunk_size", 0),
         )
         self.env_manager = EnvironmentManager(config)
-        self.health_checker = HealthChecker(self.orchestrator)
+        self.health_checker = HealthChecker(
+            self.orchestrator,
+            max_concurrent_smoke_tests=config.get("deployer.max_concurrent_smoke_tests", 8),
+        )
+        self.rollout = RolloutEngine(self, rollout_settings)
 
     def deploy_single(
         self,
         project_dir: Path,
         target_machines: list[MachineInfo],
         env_overrides: dict[str, Any] | None = None,
+        machine_executor: Executor | None = None,
     ) -> DeploymentRecord:
-        """1つのプロジェクトを指定端末群にデプロイする"""
+        """1つのプロジェクトを指定端末群にデプロイする
+
+        machine_executor を渡すと端末ごとの割当・環境設定をその Executor 上で
+        並行に行う (省略時は端末順に逐次実行)。スモークテストは
+        HealthChecker.check_batch が同時数を制限して並行に実行する。
+        """
         project_name = project_dir.name
         logger.info("=== Phase 5 デプロイ開始: %s → %d 台 ===",
                      project_name, len(target_machines))
@@ -73,7 +104,7 @@ class Deployer:
             record.package_id = package_id
             logger.info("アップロード完了: package_id=%s", package_id)
 
-            # 3. プロセス作成 + マシン割当
+            # 3. プロセス作成
             record.status = DeploymentStatus.CONFIGURING
             process_id = self.orchestrator.create_process(
                 package_id=package_id,
@@ -82,28 +113,21 @@ class Deployer:
             )
             record.process_id = process_id
 
-            for machine in target_machines:
-                self.orchestrator.assign_machine(process_id, machine.machine_id)
-                logger.info("マシン割当完了: %s → %s", project_name, machine.name)
-
-            # 4. 環境設定の適用
-            if env_overrides:
-                for machine in target_machines:
-                    self.env_manager.apply_config(
-                        machine=machine,
-                        process_name=project_name,
-                        overrides=env_overrides,
-                    )
-
-            # 5. ヘルスチェック
+            # 4. マシン割当 → 環境設定 (端末ごと)
+            run = machine_executor.map if machine_executor is not None else map
+            for _ in run(
+                lambda machine: self._configure_machine(
+                    project_name, process_id, machine, env_overrides,
+                ),
+                target_machines,
+            ):
+                pass
+
+            # 5. ヘルスチェック (状態は一覧1回で取得し、スモークテストは並行)
             record.status = DeploymentStatus.HEALTH_CHECK
-            health_results = {}
-            for machine in target_machines:
-                ok = self.health_checker.check(
-                    process_name=project_name,
-                    machine=machine,
-                )
-                health_results[machine.name] = ok
+            health_results = self.health_checker.check_batch_healthy(
+                project_name, target_machines,
+            )
 
             record.health_results = health_results
             all_healthy = all(health_results.values())
@@ -126,22 +150,43 @@ class Deployer:
 
         return record
 
+    def _configure_machine(
+        self,
+        project_name: str,
+        process_id: str,
+        machine: MachineInfo,
+        env_overrides: dict[str, Any] | None,
+    ) -> None:
+        """1端末分のマシン割当・環境設定を行う"""
+        self.orchestrator.assign_machine(process_id, machine.machine_id)
+        logger.info("マシン割当完了: %s → %s", project_name, machine.name)
+
+        if env_overrides:
+            self.env_manager.apply_config(
+                machine=machine,
+                process_name=project_name,
+                overrides=env_overrides,
+            )
+
     def deploy_batch(
         self,
         output_dir: Path,
         target_machines: list[MachineInfo],
         env_overrides: dict[str, Any] | None = None,
     ) -> list[DeploymentRecord]:
-        """出力ディレクトリ内の全プロジェクトを一括デプロイ"""
-        projects = [d for d in output_dir.iterdir() if d.is_dir()]
-        records = []
+        """出力ディレクトリ内の全プロジェクトを一括デプロイ
 
-        for project_dir in projects:
-            record = self.deploy_single(project_dir, target_machines, env_overrides)
-            records.append(record)
+        RolloutEngine でカナリア → wave の順に並行デプロイする。
+        """
+        projects = sorted(d for d in output_dir.iterdir() if d.is_dir())
+        records = self.rollout.run(projects, target_machines, env_overrides)
 
         deployed = sum(1 for r in records if r.status == DeploymentStatus.DEPLOYED)
         logger.info("一括デプロイ完了: %d/%d 成功", deployed, len(records))
+        logger.info(
+            "Orchestrator参照キャッシュ: %s / アップロード省略: %d 件",
+            self.orchestrator.lookup_cache.stats(), self.orchestrator.uploads_skipped,
+        )
         return records
 
     def rollback(self, project_name: str) -> bool:
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from typing import Any
 
-from migration_framework.common.models import MachineInfo
+from migration_framework.common.models import HealthCheckResult, MachineInfo
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +22,12 @@ class HealthChecker:
     4. 依存サービスの到達確認
     """
 
-    def __init__(self, orchestrator_client):
+    def __init__(self, orchestrator_client, max_concurrent_smoke_tests: int = 8):
         self.orchestrator = orchestrator_client
+        self.max_concurrent_smoke_tests = max_concurrent_smoke_tests
+        # 全 check_batch 呼び出しで共有する (並行ロールアウトでプロジェクトが
+        # 同時に走っても、1つの Orchestrator 上の同時スモークテスト数を抑える)
+        self._smoke_slots = threading.BoundedSemaphore(max(1, max_concurrent_smoke_tests))
 
     def check(
         self,
@@ -34,12 +39,13 @@ class HealthChecker:
         """端末のヘルスチェックを実行する"""
         logger.info("ヘルスチェック開始: %s @ %s", process_name, machine.name)
         results = {}
+        status = self._get_machine_status(machine)
 
         # 1. マシン接続確認
-        results["machine_connected"] = self._check_machine_connection(machine)
+        results["machine_connected"] = self._check_machine_connection(status)
 
         # 2. エージェント稼働確認
-        results["agent_running"] = self._check_agent_status(machine)
+        results["agent_running"] = self._check_agent_status(status)
 
         # 3. スモークテスト
         if run_smoke_test and results["agent_running"]:
@@ -59,48 +65,166 @@ class HealthChecker:
         )
         return all_ok
 
-    def _check_machine_connection(self, machine: MachineInfo) -> bool:
-        """Orchestratorからマシンが見えるか確認"""
+    def _get_machine_status(self, machine: MachineInfo) -> dict[str, Any] | None:
+        """マシンの稼働状態を取得する (取得できなければ None)"""
         try:
-            status = self.orchestrator.get_machine_status(machine.machine_id)
-            is_connected = status.get("Status", "") in ("Available", "Busy")
-            return is_connected
+            return self.orchestrator.get_machine_status(machine.machine_id)
         except Exception as e:
-            logger.warning("マシン接続確認失敗: %s - %s", machine.name, e)
-            return False
+            logger.warning("マシン状態取得失敗: %s - %s", machine.name, e)
+            return None
+
+    @staticmethod
+    def _check_machine_connection(status: dict[str, Any] | None) -> bool:
+        """Orchestratorからマシンが見えるか確認"""
+        return status is not None and status.get("Status", "") in ("Available", "Busy")
 
-    def _check_agent_status(self, machine: MachineInfo) -> bool:
+    @staticmethod
+    def _check_agent_status(status: dict[str, Any] | None) -> bool:
         """ロボットエージェントが稼働しているか確認"""
-        try:
-            status = self.orchestrator.get_machine_status(machine.machine_id)
-            return status.get("Status") != "Disconnected"
-        except Exception as e:
-            logger.warning("エージェント確認失敗: %s - %s", machine.name, e)
-            return False
+        return status is not None and status.get("Status") != "Disconnected"
 
     def _run_smoke_test(
         self, process_name: str, machine: MachineInfo, timeout: int
     ) -> bool:
         """スモークテスト - プロセスの起動・正常終了を確認"""
+        job_id = self._start_smoke_test(process_name, machine)
+        if job_id is None:
+            return False
+        result = self.orchestrator.wait_for_job(job_id, timeout=timeout)
+        return result.get("State") == "Successful"
+
+    def _start_smoke_test(self, process_name: str, machine: MachineInfo) -> str | None:
+        """スモークテスト用のジョブを起動する (失敗時は None)"""
         try:
-            job_id = self.orchestrator.start_job(
+            return self.orchestrator.start_job(
                 process_name=process_name,
                 machine_id=machine.machine_id,
                 input_args={"_test_mode": True},
             )
-            result = self.orchestrator.wait_for_job(job_id, timeout=timeout)
-            return result.get("State") == "Successful"
         except Exception as e:
             logger.warning("スモークテスト失敗: %s @ %s - %s", process_name, machine.name, e)
-            return False
+            return None
 
     def check_batch(
         self,
         process_name: str,
         machines: list[MachineInfo],
-    ) -> dict[str, bool]:
-        """複数端末のヘルスチェックをまとめて実行"""
-        results = {}
+        run_smoke_test: bool = True,
+        timeout: int = 120,
+    ) -> dict[str, HealthCheckResult]:
+        """複数端末のヘルスチェックをまとめて実行
+
+        接続・エージェント状態は /odata/Machines の一覧1回で全端末分を判定し
+        (一覧に無い端末のみ個別に問い合わせる)、スモークテストは並行に実行する。
+        同時に走るスモークテストは、この HealthChecker を使う全 check_batch
+        呼び出しを合わせて max_concurrent_smoke_tests 件までに抑える。
+        スモークテストの完了待ちは Orchestrator の job_watcher がまとめて
+        行うため、端末ごとにスレッドを占有しない。
+
+        Returns:
+            端末名 → HealthCheckResult。以前の戻り値 (端末名 → bool) は
+            各結果の .healthy に当たる。bool のままで扱う場合は
+            check_batch_healthy を使う。
+        """
+        logger.info("一括ヘルスチェック開始: %s @ %d 台", process_name, len(machines))
+        start = time.perf_counter()
+        snapshot = self._machine_snapshot()
+        snapshot_seconds = time.perf_counter() - start
+
+        results: dict[str, HealthCheckResult] = {}
         for machine in machines:
-            results[machine.name] = self.check(process_name, machine)
+            t0 = time.perf_counter()
+            if snapshot is not None and machine.machine_id in snapshot:
+                status = snapshot[machine.machine_id]
+                status_seconds = snapshot_seconds
+            else:
+                status = self._get_machine_status(machine)
+                status_seconds = time.perf_counter() - t0
+            results[machine.name] = HealthCheckResult(
+                machine_name=machine.name,
+                machine_connected=self._check_machine_connection(status),
+                agent_running=self._check_agent_status(status),
+                timings={"status": status_seconds},
+            )
+
+        # スモークテストはエージェントが稼働している端末のみ
+        targets = [m for m in machines if run_smoke_test and results[m.name].agent_running]
+
+        slots = self._smoke_slots
+        # 監視側は timeout で Timeout を返すので、待機は確認間隔の上限を足して打ち切る
+        wait_seconds = timeout + self.orchestrator.job_watcher.poll_max
+        # Future は完了コールバックの実行前に待機側を起こすため、
+        # 結果の記録完了はコールバック末尾で立てる Event で待つ。
+        # 打ち切り後に届いた結果は記録しない (lock で判定と記録をそろえる)
+        lock = threading.Lock()
+        recorded: list[tuple[threading.Event, float, HealthCheckResult, float]] = []
+        for machine in targets:
+            result = results[machine.name]
+            t0 = time.perf_counter()
+            if not slots.acquire(timeout=wait_seconds):
+                logger.warning("スモークテストの空き待ちタイムアウト: %s", machine.name)
+                result.smoke_test = False
+                result.timings["smoke_test"] = time.perf_counter() - t0
+                continue
+            job_id = self._start_smoke_test(process_name, machine)
+            if job_id is None:
+                slots.release()
+                result.smoke_test = False
+                result.timings["smoke_test"] = time.perf_counter() - t0
+                continue
+
+            done = threading.Event()
+
+            def finished(
+                job: dict[str, Any], result=result, t0=t0, done=done,
+            ) -> None:
+                try:
+                    with lock:
+                        if not done.is_set():
+                            result.smoke_test = job.get("State") == "Successful"
+                            result.timings["smoke_test"] = time.perf_counter() - t0
+                finally:
+                    slots.release()
+                    done.set()
+
+            recorded.append((done, time.monotonic() + wait_seconds, result, t0))
+            self.orchestrator.job_watcher.watch(job_id, timeout, finished)
+        for done, deadline, result, t0 in recorded:
+            if done.wait(max(0.0, deadline - time.monotonic())):
+                continue
+            with lock:
+                if not done.is_set():
+                    done.set()
+                    logger.warning("スモークテスト結果待ちタイムアウト: %s", result.machine_name)
+                    result.smoke_test = False
+                    result.timings["smoke_test"] = time.perf_counter() - t0
+
+        for result in results.values():
+            result.timings["total"] = sum(result.timings.values())
+
+        healthy = sum(1 for r in results.values() if r.healthy)
+        logger.info(
+            "一括ヘルスチェック完了: %s → %d/%d 正常 (%.1f 秒)",
+            process_name, healthy, len(results), time.perf_counter() - start,
+        )
         return results
+
+    def check_batch_healthy(
+        self,
+        process_name: str,
+        machines: list[MachineInfo],
+        run_smoke_test: bool = True,
+        timeout: int = 120,
+    ) -> dict[str, bool]:
+        """check_batch の結果を 端末名 → 正常可否 (bool) で返す"""
+        results = self.check_batch(process_name, machines, run_smoke_test, timeout)
+        return {name: result.healthy for name, result in results.items()}
+
+    def _machine_snapshot(self) -> dict[int, dict[str, Any]] | None:
+        """全マシンの稼働状態を1回の一覧取得で得る (machine_id → 状態)"""
+        try:
+            machines = self.orchestrator.get_machines(refresh=True)
+        except Exception as e:
+            logger.warning("マシン一覧取得失敗 (個別確認に切替): %s", e)
+            return None
+        return {m["Id"]: m for m in machines if "Id" in m}
@@ -0,0 +1,182 @@
+"""ジョブウォッチャー - 多数のジョブの完了を1本のスレッドでまとめて監視する"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Future, InvalidStateError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .orchestrator_client import OrchestratorClient
+
+logger = logging.getLogger(__name__)
+
+# ジョブの終了状態
+TERMINAL_JOB_STATES = frozenset({"Successful", "Faulted", "Stopped"})
+
+# 次回確認までの残りがこの割合以下のジョブは、先に来たジョブの確認に相乗りさせる
+_COALESCE_RATIO = 0.25
+
+
+@dataclass
+class _Watch:
+    """監視中のジョブ1件分の状態"""
+    future: Future[dict[str, Any]]
+    deadline: float
+    delay: float
+    due: float
+
+
+class JobWatcher:
+    """Orchestrator ジョブの完了を監視し、Future / コールバックで通知する
+
+    監視スレッドは1本だけで、次回確認時刻に達したジョブを
+    OrchestratorClient.get_jobs() でまとめて問い合わせる
+    ($filter=Id in (...) を batch_size 件ずつ)。確認間隔はジョブごとに
+    poll_initial から poll_factor 倍ずつ poll_max まで伸ばす (ジッター付き)。
+    監視対象がなくなるとスレッドは終了し、次の watch() で再開する。
+    """
+
+    def __init__(
+        self,
+        orchestrator: OrchestratorClient,
+        poll_initial: float = 1.0,
+        poll_max: float = 15.0,
+        poll_factor: float = 1.5,
+        batch_size: int = 50,
+    ):
+        self.orchestrator = orchestrator
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.batch_size = batch_size
+        self._watches: dict[str, _Watch] = {}
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        # 状態問い合わせの回数 (API呼び出し数)
+        self.queries = 0
+
+    def watch(
+        self,
+        job_id: str,
+        timeout: float = 300,
+        callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> Future[dict[str, Any]]:
+        """ジョブを監視対象に加え、完了時のジョブ情報を返す Future を返す
+
+        timeout 秒以内に終了しなければ {"State": "Timeout", "Id": job_id} で完了する。
+        callback はジョブ情報を引数に監視スレッド上で呼ばれる
+        (Future がキャンセルされた場合は呼ばれない)。
+        """
+        now = time.monotonic()
+        with self._cond:
+            watch = self._watches.get(job_id)
+            if watch is None or watch.future.cancelled():
+                watch = _Watch(
+                    future=Future(),
+                    deadline=now + timeout,
+                    delay=self.poll_initial,
+                    due=now + self._jitter(self.poll_initial),
+                )
+                self._watches[job_id] = watch
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="job-watcher", daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify()
+
+        if callback is not None:
+            watch.future.add_done_callback(
+                lambda f: None if f.cancelled() else callback(f.result())
+            )
+        return watch.future
+
+    def wait(self, job_id: str, timeout: float = 300) -> dict[str, Any]:
+        """ジョブの完了を待ってジョブ情報を返す
+
+        監視スレッドは timeout で Timeout を返すため、待機は timeout に確認間隔の
+        上限を足した時間で打ち切る (打ち切った場合も Timeout を返す)。
+        """
+        try:
+            return self.watch(job_id, timeout).result(timeout=timeout + self.poll_max)
+        except (FutureTimeoutError, CancelledError):
+            logger.warning("ジョブ待機打ち切り: %s", job_id)
+            return {"State": "Timeout", "Id": job_id}
+
+    @property
+    def pending(self) -> int:
+        """監視中のジョブ数"""
+        with self._cond:
+            return len(self._watches)
+
+    def _jitter(self, delay: float) -> float:
+        return delay * (0.5 + random.random() / 2)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._watches:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                next_due = min(w.due for w in self._watches.values())
+                if next_due > now:
+                    self._cond.wait(next_due - now)
+                    continue
+                # 間隔の 3/4 以上経過したジョブも同じクエリにまとめる
+                due = [
+                    job_id for job_id, w in self._watches.items()
+                    if w.due - now <= w.delay * _COALESCE_RATIO
+                ]
+
+            jobs = self._fetch(due)
+
+            now = time.monotonic()
+            finished: list[tuple[_Watch, dict[str, Any]]] = []
+            with self._cond:
+                for job_id in due:
+                    watch = self._watches.get(job_id)
+                    if watch is None:
+                        continue
+                    if watch.future.cancelled():
+                        del self._watches[job_id]
+                        continue
+                    job = jobs.get(job_id)
+                    if job is not None and job.get("State") in TERMINAL_JOB_STATES:
+                        finished.append((watch, job))
+                    elif now >= watch.deadline:
+                        logger.warning("ジョブ待機タイムアウト: %s", job_id)
+                        finished.append((watch, {"State": "Timeout", "Id": job_id}))
+                    else:
+                        watch.delay = min(watch.delay * self.poll_factor, self.poll_max)
+                        watch.due = min(now + self._jitter(watch.delay), watch.deadline)
+                        continue
+                    del self._watches[job_id]
+
+            # コールバックはロックの外で呼ぶ。呼び出し側がキャンセルした Future は
+            # 飛ばし、1件の失敗で監視スレッドが止まらないようにする
+            for watch, job in finished:
+                try:
+                    if watch.future.set_running_or_notify_cancel():
+                        watch.future.set_result(job)
+                except (InvalidStateError, RuntimeError) as e:
+                    logger.warning("ジョブ結果の通知失敗: %s - %s", job.get("Id"), e)
+
+    def _fetch(self, job_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """ジョブ状態を batch_size 件ずつまとめて取得する (失敗分は空)"""
+        jobs: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(job_ids), self.batch_size):
+            chunk = job_ids[start:start + self.batch_size]
+            self.queries += 1
+            try:
+                jobs.update(self.orchestrator.get_jobs(chunk))
+            except Exception as e:
+                logger.warning("ジョブ状態取得失敗 (%d 件): %s", len(chunk), e)
+        return jobs
@@ -2,15 +2,187 @@
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import re
+import threading
 import time
+import uuid
+import zipfile
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import requests
 
+from migration_framework.common.http import HttpSettings, build_session
+
+from .job_watcher import JobWatcher
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# アップロード進捗の通知 (送信済みバイト数, 全体バイト数)
+ProgressCallback = Callable[[int, int], None]
+
+_UPLOAD_BLOCK_SIZE = 1024 * 1024
+_NUSPEC_ID = re.compile(r"<id>\s*([^<]+?)\s*</id>")
+_NUSPEC_VERSION = re.compile(r"<version>\s*([^<]+?)\s*</version>")
+# アップロード済みパッケージのハッシュを .nupkg の隣に記録するファイルの接尾辞
+_UPLOAD_RECORD_SUFFIX = ".uploaded.json"
+
+
+@dataclass
+class PackageInfo:
+    """アップロード対象パッケージの識別情報"""
+    package_id: str
+    version: str
+    sha256: str
+    size: int
+
+    @classmethod
+    def from_file(cls, package_path: Path) -> PackageInfo:
+        """.nupkg 内の nuspec から id/version を読み、ファイルのハッシュを計算する"""
+        package_id, version = package_path.stem, ""
+        try:
+            with zipfile.ZipFile(package_path) as zf:
+                nuspec = next((n for n in zf.namelist() if n.endswith(".nuspec")), None)
+                if nuspec is not None:
+                    text = zf.read(nuspec).decode("utf-8", "replace")
+                    if m := _NUSPEC_ID.search(text):
+                        package_id = m.group(1)
+                    if m := _NUSPEC_VERSION.search(text):
+                        version = m.group(1)
+        except zipfile.BadZipFile:
+            logger.warning("nuspec を読めません: %s", package_path)
+
+        h = hashlib.sha256()
+        size = 0
+        with open(package_path, "rb") as f:
+            while block := f.read(_UPLOAD_BLOCK_SIZE):
+                h.update(block)
+                size += len(block)
+        return cls(package_id=package_id, version=version, sha256=h.hexdigest(), size=size)
+
+
+class _MultipartFileBody:
+    """multipart/form-data の本文 (先頭部 + ファイル + 終端部) を read() で順に返す
+
+    長さが分かっているため requests は Content-Length を付けてそのまま送る
+    (ジェネレータを渡すと Transfer-Encoding: chunked になり、Content-Length と
+    同時に送ってしまう)。
+    """
+
+    def __init__(
+        self,
+        head: bytes,
+        package_path: Path,
+        tail: bytes,
+        size: int,
+        progress: ProgressCallback | None = None,
+    ):
+        self._head = head
+        self._tail = tail
+        self._size = size
+        self._progress = progress
+        self._file = open(package_path, "rb")
+        self._sent = 0
+
+    def __len__(self) -> int:
+        return len(self._head) + self._size + len(self._tail)
+
+    def read(self, size: int = -1) -> bytes:
+        if self._head:
+            block, self._head = self._head, b""
+            return block
+        block = self._file.read(_UPLOAD_BLOCK_SIZE if size < 0 else size)
+        if block:
+            # 送信側は小さい単位で読むため、進捗は _UPLOAD_BLOCK_SIZE ごとと最後にだけ通知する
+            notified = self._sent // _UPLOAD_BLOCK_SIZE
+            self._sent += len(block)
+            if self._progress is not None and (
+                self._sent // _UPLOAD_BLOCK_SIZE > notified or self._sent == self._size
+            ):
+                self._progress(self._sent, self._size)
+            return block
+        block, self._tail = self._tail, b""
+        return block
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> _MultipartFileBody:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class LookupCache:
+    """名前 → キー/ID の解決結果を保持するTTLキャッシュ
+
+    リリースキー・環境ID・マシン一覧など、デプロイ中はほぼ変わらないのに
+    毎回問い合わせていた参照系の結果を保持する。作成・削除を行った
+    クライアント自身が invalidate() で該当エントリを破棄する。
+    ttl=0 でキャッシュ無効 (常に問い合わせ)。
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: dict[tuple[str, str], tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # 種別 (releases / environments / machines) ごとのヒット・ミス数
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def get_or_load(
+        self,
+        kind: str,
+        key: str,
+        loader: Callable[[], T],
+        cache_if: Callable[[T], bool] = bool,
+    ) -> T:
+        """キャッシュ済みの値を返し、なければ loader() の結果を保存して返す
+
+        cache_if が偽を返す値 (既定では空の結果) は保存しない。
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and entry[0] > now:
+                self.hits[kind] += 1
+                return entry[1]
+            self.misses[kind] += 1
+
+        value = loader()
+        if self.ttl > 0 and cache_if(value):
+            with self._lock:
+                self._entries[(kind, key)] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self, kind: str, key: str | None = None) -> None:
+        """エントリを破棄する (key 省略時はその種別すべて)"""
+        with self._lock:
+            if key is not None:
+                self._entries.pop((kind, key), None)
+            else:
+                for k in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """種別ごとのヒット・ミス数"""
+        with self._lock:
+            kinds = sorted(set(self.hits) | set(self.misses))
+            return {k: {"hits": self.hits[k], "misses": self.misses[k]} for k in kinds}
+
 
 class OrchestratorClient:
     """aKaBot / UiPath Orchestrator REST APIクライアント
@@ -31,6 +203,11 @@ class OrchestratorClient:
         username: str | None = None,
         password: str | None = None,
         timeout: int = 60,
+        http: HttpSettings | None = None,
+        lookup_cache_ttl: float = 300.0,
+        skip_existing_packages: bool = True,
+        upload_chunk_size: int = 0,
+        job_watch: dict[str, Any] | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.tenant = tenant
@@ -38,8 +215,23 @@ class OrchestratorClient:
         self.username = username
         self.password = password
         self.timeout = timeout
+        self.http = http or HttpSettings()
         self._token: str | None = None
-        self._session = requests.Session()
+        self._session = build_session(self.http)
+        self.lookup_cache = LookupCache(ttl=lookup_cache_ttl)
+        # 同じ id/version・同じ内容のパッケージが登録済みならアップロードしない
+        self.skip_existing_packages = skip_existing_packages
+        # >0 なら分割・再開可能なアップロードセッションを使う (バイト数)
+        self.upload_chunk_size = upload_chunk_size
+        self.uploads_skipped = 0
+        # wait_for_job が使うジョブ監視 (job_watch は JobWatcher の引数)
+        self.job_watcher = JobWatcher(self, **(job_watch or {}))
+        # None: 未確認, True/False: OData の "in" 演算子に対応しているか
+        self._odata_in_supported: bool | None = None
+
+    def _timeout(self, read: float | None = None) -> tuple[float, float]:
+        """(接続, 読取) タイムアウト。read 省略時は self.timeout"""
+        return self.http.timeouts(self.timeout if read is None else read)
 
     # --- 認証 ---
 
@@ -57,7 +249,7 @@ class OrchestratorClient:
                 "usernameOrEmail": self.username,
                 "password": self.password,
             },
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         self._token = resp.json().get("result", resp.json().get("access_token", ""))
@@ -67,11 +259,20 @@ class OrchestratorClient:
 
     # --- マシン(端末)管理 ---
 
-    def get_machines(self) -> list[dict[str, Any]]:
-        """登録済みマシン一覧を取得"""
+    def get_machines(self, refresh: bool = False) -> list[dict[str, Any]]:
+        """登録済みマシン一覧を取得
+
+        lookup_cache の TTL 内は再取得しない。稼働状態を見る場合は
+        refresh=True で最新の一覧を取得する (キャッシュも更新される)。
+        """
+        if refresh:
+            self.lookup_cache.invalidate("machines")
+        return self.lookup_cache.get_or_load("machines", "", self._fetch_machines)
+
+    def _fetch_machines(self) -> list[dict[str, Any]]:
         resp = self._session.get(
             f"{self.base_url}/odata/Machines",
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         machines = resp.json().get("value", [])
@@ -82,7 +283,7 @@ class OrchestratorClient:
         """マシンの稼働状態を取得"""
         resp = self._session.get(
             f"{self.base_url}/odata/Machines({machine_id})",
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         return resp.json()
@@ -98,34 +299,205 @@ class OrchestratorClient:
                 "Type": machine_type,
                 "Description": description,
             },
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         machine_id = resp.json()["Id"]
+        self.lookup_cache.invalidate("machines")
         logger.info("マシン登録: %s (id=%d)", name, machine_id)
         return machine_id
 
     # --- パッケージ管理 ---
 
-    def upload_package(self, package_path: Path) -> str:
-        """パッケージ (.nupkg) をアップロード"""
-        with open(package_path, "rb") as f:
+    def upload_package(
+        self,
+        package_path: Path,
+        progress: ProgressCallback | None = None,
+    ) -> str:
+        """パッケージ (.nupkg) をアップロード
+
+        skip_existing_packages が有効なら、同じ id/version で内容 (SHA-256) も
+        同じパッケージが登録済みの場合はアップロードせずにパッケージIDを返す。
+        ハッシュを返さないOrchestratorでは、前回このOrchestratorへ
+        アップロードした際に記録したハッシュと比較する。upload_chunk_size > 0
+        の場合は分割アップロードを行い、失敗したチャンクから再開する。
+        """
+        info = PackageInfo.from_file(package_path)
+        uploaded_sha256 = self._uploaded_sha256(package_path)
+        if self.skip_existing_packages and self.package_exists(info, uploaded_sha256):
+            self.uploads_skipped += 1
+            logger.info(
+                "パッケージ登録済みのためアップロード省略: %s %s", info.package_id, info.version,
+            )
+            return info.package_id
+
+        if self.upload_chunk_size > 0:
+            package_id = self._upload_chunked(package_path, info, progress)
+        else:
+            package_id = self._upload_streaming(package_path, info, progress)
+        self._record_upload(package_path, info)
+        logger.info("パッケージアップロード完了: %s (%.1f KB)", package_id, info.size / 1024)
+        return package_id
+
+    def package_exists(self, info: PackageInfo, uploaded_sha256: str | None = None) -> bool:
+        """同じパッケージ (id/version/内容) がOrchestratorに登録済みか
+
+        Orchestrator がハッシュを返さない場合は、uploaded_sha256 (前回
+        アップロード時に記録したハッシュ) が一致するときだけ登録済みとみなす。
+        生成プロジェクトは内容が変わってもバージョンが同じことが多いため、
+        id/version の一致だけでは判定しない。
+        """
+        if not info.version:
+            return False
+        try:
+            resp = self._session.get(
+                f"{self.base_url}/odata/Processes/UiPath.Server.Configuration.OData"
+                f".GetProcessVersions(processId='{info.package_id}')",
+                timeout=self._timeout(),
+            )
+        except requests.RequestException as e:
+            logger.warning("パッケージ存在確認失敗: %s - %s", info.package_id, e)
+            return False
+        if resp.status_code == 404:
+            return False
+        resp.raise_for_status()
+
+        for entry in resp.json().get("value", []):
+            if entry.get("Version") != info.version:
+                continue
+            remote_hash = entry.get("Sha256") or entry.get("Hash")
+            if remote_hash is None:
+                return uploaded_sha256 == info.sha256
+            return str(remote_hash).lower() == info.sha256
+        return False
+
+    def _uploaded_sha256(self, package_path: Path) -> str | None:
+        """このOrchestratorへ前回アップロードしたときのハッシュ (記録が無ければ None)"""
+        return self._read_upload_record(package_path).get(f"{self.base_url}/{self.tenant}")
+
+    def _record_upload(self, package_path: Path, info: PackageInfo) -> None:
+        """アップロードしたパッケージのハッシュを .nupkg の隣に記録する"""
+        record = self._read_upload_record(package_path)
+        record[f"{self.base_url}/{self.tenant}"] = info.sha256
+        record_path = package_path.with_name(package_path.name + _UPLOAD_RECORD_SUFFIX)
+        try:
+            record_path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning("アップロード記録の保存失敗: %s - %s", record_path, e)
+
+    @staticmethod
+    def _read_upload_record(package_path: Path) -> dict[str, str]:
+        """Orchestrator (base_url/tenant) → アップロード済みハッシュ の記録を読む"""
+        record_path = package_path.with_name(package_path.name + _UPLOAD_RECORD_SUFFIX)
+        try:
+            record = json.loads(record_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return record if isinstance(record, dict) else {}
+
+    def _upload_streaming(
+        self,
+        package_path: Path,
+        info: PackageInfo,
+        progress: ProgressCallback | None,
+    ) -> str:
+        """multipart/form-data の本文を組み立てながら1回のPOSTで送る"""
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{package_path.name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+
+        # Content-Length は requests が len(body) から付ける
+        with _MultipartFileBody(head, package_path, tail, info.size, progress) as body:
             resp = self._session.post(
                 f"{self.base_url}/odata/Processes/UiPath.Server.Configuration.OData.UploadPackage",
-                files={"file": (package_path.name, f, "application/octet-stream")},
-                timeout=self.timeout * 3,
+                data=body,
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                timeout=self._timeout(self.timeout * 3),
             )
         resp.raise_for_status()
         result = resp.json()
-        package_id = result.get("Id", result.get("Key", package_path.stem))
-        logger.info("パッケージアップロード完了: %s", package_id)
-        return str(package_id)
+        return str(result.get("Id", result.get("Key", info.package_id)))
+
+    def _upload_chunked(
+        self,
+        package_path: Path,
+        info: PackageInfo,
+        progress: ProgressCallback | None,
+    ) -> str:
+        """アップロードセッションに Content-Range 付きのチャンクを順に送る
+
+        チャンク送信に失敗したらサーバの受信済みバイト数を問い合わせ、
+        そこから再送する (連続失敗が http.max_retries を超えたら例外)。
+        """
+        uploads_url = f"{self.base_url}/api/uploads"
+        resp = self._session.post(
+            uploads_url,
+            json={"fileName": package_path.name, "size": info.size, "sha256": info.sha256},
+            timeout=self._timeout(),
+        )
+        resp.raise_for_status()
+        upload_id = resp.json()["uploadId"]
+
+        offset = 0
+        failures = 0
+        with open(package_path, "rb") as f:
+            while offset < info.size:
+                f.seek(offset)
+                chunk = f.read(self.upload_chunk_size)
+                end = offset + len(chunk) - 1
+                try:
+                    resp = self._session.put(
+                        f"{uploads_url}/{upload_id}",
+                        data=chunk,
+                        headers={
+                            "Content-Type": "application/octet-stream",
+                            "Content-Range": f"bytes {offset}-{end}/{info.size}",
+                        },
+                        timeout=self._timeout(),
+                    )
+                    resp.raise_for_status()
+                except requests.RequestException as e:
+                    failures += 1
+                    if failures > self.http.max_retries:
+                        raise
+                    logger.warning(
+                        "チャンク送信失敗 (再開 %d/%d): %s @ %d - %s",
+                        failures, self.http.max_retries, package_path.name, offset, e,
+                    )
+                    time.sleep(self.http.backoff_factor * 2 ** (failures - 1))
+                    offset = self._upload_offset(upload_id, offset)
+                    continue
+
+                failures = 0
+                offset = end + 1
+                if progress is not None:
+                    progress(offset, info.size)
+
+        resp = self._session.post(f"{uploads_url}/{upload_id}/complete", timeout=self._timeout())
+        resp.raise_for_status()
+        result = resp.json()
+        return str(result.get("Id", result.get("Key", info.package_id)))
+
+    def _upload_offset(self, upload_id: str, fallback: int) -> int:
+        """アップロードセッションの受信済みバイト数 (取得できなければ fallback)"""
+        try:
+            resp = self._session.get(
+                f"{self.base_url}/api/uploads/{upload_id}", timeout=self._timeout(),
+            )
+            resp.raise_for_status()
+            return int(resp.json().get("received", fallback))
+        except (requests.RequestException, ValueError):
+            return fallback
 
     def get_packages(self) -> list[dict[str, Any]]:
         """アップロード済みパッケージ一覧"""
         resp = self._session.get(
             f"{self.base_url}/odata/Processes",
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         return resp.json().get("value", [])
@@ -134,7 +506,7 @@ class OrchestratorClient:
         """パッケージを削除"""
         resp = self._session.delete(
             f"{self.base_url}/odata/Processes('{package_id}')",
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         logger.info("パッケージ削除: %s", package_id)
@@ -148,15 +520,7 @@ class OrchestratorClient:
         environment_name: str = "Production",
     ) -> str:
         """パッケージからプロセス（リリース）を作成"""
-        # 環境IDの取得
-        env_resp = self._session.get(
-            f"{self.base_url}/odata/Environments",
-            params={"$filter": f"Name eq '{environment_name}'"},
-            timeout=self.timeout,
-        )
-        env_resp.raise_for_status()
-        environments = env_resp.json().get("value", [])
-        env_id = environments[0]["Id"] if environments else 1
+        env_id = self.get_environment_id(environment_name)
 
         resp = self._session.post(
             f"{self.base_url}/odata/Releases",
@@ -166,19 +530,52 @@ class OrchestratorClient:
                 "EnvironmentId": env_id,
                 "Description": f"Migration auto-deploy: {process_name}",
             },
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         process_id = str(resp.json()["Id"])
+        self.lookup_cache.invalidate("releases", process_name)
         logger.info("プロセス作成: %s (id=%s)", process_name, process_id)
         return process_id
 
+    def get_environment_id(self, environment_name: str) -> int:
+        """環境名から環境IDを得る (見つからなければ 1)"""
+
+        def load() -> int | None:
+            resp = self._session.get(
+                f"{self.base_url}/odata/Environments",
+                params={"$filter": f"Name eq '{environment_name}'"},
+                timeout=self._timeout(),
+            )
+            resp.raise_for_status()
+            environments = resp.json().get("value", [])
+            return environments[0]["Id"] if environments else None
+
+        env_id = self.lookup_cache.get_or_load(
+            "environments", environment_name, load, cache_if=lambda v: v is not None,
+        )
+        return env_id if env_id is not None else 1
+
+    def find_releases(self, process_name: str) -> list[dict[str, Any]]:
+        """プロセス名に一致するリリース一覧を得る"""
+
+        def load() -> list[dict[str, Any]]:
+            resp = self._session.get(
+                f"{self.base_url}/odata/Releases",
+                params={"$filter": f"Name eq '{process_name}'"},
+                timeout=self._timeout(),
+            )
+            resp.raise_for_status()
+            return resp.json().get("value", [])
+
+        return self.lookup_cache.get_or_load("releases", process_name, load)
+
     def assign_machine(self, process_id: str, machine_id: int) -> None:
         """プロセスにマシンを割り当て"""
         resp = self._session.post(
             f"{self.base_url}/odata/Releases('{process_id}')/UiPath.Server.Configuration.OData.AssignMachine",
             json={"MachineId": machine_id},
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         logger.info("マシン割当: process=%s, machine=%d", process_id, machine_id)
@@ -191,7 +588,7 @@ class OrchestratorClient:
             params={
                 "$filter": f"Release/Name eq '{process_name}' and State eq 'Running'",
             },
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         jobs = resp.json().get("value", [])
@@ -200,25 +597,20 @@ class OrchestratorClient:
             self._session.post(
                 f"{self.base_url}/odata/Jobs({job['Id']})/UiPath.Server.Configuration.OData.StopJob",
                 json={"strategy": "SoftStop"},
-                timeout=self.timeout,
+                timeout=self._timeout(),
             )
         logger.info("ジョブ停止: %s (%d件)", process_name, len(jobs))
 
     def delete_process(self, process_name: str) -> None:
         """プロセス（リリース）を削除"""
-        resp = self._session.get(
-            f"{self.base_url}/odata/Releases",
-            params={"$filter": f"Name eq '{process_name}'"},
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        releases = resp.json().get("value", [])
+        releases = self.find_releases(process_name)
 
         for release in releases:
             self._session.delete(
                 f"{self.base_url}/odata/Releases({release['Id']})",
-                timeout=self.timeout,
+                timeout=self._timeout(),
             )
+        self.lookup_cache.invalidate("releases", process_name)
         logger.info("プロセス削除: %s (%d件)", process_name, len(releases))
 
     # --- ジョブ実行(テスト・ヘルスチェック用) ---
@@ -231,13 +623,7 @@ class OrchestratorClient:
     ) -> str:
         """ジョブを起動する"""
         # リリースキー取得
-        resp = self._session.get(
-            f"{self.base_url}/odata/Releases",
-            params={"$filter": f"Name eq '{process_name}'"},
-            timeout=self.timeout,
-        )
-        resp.raise_for_status()
-        releases = resp.json().get("value", [])
+        releases = self.find_releases(process_name)
         if not releases:
             raise ValueError(f"プロセスが見つかりません: {process_name}")
 
@@ -250,13 +636,12 @@ class OrchestratorClient:
         if machine_id:
             start_info["RobotIds"] = [machine_id]
         if input_args:
-            import json
             start_info["InputArguments"] = json.dumps(input_args)
 
         resp = self._session.post(
             f"{self.base_url}/odata/Jobs/UiPath.Server.Configuration.OData.StartJobs",
             json={"startInfo": start_info},
-            timeout=self.timeout,
+            timeout=self._timeout(),
         )
         resp.raise_for_status()
         job_id = str(resp.json()["value"][0]["Id"])
@@ -264,23 +649,43 @@ class OrchestratorClient:
         return job_id
 
     def wait_for_job(self, job_id: str, timeout: int = 300) -> dict[str, Any]:
-        """ジョブ完了を待機してステータスを返す"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        """ジョブ完了を待機してステータスを返す
+
+        待機は job_watcher に任せるため、並行に待つ他のジョブと
+        状態の問い合わせがまとめられる。
+        """
+        return self.job_watcher.wait(job_id, timeout)
+
+    def get_jobs(self, job_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """複数ジョブの状態を1回のクエリで取得する (job_id → ジョブ情報)
+
+        $filter=Id in (...) を使い、"in" に対応しないOrchestratorでは
+        Id eq ... or ... に切り替える。
+        """
+        if not job_ids:
+            return {}
+        ids = ",".join(str(int(job_id)) for job_id in job_ids)
+        if self._odata_in_supported is not False:
             resp = self._session.get(
-                f"{self.base_url}/odata/Jobs({job_id})",
-                timeout=self.timeout,
+                f"{self.base_url}/odata/Jobs",
+                params={"$filter": f"Id in ({ids})"},
+                timeout=self._timeout(),
             )
-            resp.raise_for_status()
-            job = resp.json()
-            state = job.get("State", "")
-
-            if state in ("Successful", "Faulted", "Stopped"):
-                return job
+            if resp.status_code == 400 and self._odata_in_supported is None:
+                logger.info("OData の in 演算子が非対応のため or 条件で問い合わせます")
+                self._odata_in_supported = False
+            else:
+                resp.raise_for_status()
+                self._odata_in_supported = True
+                return {str(job["Id"]): job for job in resp.json().get("value", [])}
 
-            time.sleep(5)
-
-        return {"State": "Timeout", "Id": job_id}
+        resp = self._session.get(
+            f"{self.base_url}/odata/Jobs",
+            params={"$filter": " or ".join(f"Id eq {i}" for i in ids.split(","))},
+            timeout=self._timeout(),
+        )
+        resp.raise_for_status()
+        return {str(job["Id"]): job for job in resp.json().get("value", [])}
 
     # --- 接続確認 ---
 
@@ -289,7 +694,7 @@ class OrchestratorClient:
         try:
             resp = self._session.get(
                 f"{self.base_url}/api/status",
-                timeout=10,
+                timeout=self._timeout(10),
             )
             return resp.status_code == 200
         except Exception:
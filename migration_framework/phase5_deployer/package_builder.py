@@ -2,13 +2,29 @@
 # Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# パッケージの構成 (nuspec・エントリ構成など) を変えたら上げる
+PACKAGE_FORMAT_VERSION = 1
+
+# パッケージに含めないファイル・ディレクトリ
+EXCLUDED_SUFFIXES = frozenset({".nupkg", ".tmp"})
+EXCLUDED_DIRS = frozenset({".git", ".svn", ".local", "__pycache__"})
+
+# ZIPエントリの固定タイムスタンプ (ZIP形式で表せる最小日時)
+_FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# .nupkg の ZIP コメントに入力ハッシュを記録する
+_INPUTS_HASH_PREFIX = b"inputs-sha256:"
+
 
 class PackageBuilder:
     """aKaBotプロジェクトディレクトリを .nupkg パッケージに変換する
@@ -22,10 +38,57 @@ class PackageBuilder:
     │   ├── Main.xaml
     │   ├── project.json
     │   └── ...
+
+    生成物は再現可能 (エントリ順・タイムスタンプ・属性を固定) で、
+    入力のハッシュを ZIP コメントに記録する。入力が変わっていなければ
+    再生成しない。
     """
 
+    def __init__(self, compression_level: int = 6, use_cache: bool = True):
+        # 0 は無圧縮 (ZIP_STORED)、1-9 は deflate の圧縮レベル
+        self.compression_level = compression_level
+        self.use_cache = use_cache
+        self.hits = 0
+        self.misses = 0
+
     def build(self, project_dir: Path, output_dir: Path | None = None) -> Path:
-        """プロジェクトディレクトリから .nupkg を生成する"""
+        """プロジェクトディレクトリから .nupkg を生成する
+
+        入力 (プロジェクトファイル・圧縮設定) が前回と同じなら既存の
+        .nupkg をそのまま返す。
+        """
+        nupkg_path, rebuilt = self._build(project_dir, output_dir)
+        if rebuilt:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return nupkg_path
+
+    def build_many(
+        self,
+        project_dirs: list[Path],
+        output_dir: Path | None = None,
+        workers: int = 4,
+    ) -> list[Path]:
+        """複数プロジェクトをプロセスプールで並行にパッケージ化する (入力順に返す)"""
+        if workers <= 1 or len(project_dirs) <= 1:
+            return [self.build(d, output_dir) for d in project_dirs]
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(project_dirs))) as executor:
+            results = list(executor.map(
+                self._build, project_dirs, [output_dir] * len(project_dirs),
+            ))
+        rebuilt = sum(1 for _, r in results if r)
+        self.misses += rebuilt
+        self.hits += len(results) - rebuilt
+        logger.info(
+            "パッケージ一括生成: %d 件 (再生成 %d 件, キャッシュ %d 件)",
+            len(results), rebuilt, len(results) - rebuilt,
+        )
+        return [path for path, _ in results]
+
+    def _build(self, project_dir: Path, output_dir: Path | None) -> tuple[Path, bool]:
+        """.nupkg を生成し、(パス, 再生成したか) を返す"""
         if output_dir is None:
             output_dir = project_dir.parent
 
@@ -40,25 +103,92 @@ class PackageBuilder:
         nupkg_name = f"{package_name}.{version}.nupkg"
         nupkg_path = output_dir / nupkg_name
 
-        with zipfile.ZipFile(nupkg_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        files = self._collect_files(project_dir)
+        inputs_hash = self._inputs_hash(package_name, version, project_dir, files)
+        if self.use_cache and self._cached_inputs_hash(nupkg_path) == inputs_hash:
+            logger.info("パッケージ変更なし (再生成を省略): %s", nupkg_path)
+            return nupkg_path, False
+
+        if self.compression_level > 0:
+            compression, level = zipfile.ZIP_DEFLATED, self.compression_level
+        else:
+            compression, level = zipfile.ZIP_STORED, None
+
+        # 書き込み途中のファイルが残らないよう一時ファイルから置き換える
+        tmp_path = nupkg_path.with_name(f".{nupkg_name}.{os.getpid()}.tmp")
+        with zipfile.ZipFile(tmp_path, "w", compression, compresslevel=level) as zf:
             # NuSpec メタデータ
             nuspec = self._generate_nuspec(package_name, version, meta)
-            zf.writestr(f"{package_name}.nuspec", nuspec)
+            self._write(zf, f"{package_name}.nuspec", nuspec.encode("utf-8"))
 
             # Content_Types
-            zf.writestr("[Content_Types].xml", self._content_types_xml())
+            self._write(zf, "[Content_Types].xml", self._content_types_xml().encode("utf-8"))
 
             # .rels
-            zf.writestr("_rels/.rels", self._rels_xml(package_name))
+            self._write(zf, "_rels/.rels", self._rels_xml(package_name).encode("utf-8"))
 
             # プロジェクトファイル
-            for file_path in project_dir.rglob("*"):
-                if file_path.is_file():
-                    arcname = f"lib/net45/{file_path.relative_to(project_dir)}"
-                    zf.write(file_path, arcname)
+            for rel_path in files:
+                data = (project_dir / rel_path).read_bytes()
+                self._write(zf, f"lib/net45/{rel_path}", data)
+
+            zf.comment = _INPUTS_HASH_PREFIX + inputs_hash.encode("ascii")
+        os.replace(tmp_path, nupkg_path)
 
         logger.info("パッケージ生成: %s (%.1f KB)", nupkg_path, nupkg_path.stat().st_size / 1024)
-        return nupkg_path
+        return nupkg_path, True
+
+    @staticmethod
+    def _collect_files(project_dir: Path) -> list[str]:
+        """パッケージに含めるファイルの相対パス (POSIX形式, 昇順)
+
+        ビルド成果物 (.nupkg)・一時ファイル・VCS/キャッシュディレクトリは除く。
+        """
+        files: list[str] = []
+        for file_path in project_dir.rglob("*"):
+            rel = file_path.relative_to(project_dir)
+            if (
+                not file_path.is_file()
+                or file_path.suffix in EXCLUDED_SUFFIXES
+                or any(part in EXCLUDED_DIRS for part in rel.parts[:-1])
+            ):
+                continue
+            files.append(rel.as_posix())
+        files.sort()
+        return files
+
+    def _inputs_hash(
+        self, package_name: str, version: str, project_dir: Path, files: list[str],
+    ) -> str:
+        """パッケージ内容を決める入力のハッシュ"""
+        h = hashlib.sha256()
+        h.update(f"{PACKAGE_FORMAT_VERSION}\0{self.compression_level}\0".encode())
+        h.update(f"{package_name}\0{version}\0".encode("utf-8"))
+        for rel_path in files:
+            h.update(rel_path.encode("utf-8") + b"\0")
+            h.update(hashlib.sha256((project_dir / rel_path).read_bytes()).digest())
+        return h.hexdigest()
+
+    @staticmethod
+    def _cached_inputs_hash(nupkg_path: Path) -> str | None:
+        """既存 .nupkg に記録した入力ハッシュ (無ければ None)"""
+        try:
+            with zipfile.ZipFile(nupkg_path) as zf:
+                comment = zf.comment
+        except (OSError, zipfile.BadZipFile):
+            return None
+        if not comment.startswith(_INPUTS_HASH_PREFIX):
+            return None
+        return comment[len(_INPUTS_HASH_PREFIX):].decode("ascii", "replace")
+
+    @staticmethod
+    def _write(zf: zipfile.ZipFile, arcname: str, data: bytes) -> None:
+        """タイムスタンプ・属性を固定してエントリを書き込む (再現可能なZIPにする)"""
+        info = zipfile.ZipInfo(arcname, date_time=_FIXED_DATE_TIME)
+        info.compress_type = zf.compression
+        info.create_system = 0
+        info.external_attr = 0o644 << 16
+        zf.writestr(info, data, compresslevel=zf.compresslevel)
 
     def _generate_nuspec(self, name: str, version: str, meta: dict) -> str:
         return f"""<?xml version="1.0" encoding="utf-8"?>
@@ -0,0 +1,183 @@
+"""ロールアウトエンジン - 複数プロジェクト × 複数端末の並行デプロイ (カナリア → wave)"""
+# Copyright (c) 2025-2026 HarmonicInsight / FPT Consulting Japan. All rights reserved.
+from __future__ import annotations
+
+import dataclasses
+import logging
+import math
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from migration_framework.common.models import (
+    DeploymentRecord,
+    DeploymentStatus,
+    MachineInfo,
+)
+
+if TYPE_CHECKING:
+    from .deployer import Deployer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RolloutSettings:
+    """ロールアウトの並行度・段階・中止条件 (settings.yaml の deployer.rollout)"""
+
+    parallel_projects: int = 4          # 同時にパッケージング・アップロードするプロジェクト数
+    package_workers: int = 1            # >1 なら各段階の開始前にプロセスプールで一括パッケージ化する
+    orchestrator_concurrency: int = 16  # Orchestratorへの端末単位の同時処理数 (割当・環境設定)
+    canary_projects: int = 1            # 最初に単独でデプロイし、全端末正常を確認するプロジェクト数
+    wave_size: int = 20                 # カナリア後に1 wave で投入するプロジェクト数
+    max_failure_rate: float = 0.2       # wave 内の失敗率がこれを超えたら残りを中止する
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> RolloutSettings:
+        """設定辞書から生成する (未知のキーは無視する)"""
+        names = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
+
+
+class RolloutEngine:
+    """Deployer のデプロイ処理を並行に実行するロールアウトエンジン
+
+    - プロジェクト単位 (パッケージング・アップロード・プロセス作成) は
+      parallel_projects 本のスレッドで並行実行
+    - 端末単位 (割当・環境設定) は全プロジェクトで共有する
+      orchestrator_concurrency 本のスレッドで実行し、1つの Orchestrator に
+      同時に掛かる処理数を抑える
+    - 先頭 canary_projects 件をカナリアとして投入し、1件でも全端末正常に
+      ならなければ以降を中止する。その後は wave_size 件ずつ投入し、
+      wave 内の失敗率が max_failure_rate を超えた時点で未着手分を中止する
+    """
+
+    def __init__(self, deployer: Deployer, settings: RolloutSettings | None = None):
+        self.deployer = deployer
+        self.settings = settings or RolloutSettings()
+
+    def plan(self, projects: list[Path]) -> list[list[Path]]:
+        """プロジェクトをカナリア + wave に分ける"""
+        canary = max(0, self.settings.canary_projects)
+        size = max(1, self.settings.wave_size)
+        stages = [projects[:canary]] if canary and projects else []
+        rest = projects[canary:]
+        stages.extend(rest[i:i + size] for i in range(0, len(rest), size))
+        return stages
+
+    def run(
+        self,
+        projects: list[Path],
+        target_machines: list[MachineInfo],
+        env_overrides: dict[str, Any] | None = None,
+    ) -> list[DeploymentRecord]:
+        """全プロジェクトをロールアウトし、入力順のレコードを返す
+
+        中止により未着手となったプロジェクトは PENDING のレコードになる。
+        """
+        stages = self.plan(projects)
+        records: dict[Path, DeploymentRecord] = {}
+        canary = bool(self.settings.canary_projects) and bool(stages)
+        logger.info(
+            "ロールアウト開始: %d プロジェクト × %d 台 (%d 段階, 並列=%d/%d)",
+            len(projects), len(target_machines), len(stages),
+            self.settings.parallel_projects, self.settings.orchestrator_concurrency,
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.settings.parallel_projects),
+            thread_name_prefix="rollout-project",
+        ) as project_pool, ThreadPoolExecutor(
+            max_workers=max(1, self.settings.orchestrator_concurrency),
+            thread_name_prefix="rollout-machine",
+        ) as machine_pool:
+            for i, stage in enumerate(stages):
+                is_canary = canary and i == 0
+                # カナリアは1件も失敗を許さない
+                rate = 0.0 if is_canary else self.settings.max_failure_rate
+                label = "カナリア" if is_canary else f"wave {i if canary else i + 1}"
+                completed, stopped = self._run_stage(
+                    label, stage, rate, target_machines, env_overrides,
+                    project_pool, machine_pool,
+                )
+                records.update(completed)
+                if stopped:
+                    logger.error("ロールアウト中止: %s で失敗数が上限を超えました", label)
+                    break
+
+        aborted = 0
+        for project_dir in projects:
+            if project_dir not in records:
+                aborted += 1
+                records[project_dir] = DeploymentRecord(
+                    project_name=project_dir.name,
+                    target_machines=[m.name for m in target_machines],
+                    status=DeploymentStatus.PENDING,
+                    error_message="ロールアウト中止のため未実施",
+                )
+
+        logger.info(
+            "ロールアウト完了: %d 件実施, %d 件中止 (失敗 %d 件)",
+            len(projects) - aborted, aborted, self._failures(records.values()),
+        )
+        return [records[p] for p in projects]
+
+    def _run_stage(
+        self,
+        label: str,
+        stage: list[Path],
+        max_failure_rate: float,
+        target_machines: list[MachineInfo],
+        env_overrides: dict[str, Any] | None,
+        project_pool: ThreadPoolExecutor,
+        machine_pool: ThreadPoolExecutor,
+    ) -> tuple[dict[Path, DeploymentRecord], bool]:
+        """1段階分を並行実行する
+
+        失敗数が上限を超えたら未着手分をキャンセルし、(完了分, True) を返す。
+        """
+        logger.info("%s 開始: %d プロジェクト", label, len(stage))
+        if self.settings.package_workers > 1:
+            # deploy_single 内の build() は生成済みパッケージのキャッシュヒットになる
+            try:
+                self.deployer.package_builder.build_many(
+                    stage, workers=self.settings.package_workers,
+                )
+            except Exception as e:
+                logger.warning("一括パッケージ化失敗 (プロジェクトごとに再試行): %s", e)
+        allowed = math.floor(len(stage) * max_failure_rate)
+        futures: dict[Future[DeploymentRecord], Path] = {
+            project_pool.submit(
+                self.deployer.deploy_single,
+                project_dir, target_machines, env_overrides, machine_pool,
+            ): project_dir
+            for project_dir in stage
+        }
+
+        completed: dict[Path, DeploymentRecord] = {}
+        failures = 0
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                record = future.result()
+                completed[futures[future]] = record
+                if record.status != DeploymentStatus.DEPLOYED:
+                    failures += 1
+            if failures > allowed:
+                # 実行中のものは最後まで待ち、未着手分だけ取り消す
+                for future in pending:
+                    future.cancel()
+
+        logger.info(
+            "%s 完了: %d/%d 成功", label, len(completed) - failures, len(stage),
+        )
+        return completed, failures > allowed
+
+    @staticmethod
+    def _failures(records: Iterable[DeploymentRecord]) -> int:
+        return sum(1 for r in records if r.status != DeploymentStatus.DEPLOYED)
@@ -3,15 +3,31 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
+from migration_framework import __version__
 from migration_framework.common.config import Config
 from migration_framework.common.models import (
+    AssessmentReport,
+    BizRoboAction,
+    ConversionResult,
     MigrationRecord,
     MigrationStatus,
+    ValidationReport,
 )
 from migration_framework.db.migration_db import MigrationDB
+from migration_framework.db.result_cache import (
+    CACHE_FORMAT_VERSION,
+    CacheEntry,
+    ResultCache,
+)
 from migration_framework.phase1_analyzer import Analyzer
+from migration_framework.phase1_analyzer.robot_graph import RobotGraph
 from migration_framework.phase2_converter import Converter
 from migration_framework.phase3_validator import Validator
 from migration_framework.standardization.template_engine import TemplateEngine
@@ -20,6 +36,79 @@ from migration_framework.standardization.duplicate_detector import DuplicateDete
 
 logger = logging.getLogger(__name__)
 
+# Phase 1-3 の成果物 (キャッシュ保存単位)
+PhaseResults = tuple[AssessmentReport, ConversionResult, ValidationReport]
+
+# 依存グラフ用の事前走査結果 (サブロボット参照, ファイルパス, API)
+DependencyScan = tuple[list[str], list[str], list[str]]
+
+# キャッシュの config_hash に含める settings のセクション (Phase 1-3 の結果に効くもの)
+_RESULT_SETTINGS_SECTIONS = ("analyzer", "converter", "validator")
+
+# ワーカープロセス内で使い回すパイプライン (_init_worker で生成)
+_worker_pipeline: MigrationPipeline | None = None
+
+
+class _RecordingDB:
+    """ワーカー側のDB代替 - 書き込みを記録して親プロセスへ返す
+
+    ワーカーはSQLiteに直接書かず、ログだけを溜めておく。
+    レコードの最終状態は run_single の戻り値で返す。
+    """
+
+    def __init__(self) -> None:
+        self.logs: list[tuple[str, str, str, str]] = []
+
+    def upsert_record(self, record: MigrationRecord) -> None:
+        pass
+
+    def add_log(
+        self, robot_name: str, phase: str, message: str, level: str = "info"
+    ) -> None:
+        self.logs.append((robot_name, phase, message, level))
+
+    def drain(self) -> list[tuple[str, str, str, str]]:
+        logs, self.logs = self.logs, []
+        return logs
+
+
+def _init_worker(config: Config) -> None:
+    """ワーカープロセス初期化 - プロセスごとに Analyzer/Converter/Validator を持つ"""
+    global _worker_pipeline
+    _worker_pipeline = MigrationPipeline(config, _RecordingDB())  # type: ignore[arg-type]
+
+
+def _run_in_worker(
+    file_path: Path, output_dir: Path, apply_template: bool, return_results: bool
+) -> tuple[MigrationRecord, list[tuple[str, str, str, str]], PhaseResults | None]:
+    """ワーカープロセスで Phase 1-3 を実行し、レコード・ログ・成果物を返す"""
+    assert _worker_pipeline is not None
+    record, results = _worker_pipeline._run_phases(
+        file_path, output_dir, apply_template
+    )
+    if results is not None and return_results:
+        # lxml の要素ツリーはプロセス間で受け渡せないため外す
+        # (書き出し済みの Main.xaml は親プロセスがキャッシュ保存時に読む)
+        assessment, conversion, validation = results
+        conversion = _worker_pipeline.converter.detach_xaml(conversion)
+        return record, _worker_pipeline.db.drain(), (assessment, conversion, validation)
+    return record, _worker_pipeline.db.drain(), None
+
+
+def _scan_dependencies(analyzer: Analyzer, file_path: Path) -> DependencyScan:
+    """依存グラフ用にパースと依存抽出だけを行う (失敗時は依存なし扱い)"""
+    try:
+        robot = analyzer.dependency_mapper.analyze(analyzer.parser.parse(file_path))
+    except Exception as e:
+        logger.warning("依存関係の事前走査に失敗: %s - %s", file_path.name, e)
+        return [], [], []
+    return robot.sub_robots, robot.file_paths, robot.api_calls
+
+
+def _scan_in_worker(file_path: Path) -> DependencyScan:
+    assert _worker_pipeline is not None
+    return _scan_dependencies(_worker_pipeline.analyzer, file_path)
+
 
 class MigrationPipeline:
     """BizRobo → aKaBot 移行パイプライン
@@ -32,9 +121,21 @@ class MigrationPipeline:
     標準化レイヤー: 共通部品・テンプレート・重複検出
     """
 
-    def __init__(self, config: Config, db: MigrationDB):
+    def __init__(
+        self,
+        config: Config,
+        db: MigrationDB | Any,
+        cache: ResultCache | None = None,
+    ):
         self.config = config
         self.db = db
+        self.cache = cache
+        # 何ロボット分のDB書き込みを1トランザクションにまとめるか
+        self.db_batch_size: int = config.get("migration.db_batch_size", 20)
+        # サブロボットの呼び出し先を先に移行する (依存グラフの wave 順)
+        self.schedule_by_dependencies: bool = config.get(
+            "migration.schedule_by_dependencies", True
+        )
         self.analyzer = Analyzer(config)
         self.converter = Converter(config)
         self.validator = Validator(config)
@@ -47,7 +148,41 @@ class MigrationPipeline:
         output_dir: Path,
         apply_template: bool = True,
     ) -> MigrationRecord:
-        """1つのロボットに対して Phase 1-3 を実行する"""
+        """1つのロボットに対して Phase 1-3 を実行する
+
+        キャッシュが有効で、ソース・設定・使用アクションのマッピングが
+        前回から変わっていなければ前回の結果を再利用する。
+        """
+        source_hash, entry = "", None
+        if self.cache is not None:
+            source_hash, entry = self._cache_lookup(file_path, apply_template)
+        return self._run_one(file_path, output_dir, apply_template, source_hash, entry)
+
+    def _run_one(
+        self,
+        file_path: Path,
+        output_dir: Path,
+        apply_template: bool,
+        source_hash: str,
+        entry: CacheEntry | None,
+    ) -> MigrationRecord:
+        """キャッシュ照会済みの1ロボットを処理する"""
+        with self._write_batch():
+            if entry is not None:
+                return self._restore_cached(entry, output_dir)
+
+            record, results = self._run_phases(file_path, output_dir, apply_template)
+            if self.cache is not None and results is not None:
+                self._cache_store(file_path, source_hash, apply_template, results)
+            return record
+
+    def _run_phases(
+        self,
+        file_path: Path,
+        output_dir: Path,
+        apply_template: bool,
+    ) -> tuple[MigrationRecord, PhaseResults | None]:
+        """Phase 1-3 を実行し、レコードと成果物 (失敗時は None) を返す"""
         robot_name = file_path.stem
         logger.info("====== 移行パイプライン開始: %s ======", robot_name)
 
@@ -74,7 +209,7 @@ class MigrationPipeline:
             self.db.upsert_record(record)
             self.db.add_log(robot_name, "phase1", f"解析失敗: {e}", level="error")
             logger.error("Phase 1 失敗: %s - %s", robot_name, e)
-            return record
+            return record, None
 
         # --- Phase 2: 変換 ---
         record.status = MigrationStatus.CONVERTING
@@ -101,7 +236,7 @@ class MigrationPipeline:
             self.db.upsert_record(record)
             self.db.add_log(robot_name, "phase2", f"変換失敗: {e}", level="error")
             logger.error("Phase 2 失敗: %s - %s", robot_name, e)
-            return record
+            return record, None
 
         # --- Phase 3: 検証 ---
         record.status = MigrationStatus.VALIDATING
@@ -129,23 +264,30 @@ class MigrationPipeline:
             self.db.upsert_record(record)
             self.db.add_log(robot_name, "phase3", f"検証失敗: {e}", level="error")
             logger.error("Phase 3 失敗: %s - %s", robot_name, e)
-            return record
+            return record, None
 
         self.db.upsert_record(record)
         logger.info(
             "====== 移行パイプライン完了: %s (status=%s) ======",
             robot_name, record.status.value,
         )
-        return record
+        return record, (assessment, conversion, validation)
 
     def run_batch(
         self,
         source_dir: Path,
         output_dir: Path,
         apply_template: bool = True,
+        workers: int = 1,
     ) -> list[MigrationRecord]:
-        """ディレクトリ内の全ロボットを移行する"""
-        robot_files = (
+        """ディレクトリ内の全ロボットを移行する
+
+        schedule_by_dependencies が有効な場合はロボット間の依存グラフを作り、
+        呼び出し先 → 呼び出し元の wave 順に処理する。
+        workers > 1 の場合は各 wave の Phase 1-3 をプロセスプールで並列実行する。
+        DB書き込みは親プロセスのみが行い、結果はファイル名順で返す。
+        """
+        robot_files = sorted(
             list(source_dir.glob("**/*.robot"))
             + list(source_dir.glob("**/*.xml"))
         )
@@ -154,18 +296,295 @@ class MigrationPipeline:
             logger.warning("ロボットファイルが見つかりません: %s", source_dir)
             return []
 
-        logger.info("バッチ移行開始: %d ファイル", len(robot_files))
+        logger.info(
+            "バッチ移行開始: %d ファイル (workers=%d)", len(robot_files), workers
+        )
+
+        # キャッシュ照会は親プロセスで先に済ませ、ミス分だけを処理対象にする
+        lookups: list[tuple[str, CacheEntry | None]] = [("", None)] * len(robot_files)
+        if self.cache is not None:
+            lookups = [
+                self._cache_lookup(file_path, apply_template)
+                for file_path in robot_files
+            ]
+        misses = sum(1 for _, entry in lookups if entry is None)
 
-        records: list[MigrationRecord] = []
-        for file_path in robot_files:
-            record = self.run_single(file_path, output_dir, apply_template)
-            records.append(record)
+        executor: ProcessPoolExecutor | None = None
+        if workers > 1 and misses > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+        try:
+            waves = [list(range(len(robot_files)))]
+            if self.schedule_by_dependencies and len(robot_files) > 1:
+                waves = self._plan_waves(robot_files, lookups, executor, workers)
+
+            records: list[MigrationRecord | None] = [None] * len(robot_files)
+            for wave in waves:
+                if executor is None:
+                    self._run_wave_serial(
+                        robot_files, wave, lookups, records,
+                        output_dir, apply_template,
+                    )
+                else:
+                    self._run_wave_parallel(
+                        robot_files, wave, lookups, records,
+                        output_dir, apply_template, executor, workers,
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         # 重複検出 (Phase 2の結果を使って)
         # Note: 実運用ではconversion結果を蓄積して分析
+        completed = [r for r in records if r is not None]
         summary = self.db.get_summary()
         logger.info(
             "バッチ移行完了: total=%d, summary=%s",
-            len(records), summary,
+            len(completed), summary,
+        )
+        return completed
+
+    def _plan_waves(
+        self,
+        robot_files: list[Path],
+        lookups: list[tuple[str, CacheEntry | None]],
+        executor: ProcessPoolExecutor | None,
+        workers: int,
+    ) -> list[list[int]]:
+        """依存グラフを構築・保存し、wave ごとのファイル番号リストを返す
+
+        キャッシュヒット分は保存済みの解析結果を使い、残りだけを事前走査する。
+        """
+        scans: list[DependencyScan] = [([], [], [])] * len(robot_files)
+        to_scan: list[int] = []
+        for index, (_, entry) in enumerate(lookups):
+            if entry is None:
+                to_scan.append(index)
+            else:
+                robot = entry.assessment.robot
+                scans[index] = (robot.sub_robots, robot.file_paths, robot.api_calls)
+
+        files = [robot_files[i] for i in to_scan]
+        if executor is not None:
+            results = executor.map(
+                _scan_in_worker, files,
+                chunksize=max(1, len(files) // (workers * 4)),
+            )
+        else:
+            results = (_scan_dependencies(self.analyzer, f) for f in files)
+        for index, scan in zip(to_scan, results):
+            scans[index] = scan
+
+        graph = RobotGraph()
+        for file_path, (sub_robots, file_paths, api_calls) in zip(robot_files, scans):
+            graph.add_robot(file_path.stem, sub_robots, file_paths, api_calls)
+        graph.resolve()
+        self.db.save_dependencies(graph.edges())
+
+        for cycle in graph.cycles():
+            logger.warning("循環参照のため同じ wave で移行: %s", ", ".join(cycle))
+        for caller, refs in graph.unresolved.items():
+            logger.info("未解決のサブロボット参照: %s -> %s", caller, ", ".join(refs))
+
+        indexes: dict[str, list[int]] = {}
+        for index, file_path in enumerate(robot_files):
+            indexes.setdefault(file_path.stem, []).append(index)
+        waves = [
+            [index for name in wave for index in indexes[name]]
+            for wave in graph.waves()
+        ]
+        logger.info("依存関係スケジュール: %d wave", len(waves))
+        return waves
+
+    def _run_wave_serial(
+        self,
+        robot_files: list[Path],
+        wave: list[int],
+        lookups: list[tuple[str, CacheEntry | None]],
+        records: list[MigrationRecord | None],
+        output_dir: Path,
+        apply_template: bool,
+    ) -> None:
+        """1つの wave を順に処理する (db_batch_size 件ごとに1トランザクション)"""
+        for start in range(0, len(wave), self.db_batch_size):
+            with self._write_batch():
+                for index in wave[start:start + self.db_batch_size]:
+                    source_hash, entry = lookups[index]
+                    records[index] = self._run_one(
+                        robot_files[index], output_dir, apply_template,
+                        source_hash, entry,
+                    )
+
+    def _run_wave_parallel(
+        self,
+        robot_files: list[Path],
+        wave: list[int],
+        lookups: list[tuple[str, CacheEntry | None]],
+        records: list[MigrationRecord | None],
+        output_dir: Path,
+        apply_template: bool,
+        executor: ProcessPoolExecutor,
+        workers: int,
+    ) -> None:
+        """1つの wave の Phase 1-3 をワーカープロセスに分散し、DBへは親プロセスで書き込む"""
+        # キャッシュヒット分は親プロセスで即時復元し、残りだけを分散する
+        pending: list[int] = []
+        with self.db.batch():
+            for index in wave:
+                entry = lookups[index][1]
+                if entry is not None:
+                    records[index] = self._restore_cached(entry, output_dir)
+                else:
+                    pending.append(index)
+
+        if not pending:
+            return
+
+        chunksize = max(1, len(pending) // (workers * 4))
+        # map は投入順で結果を返すため、出力順は決定的になる
+        results = executor.map(
+            _run_in_worker,
+            [robot_files[index] for index in pending],
+            [output_dir] * len(pending),
+            [apply_template] * len(pending),
+            [self.cache is not None] * len(pending),
+            chunksize=chunksize,
+        )
+        # 親プロセスでの書き込みも db_batch_size 件ごとにまとめる
+        completed = zip(pending, results)
+        while chunk := list(islice(completed, self.db_batch_size)):
+            with self._write_batch():
+                for index, (record, logs, phase_results) in chunk:
+                    self.db.upsert_record(record)
+                    for robot_name, phase, message, level in logs:
+                        self.db.add_log(robot_name, phase, message, level=level)
+                    if self.cache is not None and phase_results is not None:
+                        self._cache_store(
+                            robot_files[index], lookups[index][0],
+                            apply_template, phase_results,
+                        )
+                    records[index] = record
+
+    @contextmanager
+    def _write_batch(self) -> Iterator[None]:
+        """DB とキャッシュへの書き込みをそれぞれ1トランザクションにまとめる"""
+        with self.db.batch():
+            if self.cache is None:
+                yield
+            else:
+                with self.cache.batch():
+                    yield
+
+    # --- 再移行キャッシュ ---
+
+    def _config_hash(self, apply_template: bool) -> str:
+        """マッピング定義以外で結果に影響する設定のハッシュ
+
+        settings は Phase 1-3 の結果に効くセクションだけを含める
+        (DB パスやワーカー数、Phase 4-5 の設定を変えてもキャッシュは無効化しない)。
+        """
+        return ResultCache.fingerprint({
+            "version": __version__,
+            "cache_format": CACHE_FORMAT_VERSION,
+            "settings": {
+                section: self.config.settings.get(section, {})
+                for section in _RESULT_SETTINGS_SECTIONS
+            },
+            "variable_type_mapping": self.config.action_mapping.get(
+                "variable_type_mapping", {}
+            ),
+            "apply_template": apply_template,
+        })
+
+    def _mapping_hash(self, action_types: list[str]) -> str:
+        """指定アクションタイプのマッピング定義だけのハッシュ"""
+        engine = self.converter.mapping_engine
+        return ResultCache.fingerprint(
+            [(t, engine.find_mapping(t)) for t in action_types]
+        )
+
+    @staticmethod
+    def _collect_action_types(actions: list[BizRoboAction]) -> list[str]:
+        """アクションツリーに含まれるアクションタイプ一覧 (ソート済み)"""
+        types: set[str] = set()
+        stack = list(actions)
+        while stack:
+            action = stack.pop()
+            types.add(action.action_type)
+            stack.extend(action.children)
+        return sorted(types)
+
+    def _cache_lookup(
+        self, file_path: Path, apply_template: bool
+    ) -> tuple[str, CacheEntry | None]:
+        """キャッシュを照会し、(ソースハッシュ, 有効なエントリ or None) を返す"""
+        assert self.cache is not None
+        source_hash = ResultCache.hash_file(file_path)
+        entry = self.cache.get(
+            self._cache_key(file_path), source_hash,
+            self._config_hash(apply_template), self._mapping_hash,
+        )
+        return source_hash, entry
+
+    def _cache_store(
+        self,
+        file_path: Path,
+        source_hash: str,
+        apply_template: bool,
+        results: PhaseResults,
+    ) -> None:
+        assert self.cache is not None
+        assessment, conversion, validation = results
+        action_types = self._collect_action_types(assessment.robot.actions)
+        self.cache.put(CacheEntry(
+            source_path=self._cache_key(file_path),
+            robot_name=file_path.stem,
+            source_hash=source_hash,
+            config_hash=self._config_hash(apply_template),
+            action_types=action_types,
+            mapping_hash=self._mapping_hash(action_types),
+            assessment=assessment,
+            # ツリーを文字列化せず、書き出し済みの Main.xaml を読み込んで保存する
+            conversion=self.converter.load_xaml(self.converter.detach_xaml(conversion)),
+            validation=validation,
+        ))
+
+    @staticmethod
+    def _cache_key(file_path: Path) -> str:
+        """キャッシュのキー (同名ロボットを区別するため解決済みの絶対パス)"""
+        return str(file_path.resolve())
+
+    def _restore_cached(
+        self, entry: CacheEntry, output_dir: Path
+    ) -> MigrationRecord:
+        """キャッシュ済み結果からレコードを復元する (出力は欠落時のみ再書込)"""
+        assessment, conversion, validation = (
+            entry.assessment, entry.conversion, entry.validation,
+        )
+        record = MigrationRecord(
+            robot_name=entry.robot_name,
+            source_path=str(assessment.robot.file_path),
+            status=(
+                MigrationStatus.COMPLETED if validation.passed
+                else MigrationStatus.MANUAL_REQUIRED
+            ),
+            difficulty_rank=assessment.complexity.rank,
+            complexity_score=assessment.complexity.total_score,
+            conversion_rate=conversion.conversion_rate,
+            validation_score=validation.score,
+            manual_items="\n".join(
+                f"[{i.severity}] {i.message}" for i in validation.issues
+            ),
         )
-        return records
+
+        project_dir = output_dir / f"PRJ_{conversion.source_robot}"
+        if not project_dir.exists():
+            self.converter.save_output(conversion, output_dir)
+
+        self.db.upsert_record(record)
+        self.db.add_log(entry.robot_name, "pipeline", "変更なし: キャッシュ結果を再利用")
+        logger.info("キャッシュ利用: %s", entry.robot_name)
+        return record